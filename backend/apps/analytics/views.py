@@ -8,9 +8,9 @@ from apps.skills.models import UserSkill
 from apps.roles.models import Role, RoleSkill
 from apps.jobs.models import Job, JobSkill
 from apps.recommendations.models import Course
-from core.services.embedding_service import encode_single
 from core.services.learning_recommendation_service import get_courses_for_skills
-from apps.roles.services import get_faiss_index, re_rank, compute_skill_gap
+from apps.roles.services import compute_skill_gap
+from apps.recommendations.services import recommend_roles
 
 
 @api_view(['GET'])
@@ -36,28 +36,8 @@ def dashboard(request):
     # Skill distribution
     skill_distribution = [{'skill': s['skill__name']} for s in user_skills]
 
-    # Top roles (FAISS + re-rank)
-    top_roles = []
-    if user_skill_names:
-        user_vec = encode_single(' '.join(user_skill_names))
-        faiss_index = get_faiss_index()
-        candidates = faiss_index.search(user_vec, k=30)
-        if candidates:
-            role_ids = [rid for rid, _ in candidates]
-            roles = Role.objects.filter(id__in=role_ids).prefetch_related(
-                Prefetch('skills', queryset=RoleSkill.objects.select_related('skill'))
-            )
-            role_map = {str(r.id): r for r in roles}
-            role_list = [{'id': str(rid), 'title': role_map[rid].title} for rid in role_ids if rid in role_map]
-            role_skills_map = {}
-            for r in roles:
-                rs_list = [{'skill_id': str(rs.skill_id), 'skill_name': rs.skill.name, 'importance_weight': rs.importance_weight} for rs in r.skills.all()]
-                role_skills_map[str(r.id)] = rs_list
-            top_roles = re_rank(role_list, user_skill_ids, user_skill_names, role_skills_map, top_k=5)
-        else:
-            for r in Role.objects.prefetch_related('skills').order_by('?')[:5]:
-                rs_list = [{'skill_id': str(rs.skill_id), 'skill_name': rs.skill.name, 'importance_weight': rs.importance_weight} for rs in r.skills.all()]
-                top_roles.append({'id': str(r.id), 'title': r.title, 'match_score': 0.0})
+    # Top roles (FAISS + re-rank), stored per user until skills or the index change
+    top_roles = recommend_roles(user) if user_skill_names else []
 
     # Skill gaps for top role
     skill_gaps = []
@@ -71,8 +71,6 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from groq import Groq
-
 from apps.skills.models import UserSkill
 from apps.roles.models import Role, RoleSkill
 from apps.roles.services import compute_skill_gap
@@ -159,6 +157,7 @@ def chat(request):
 
     try:
         # Initialize Groq client
+        from groq import Groq
         client = Groq(api_key=settings.GROQ_API_KEY)
 
         # Build user-specific context
@@ -7,9 +7,6 @@ import socket
 # Used to extract hostname from a URL
 from urllib.parse import urlparse
 
-# Supabase Python client
-from supabase import create_client
-
 # Access Django settings (to get Supabase credentials)
 from django.conf import settings
 
@@ -26,9 +23,19 @@ import httpx
 SUPABASE_URL = (settings.SUPABASE_URL or "").strip()
 SUPABASE_KEY = (settings.SUPABASE_KEY or "").strip()
 
-# Create Supabase client instance
-# This is used to communicate with Supabase storage
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Supabase client instance, created on first upload
+# (importing supabase is slow, so it stays off the Django startup path)
+_supabase = None
+
+
+def get_supabase_client():
+    """Return the shared Supabase client, creating it on first use."""
+    global _supabase
+    if _supabase is None:
+        # Supabase Python client
+        from supabase import create_client
+        _supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+    return _supabase
 
 
 # ==========================================================
@@ -116,7 +123,7 @@ def upload_pdf_to_supabase(file_bytes: bytes, filename: str) -> str:
 
     try:
         # Upload file to Supabase storage bucket "resumes"
-        res = supabase.storage.from_("resumes").upload(
+        res = get_supabase_client().storage.from_("resumes").upload(
             path=path,
             file=file_bytes,
             file_options={"content-type": "application/pdf"},  # Set MIME type
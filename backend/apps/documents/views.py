@@ -2,15 +2,14 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
-import fitz  # PyMuPDF
 import uuid
-import numpy as np
 
 from .supabase_utils import upload_pdf_to_supabase
 from rest_framework.permissions import AllowAny
 from .supabase_utils import SupabaseConnectionError, SupabaseUploadError
 from apps.skills.services.resume_skill_tool import SkillTool
-from core.services.embedding_service import encode
+from apps.embeddings.services import compose_resume_vector
+from apps.roles.services.role_attributes import role_filters
 from apps.roles.services.role_faiss_manager import get_role_faiss_manager
 
 
@@ -47,6 +46,8 @@ class ResumeUploadView(APIView):
             file_url = upload_pdf_to_supabase(pdf_bytes, filename)
 
             # 2️⃣ Extract text using PyMuPDF
+            import fitz  # PyMuPDF
+
             doc = fitz.open(stream=pdf_bytes, filetype="pdf")
 
             extracted_text = ""
@@ -64,15 +65,12 @@ class ResumeUploadView(APIView):
             # 3️⃣ Extract skills (skills app service)
             skills_data = SkillTool.run(extracted_text)
 
-            # 4️⃣ Embed the skills (core embedding service, normalized for FAISS)
-            if skills_data["all_skills"]:
-                skills_vectors = encode(
-                    skills_data["all_skills"],
-                    normalize=True,
-                    return_numpy=True,
-                )
-                query_vector = np.mean(skills_vectors, axis=0, keepdims=True)
-                roles = get_role_faiss_manager().search(query_vector, top_k=30)
+            # 4️⃣ Query vector pooled from stored skill vectors (only unknown skills hit the model)
+            query_vector = compose_resume_vector(skills_data["all_skills"])
+            # Optional certification / seniority / skill fields narrow the role search.
+            filters = role_filters(request.data)
+            if query_vector is not None:
+                roles = get_role_faiss_manager().search(query_vector, top_k=30, filters=filters)
                 print("✅ Roles searched successfully")
             else:
                 roles = []
@@ -97,7 +95,10 @@ class ResumeUploadView(APIView):
                 "rule_based_skills": skills_data["rule_based_skills"],
                 "llm_skills": skills_data["llm_skills"],
                 "all_skills": skills_data["all_skills"],
+                "skill_sources": skills_data.get("sources", []),
+                "skill_dictionary_version": skills_data.get("dictionary_version"),
                 "recommended_roles": recommended_roles,
+                "role_filters": filters,
             }, status=status.HTTP_200_OK)
 
         except SupabaseConnectionError as e:
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class EmbeddingsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.embeddings'
+    label = 'embeddings'
+
+    def ready(self):
+        from apps.embeddings import signals  # noqa: F401
@@ -0,0 +1,94 @@
+"""
+Compact vector column: raw float32 / float16 bytes in a binary column.
+
+A 384-d vector takes 1.5 KB as float32 (768 B as float16) instead of a
+``float8[]`` array, and decodes with ``np.frombuffer`` (no per-element Python
+floats). The stored width is inferred from the byte length on read, so rows
+written before a change of EMBEDDING_CONFIG['VECTOR_STORAGE_DTYPE'] still load.
+"""
+import base64
+from typing import List, Optional
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models
+
+STORAGE_DTYPES = ('float32', 'float16')
+
+
+def storage_dtype() -> str:
+    dtype = settings.EMBEDDING_CONFIG.get('VECTOR_STORAGE_DTYPE', 'float32')
+    if dtype not in STORAGE_DTYPES:
+        raise ValueError(f"Unknown vector storage dtype {dtype!r} (expected one of {STORAGE_DTYPES})")
+    return dtype
+
+
+def decode_vector(data, dimension: int) -> np.ndarray:
+    """Zero-copy, read-only view of stored bytes (float32 or float16, by length)."""
+    size = len(data)
+    if size == dimension * 4:
+        return np.frombuffer(data, dtype=np.float32)
+    if size == dimension * 2:
+        return np.frombuffer(data, dtype=np.float16)
+    raise ValueError(f"{size} bytes is not a {dimension}-d float32 or float16 vector")
+
+
+def stack_vectors(rows: List[np.ndarray], dimension: int) -> np.ndarray:
+    """(n, dimension) float32 matrix from decoded rows: one join + ``np.frombuffer`` when all are float32."""
+    if not rows:
+        return np.zeros((0, dimension), dtype=np.float32)
+    if all(r.dtype == np.float32 for r in rows):
+        return np.frombuffer(b"".join(rows), dtype=np.float32).reshape(len(rows), dimension)
+    return np.stack(rows).astype(np.float32)
+
+
+class VectorField(models.BinaryField):
+    """NumPy vector stored as raw bytes; reads as a read-only array in the stored dtype."""
+
+    description = "Fixed-size float32/float16 vector"
+
+    def __init__(self, *args, dimension: int = 384, dtype: Optional[str] = None, **kwargs) -> None:
+        self.dimension = dimension
+        # Write format only: not part of the schema, so left out of deconstruct().
+        self._dtype = dtype
+        super().__init__(*args, **kwargs)
+
+    @property
+    def dtype(self) -> str:
+        return self._dtype or storage_dtype()
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['dimension'] = self.dimension
+        return name, path, args, kwargs
+
+    def encode(self, value) -> bytes:
+        vector = np.asarray(value, dtype=self.dtype)
+        if vector.shape != (self.dimension,):
+            raise ValidationError(f"Expected a {self.dimension}-d vector, got shape {vector.shape}")
+        return vector.tobytes()
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return decode_vector(value, self.dimension)
+
+    def to_python(self, value):
+        if value is None or isinstance(value, np.ndarray):
+            return value
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return decode_vector(value, self.dimension)
+        if isinstance(value, str):
+            return decode_vector(base64.b64decode(value), self.dimension)
+        return np.asarray(value, dtype=np.float32)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if value is not None and not isinstance(value, (bytes, bytearray, memoryview)):
+            value = self.encode(value)
+        return super().get_db_prep_value(value, connection, prepared)
+
+    def value_to_string(self, obj) -> str:
+        value = self.value_from_object(obj)
+        return "" if value is None else base64.b64encode(self.encode(value)).decode('ascii')
+
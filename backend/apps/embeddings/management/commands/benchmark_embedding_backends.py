@@ -0,0 +1,150 @@
+"""
+Compare embedding backends: parity with PyTorch, throughput and RSS.
+
+Each backend runs in a fresh interpreter so its RSS is measured in isolation.
+Parity is the row-wise cosine between a backend's vectors and the PyTorch
+vectors on a fixed corpus (skill dictionary phrases + role descriptions).
+"""
+import csv
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.embedding_service import load_backend
+from core.utils.memory import rss_mb
+
+DEFAULT_ROLES_CSV = Path(settings.BASE_DIR) / "apps" / "documents" / "data" / "IT_Job_Roles_Skills.csv"
+VARIANTS = {
+    'torch': ('torch', False),
+    'onnx': ('onnx', False),
+    'onnx-int8': ('onnx', True),
+}
+
+
+def _fixed_corpus(limit: int):
+    from apps.skills.services.skill_dictionary import load_skill_phrases
+
+    texts = list(load_skill_phrases())
+    if DEFAULT_ROLES_CSV.exists():
+        with open(DEFAULT_ROLES_CSV, encoding="latin1", newline="") as f:
+            texts += [row.get("Job Description") or "" for row in csv.DictReader(f)]
+    texts = [t for t in texts if t.strip()]
+    return texts[:limit] if limit else texts
+
+
+class Command(BaseCommand):
+    help = 'Benchmark embedding backends (torch / onnx / onnx-int8): cosine parity vs torch, texts/s and RSS'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backends', nargs='+', default=['torch', 'onnx', 'onnx-int8'], choices=sorted(VARIANTS))
+        parser.add_argument('--limit', type=int, default=0, help='Use only the first N corpus texts')
+        parser.add_argument('--repeat', type=int, default=3, help='Timed passes over the corpus per backend')
+        parser.add_argument('--batch-size', type=int, default=32)
+        parser.add_argument('--threads', type=int, nargs='+', default=[0], help='ONNX intra-op thread counts to try (0 = default)')
+        parser.add_argument('--min-cosine', type=float, default=0.98, help='Fail if any row cosine vs torch is below this')
+        parser.add_argument('--output', default=None, help='Write the report as JSON to this path')
+        # Internal: run one backend in this (fresh) process.
+        parser.add_argument('--worker', default=None, help='internal')
+        parser.add_argument('--worker-threads', type=int, default=0, help='internal')
+        parser.add_argument('--corpus-file', default=None, help='internal')
+        parser.add_argument('--vectors-file', default=None, help='internal')
+
+    def handle(self, *args, **options):
+        if options['worker']:
+            return self._work(options)
+
+        texts = _fixed_corpus(options['limit'])
+        if not texts:
+            raise CommandError('Corpus is empty')
+        runs = []
+        for name in options['backends']:
+            thread_counts = options['threads'] if VARIANTS[name][0] == 'onnx' else [0]
+            runs += [(name, threads) for threads in thread_counts]
+
+        report = {'texts': len(texts), 'batch_size': options['batch_size'], 'runs': {}}
+        vectors = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            corpus_file = Path(tmp) / 'corpus.json'
+            corpus_file.write_text(json.dumps(texts))
+            for name, threads in runs:
+                label = f"{name}@{threads}t" if threads else name
+                vectors_file = Path(tmp) / f'{label}.npy'
+                proc = subprocess.run(
+                    [sys.executable, 'manage.py', 'benchmark_embedding_backends', '--worker', name,
+                     '--worker-threads', str(threads), '--corpus-file', str(corpus_file),
+                     '--vectors-file', str(vectors_file), '--repeat', str(options['repeat']),
+                     '--batch-size', str(options['batch_size'])],
+                    cwd=str(settings.BASE_DIR), capture_output=True, text=True,
+                )
+                if proc.returncode != 0:
+                    report['runs'][label] = {'error': proc.stderr.strip().splitlines()[-1:] or ['failed']}
+                    self.stdout.write(self.style.WARNING(f"{label:>14}: failed ({report['runs'][label]['error'][0]})"))
+                    continue
+                stats = json.loads(proc.stdout.strip().splitlines()[-1])
+                vectors[label] = np.load(vectors_file)
+                report['runs'][label] = stats
+                self.stdout.write(
+                    f"{label:>14}: load {stats['load_seconds']:.2f}s, +{stats['rss_model_mb']:.0f} MB RSS "
+                    f"(peak {stats['peak_rss_mb']:.0f} MB), {stats['texts_per_second']:,.0f} texts/s"
+                )
+
+        failures = []
+        if 'torch' in vectors:
+            reference = vectors['torch']
+            for label, vecs in vectors.items():
+                if label == 'torch':
+                    continue
+                cos = np.sum(reference * vecs, axis=1) / (
+                    np.linalg.norm(reference, axis=1) * np.linalg.norm(vecs, axis=1) + 1e-12
+                )
+                parity = {
+                    'min_cosine': round(float(cos.min()), 5),
+                    'mean_cosine': round(float(cos.mean()), 5),
+                    'p01_cosine': round(float(np.percentile(cos, 1)), 5),
+                    'worst_text': texts[int(cos.argmin())],
+                }
+                report['runs'][label]['parity_vs_torch'] = parity
+                self.stdout.write(f"{label:>14}: cosine vs torch min {parity['min_cosine']:.4f}, mean {parity['mean_cosine']:.4f}")
+                if parity['min_cosine'] < options['min_cosine']:
+                    failures.append(f"{label}: min cosine {parity['min_cosine']:.4f} < {options['min_cosine']}")
+        elif len(vectors) > 0:
+            self.stdout.write(self.style.WARNING('No torch run: parity not checked'))
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(report, indent=2))
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+        if failures:
+            raise CommandError("Parity check failed:\n" + "\n".join(failures))
+
+    def _work(self, options):
+        backend, quantized = VARIANTS[options['worker']]
+        texts = json.loads(Path(options['corpus_file']).read_text())
+        rss_before = rss_mb()
+        t0 = time.perf_counter()
+        model = load_backend(backend, quantized=quantized, threads=options['worker_threads'] or None)
+        model.encode(texts[:options['batch_size']], batch_size=options['batch_size'], convert_to_numpy=True)
+        load_s = time.perf_counter() - t0
+        rss_model = rss_mb() - rss_before
+
+        repeat = max(1, options['repeat'])
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            vecs = model.encode(texts, batch_size=options['batch_size'], convert_to_numpy=True)
+        elapsed = (time.perf_counter() - t0) / repeat
+        np.save(options['vectors_file'], np.asarray(vecs, dtype=np.float32))
+        self.stdout.write(json.dumps({
+            'backend': backend,
+            'quantized': quantized,
+            'threads': getattr(model, 'threads', None),
+            'load_seconds': round(load_s, 3),
+            'rss_model_mb': round(rss_model, 1),
+            'peak_rss_mb': round(peakrss_mb(), 1),
+            'texts_per_second': round(len(texts) / elapsed, 1),
+        }))
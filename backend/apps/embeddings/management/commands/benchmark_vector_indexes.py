@@ -0,0 +1,229 @@
+"""
+Benchmark FAISS index types for the role indexes: recall, latency, build time and memory.
+
+Datasets: ``roles`` (the CSV role vectors of the ``csv_roles`` index, or
+freshly encoded from the CSV when that index cannot return them) and
+``synthetic`` (low-rank latent vectors randomly projected to the embedding
+dimension, with noise, so they cluster like real embeddings rather than
+uniform noise). Queries are dataset rows plus noise, L2-normalized.
+
+Every candidate factory string (the same strings VECTOR_INDEX_FACTORY takes,
+``{nlist}`` resolved as in ``vector_store``) is built over the dataset and
+compared with exact inner-product search: recall@k is the share of the exact
+top k that the index returns. Latency is per single query (the app searches
+one user / resume at a time); batch QPS is reported alongside.
+"""
+import json
+import platform
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.vector_store import resolve_factory, vector_index_config
+from core.utils.memory import rss_mb
+
+DEFAULT_FACTORIES = ['Flat', 'HNSW32', 'IVF{nlist},Flat', 'IVF{nlist},SQ8', 'IVF{nlist},PQ48', 'SQ8']
+ADD_CHUNK = 100_000
+REPORT_DIR = Path(settings.BASE_DIR) / 'data' / 'benchmarks'
+
+
+def _normalize(X: np.ndarray) -> np.ndarray:
+    """In place: rows scaled to unit length."""
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    X /= np.maximum(norms, 1e-12)
+    return X
+
+
+def _role_vectors() -> np.ndarray:
+    from apps.roles.services.role_faiss_manager import RoleFAISSManager
+
+    manager = RoleFAISSManager()
+    if manager.exists():
+        manager.load()
+        try:
+            return _normalize(np.array(manager.index.reconstruct_n(0, manager.index.ntotal), dtype=np.float32))
+        except RuntimeError:
+            pass  # e.g. IVF without a direct map: encode the CSV instead
+    import pandas as pd
+
+    from apps.roles.services.role_embedding_pipeline import DOCUMENTS_DATA_CSV, build_role_texts
+    from core.services.embedding_service import encode
+
+    df = pd.read_csv(DOCUMENTS_DATA_CSV, encoding="latin1").dropna(subset=["Job Title", "Job Description", "Skills"])
+    vectors = encode(build_role_texts(df), normalize=True, return_numpy=True)
+    if not np.any(vectors):
+        raise CommandError('No csv_roles index and no embedding model: cannot build the roles dataset')
+    return _normalize(np.asarray(vectors, dtype=np.float32))
+
+
+def _synthetic_vectors(n: int, dim: int, rank: int, rng: np.random.Generator) -> np.ndarray:
+    """``n`` unit vectors: ``rank``-d Gaussian latents through a fixed random projection, plus noise."""
+    projection = rng.standard_normal((rank, dim)).astype(np.float32) / np.sqrt(rank)
+    X = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, ADD_CHUNK):
+        stop = min(n, start + ADD_CHUNK)
+        latent = rng.standard_normal((stop - start, rank)).astype(np.float32)
+        X[start:stop] = latent @ projection + 0.1 * rng.standard_normal((stop - start, dim)).astype(np.float32)
+    return _normalize(X)
+
+
+def _queries(X: np.ndarray, count: int, noise: float, rng: np.random.Generator) -> np.ndarray:
+    rows = rng.choice(len(X), size=count, replace=count > len(X))
+    Q = X[rows] + noise * rng.standard_normal((count, X.shape[1])).astype(np.float32) / np.sqrt(X.shape[1])
+    return _normalize(Q.astype(np.float32))
+
+
+def _exact_top(X: np.ndarray, Q: np.ndarray, k: int) -> np.ndarray:
+    import faiss
+
+    flat = faiss.IndexFlatIP(X.shape[1])
+    flat.add(X)
+    return flat.search(Q, k)[1]
+
+
+def _build(factory: str, X: np.ndarray):
+    import faiss
+
+    index = faiss.index_factory(X.shape[1], resolve_factory(factory, len(X)), faiss.METRIC_INNER_PRODUCT)
+    if not index.is_trained:
+        index.train(X)
+    for start in range(0, len(X), ADD_CHUNK):
+        index.add(X[start:start + ADD_CHUNK])
+    return index
+
+
+def _index_bytes(index) -> int:
+    import faiss
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "index.bin"
+        faiss.write_index(index, str(path))
+        return path.stat().st_size
+
+
+def _param_sets(index, options) -> List[Dict[str, int]]:
+    """Search-parameter settings to time for this index type (one empty set for exact types)."""
+    import faiss
+
+    if faiss.try_extract_index_ivf(index) is not None:
+        return [{'nprobe': n} for n in options['nprobe']]
+    if isinstance(faiss.downcast_index(index), faiss.IndexHNSW):
+        return [{'efSearch': ef} for ef in options['ef_search']]
+    return [{}]
+
+
+def _latency_ms(index, Q: np.ndarray, k: int) -> Tuple[float, float, float]:
+    """(p50, p99, batch QPS) for ``k``-NN searches of the rows of ``Q``."""
+    timings = np.empty(len(Q))
+    for i in range(len(Q)):
+        t0 = time.perf_counter()
+        index.search(Q[i:i + 1], k)
+        timings[i] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    index.search(Q, k)
+    qps = len(Q) / (time.perf_counter() - t0)
+    return float(np.percentile(timings, 50) * 1000), float(np.percentile(timings, 99) * 1000), qps
+
+
+class Command(BaseCommand):
+    help = 'Benchmark FAISS index types (recall@k vs exact, p50/p99 latency, build time, memory) and write a JSON report'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--factories', nargs='+', default=DEFAULT_FACTORIES, help='FAISS index factory strings ({nlist} is sized from the data)')
+        parser.add_argument('--datasets', nargs='+', default=['roles', 'synthetic'], choices=['roles', 'synthetic'])
+        parser.add_argument('--synthetic-size', type=int, default=1_000_000)
+        parser.add_argument('--synthetic-rank', type=int, default=64, help='Latent dimension of the synthetic vectors')
+        parser.add_argument('--queries', type=int, default=1000)
+        parser.add_argument('--query-noise', type=float, default=0.5, help='Gaussian noise added to the rows queries are drawn from')
+        parser.add_argument('--k', type=int, nargs='+', default=[1, 10, 30])
+        parser.add_argument('--nprobe', type=int, nargs='+', default=None, help='IVF nprobe values to time (default: configured)')
+        parser.add_argument('--ef-search', type=int, nargs='+', default=None, help='HNSW efSearch values to time (default: configured)')
+        parser.add_argument('--threads', type=int, default=0, help='FAISS OpenMP threads (0 = FAISS default)')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', default=None, help='Report path (default: data/benchmarks/vector_indexes-<UTC time>.json)')
+
+    def handle(self, *args, **options):
+        import faiss
+
+        if options['threads']:
+            faiss.omp_set_num_threads(options['threads'])
+        configured = vector_index_config('csv_roles')['SEARCH_PARAMS']
+        options['nprobe'] = options['nprobe'] or [configured.get('nprobe', 16)]
+        options['ef_search'] = options['ef_search'] or [configured.get('efSearch', 64)]
+        rng = np.random.default_rng(options['seed'])
+        dim = settings.EMBEDDING_CONFIG.get('DIMENSION', 384)
+        ks = sorted(set(options['k']))
+
+        started = datetime.now(timezone.utc)
+        output = Path(options['output'] or REPORT_DIR / f"vector_indexes-{started:%Y%m%dT%H%M%SZ}.json")
+        report = {
+            'generated_at': started.isoformat(timespec='seconds'),
+            'faiss_version': faiss.__version__,
+            'machine': platform.machine(),
+            'threads': faiss.omp_get_max_threads(),
+            'k': ks,
+            'datasets': {},
+        }
+        for dataset in options['datasets']:
+            self.stdout.write(f"Preparing {dataset} dataset...")
+            if dataset == 'roles':
+                X = _role_vectors()
+            else:
+                X = _synthetic_vectors(options['synthetic_size'], dim, options['synthetic_rank'], rng)
+            Q = _queries(X, options['queries'], options['query_noise'], rng)
+            k_max = min(max(ks), len(X))
+            exact = _exact_top(X, Q, k_max)
+            runs = []
+            report['datasets'][dataset] = {'vectors': len(X), 'dimension': X.shape[1], 'queries': len(Q), 'runs': runs}
+            self.stdout.write(f"{dataset}: {len(X):,} x {X.shape[1]} vectors, {len(Q)} queries")
+
+            for factory in options['factories']:
+                rss_before = rss_mb()
+                t0 = time.perf_counter()
+                try:
+                    index = _build(factory, X)
+                except RuntimeError as e:
+                    runs.append({'factory': factory, 'error': str(e).strip().splitlines()[-1]})
+                    self.stdout.write(self.style.WARNING(f"  {factory:>20}: build failed ({runs[-1]['error']})"))
+                    continue
+                build_s = time.perf_counter() - t0
+                base = {
+                    'factory': factory,
+                    'resolved_factory': resolve_factory(factory, len(X)),
+                    'build_seconds': round(build_s, 3),
+                    'index_mb': round(_index_bytes(index) / 2 ** 20, 2),
+                    'rss_delta_mb': round(rss_mb() - rss_before, 1),
+                }
+                space = faiss.ParameterSpace()
+                for params in _param_sets(index, options):
+                    for name, value in params.items():
+                        space.set_index_parameter(index, name, value)
+                    found = index.search(Q, k_max)[1]
+                    recall = {
+                        f'recall@{k}': round(float(np.mean([
+                            len(np.intersect1d(found[i, :k], exact[i, :k])) / k for i in range(len(Q))
+                        ])), 4)
+                        for k in ks if k <= k_max
+                    }
+                    p50, p99, qps = _latency_ms(index, Q, k_max)
+                    run = {**base, 'search_params': params, **recall,
+                           'p50_ms': round(p50, 4), 'p99_ms': round(p99, 4), 'batch_qps': round(qps, 1)}
+                    runs.append(run)
+                    label = factory + ''.join(f" {k}={v}" for k, v in params.items())
+                    recalls = ', '.join(f"{k} {v:.3f}" for k, v in recall.items())
+                    self.stdout.write(
+                        f"  {label:>28}: {recalls}; p50 {p50:.3f} ms, p99 {p99:.3f} ms, {qps:,.0f} q/s batch; "
+                        f"build {build_s:.1f}s, {base['index_mb']:.1f} MB"
+                    )
+                del index
+            del X
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Report written to {output}"))
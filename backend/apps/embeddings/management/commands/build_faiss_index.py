@@ -4,9 +4,10 @@ from django.core.management.base import BaseCommand
 from django.db.models import Prefetch
 
 from apps.roles.models import Role, RoleSkill
-from apps.embeddings.models import RoleEmbedding
+from apps.embeddings.services import role_vector_matrix, upsert_role_vectors
 from core.services.embedding_service import encode
 from apps.roles.services import FAISSRoleIndex
+from apps.roles.services.faiss_role_index import role_text
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +15,22 @@ logger = logging.getLogger(__name__)
 class Command(BaseCommand):
     help = 'Build FAISS index and role embeddings'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reuse-stored', action='store_true',
+            help='Index the stored RoleEmbedding vectors instead of re-encoding every role',
+        )
+
     def handle(self, *args, **options):
+        if options['reuse_stored']:
+            role_ids, matrix = role_vector_matrix()
+            if not role_ids:
+                self.stdout.write('No stored role vectors. Run without --reuse-stored first.')
+                return
+            FAISSRoleIndex().build(list(matrix), [str(rid) for rid in role_ids])
+            self.stdout.write(self.style.SUCCESS(f'Built FAISS index for {len(role_ids)} stored role vectors'))
+            return
+
         roles = Role.objects.prefetch_related(
             Prefetch('skills', queryset=RoleSkill.objects.select_related('skill'))
         ).all()
@@ -25,17 +41,11 @@ class Command(BaseCommand):
         texts = []
         role_ids = []
         for r in roles:
-            skill_names = [rs.skill.name for rs in r.skills.all()]
-            text = f"{r.title} {' '.join(skill_names)}"
-            texts.append(text)
+            texts.append(role_text(r))
             role_ids.append(str(r.id))
 
         vectors = encode(texts)
-        for role, vec in zip(roles, vectors):
-            RoleEmbedding.objects.update_or_create(
-                role=role,
-                defaults={'vector': vec},
-            )
+        upsert_role_vectors(roles, vectors)
 
         index = FAISSRoleIndex()
         index.build(vectors, role_ids)
@@ -0,0 +1,93 @@
+"""
+Import-time budget for Django startup.
+
+Runs ``django.setup()`` plus URLconf loading in a fresh interpreter under
+``python -X importtime`` and fails when the total exceeds the budget, or when a
+heavyweight dependency (spaCy, Groq, Supabase, FAISS, scikit-learn, ...) is
+imported at startup instead of behind its accessor.
+
+    python manage.py check_import_time --budget-ms 1500
+"""
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_BUDGET_MS = 1500
+# Must only be imported on first use (model load, LLM call, upload, index build).
+DEFERRED_MODULES = (
+    'spacy', 'groq', 'supabase', 'faiss', 'sklearn', 'scipy', 'pandas', 'fitz', 'pymupdf',
+    'torch', 'sentence_transformers', 'onnxruntime', 'tokenizers',
+)
+_STARTUP_CODE = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+ImportLine = Tuple[int, int, str]  # (depth, cumulative us, module)
+
+
+def _run_importtime() -> List[ImportLine]:
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _STARTUP_CODE],
+        cwd=str(settings.BASE_DIR),
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise CommandError(f"Startup failed:\n{proc.stderr[-2000:]}")
+    lines = []
+    for raw in proc.stderr.splitlines():
+        m = _LINE_RE.match(raw)
+        if m:
+            # One leading space for top-level imports, two more per nesting level.
+            lines.append(((len(m.group(3)) - 1) // 2, int(m.group(2)), m.group(4)))
+    return lines
+
+
+def _import_chain(lines: List[ImportLine], pos: int) -> List[str]:
+    """Module at ``pos`` and the modules that imported it (importtime lists children first)."""
+    depth, _, module = lines[pos]
+    chain = [module]
+    for d, _, name in lines[pos + 1:]:
+        if d < depth:
+            chain.append(name)
+            depth = d
+            if depth == 0:
+                break
+    return chain
+
+
+class Command(BaseCommand):
+    help = 'Fail if Django startup imports exceed the time budget or pull in deferred heavy modules'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+        parser.add_argument('--repeat', type=int, default=3, help='Runs; the fastest one is judged')
+        parser.add_argument('--top', type=int, default=10, help='Slowest top-level imports to list')
+
+    def handle(self, *args, **options):
+        runs = [_run_importtime() for _ in range(max(1, options['repeat']))]
+        totals = [sum(us for depth, us, _ in lines if depth == 0) for lines in runs]
+        best = min(range(len(runs)), key=totals.__getitem__)
+        lines, total_ms = runs[best], totals[best] / 1000
+
+        top_level: Dict[str, int] = {name: us for depth, us, name in lines if depth == 0}
+        self.stdout.write(f"Startup imports: {total_ms:.0f} ms (budget {options['budget_ms']:.0f} ms)")
+        for name, us in sorted(top_level.items(), key=lambda kv: kv[1], reverse=True)[:options['top']]:
+            self.stdout.write(f"  {us / 1000:8.1f} ms  {name}")
+
+        errors = []
+        for pos, (_, us, module) in enumerate(lines):
+            if module in DEFERRED_MODULES:
+                chain = ' <- '.join(_import_chain(lines, pos))
+                errors.append(f"{module} imported at startup ({us / 1000:.0f} ms): {chain}")
+        if total_ms > options['budget_ms']:
+            errors.append(f"Startup imports took {total_ms:.0f} ms, over the {options['budget_ms']:.0f} ms budget")
+        if errors:
+            raise CommandError("\n".join(errors))
+        self.stdout.write(self.style.SUCCESS("Import-time budget OK"))
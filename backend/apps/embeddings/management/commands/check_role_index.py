@@ -0,0 +1,31 @@
+"""Compare the role FAISS index with the Role table; optionally repair and compact it."""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.roles.services.faiss_role_index import get_faiss_index, maintain_role_index
+
+
+class Command(BaseCommand):
+    help = 'Check the role index against the DB (--fix: index missing roles and drop deleted ones; --compact: rebuild)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Index missing roles, drop deleted ones, compact if due')
+        parser.add_argument('--compact', action='store_true', help='Rebuild from stored role vectors, dropping tombstones')
+
+    def handle(self, *args, **options):
+        index = get_faiss_index()
+        report = maintain_role_index() if options['fix'] else index.check_consistency()
+        if index.index is None:
+            raise CommandError('No role index. Run `manage.py build_faiss_index` first.')
+        self.stdout.write(
+            f"Indexed roles: {report['indexed']}, missing: {len(report['missing'])}, "
+            f"stale: {report['stale']}, tombstones: {report['tombstones']}"
+        )
+        for role_id in report['missing'][:20]:
+            self.stdout.write(f"  missing {role_id}")
+        if options['compact']:
+            dropped = index.compact()
+            self.stdout.write(self.style.SUCCESS(f"Compacted: {dropped} tombstones dropped"))
+        if options['fix']:
+            self.stdout.write(self.style.SUCCESS('Role index repaired'))
+        elif report['missing'] or report['stale']:
+            raise CommandError('Role index is out of sync with the DB (run with --fix)')
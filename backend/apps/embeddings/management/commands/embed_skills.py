@@ -0,0 +1,21 @@
+"""Precompute SkillEmbedding vectors."""
+from django.core.management.base import BaseCommand
+
+from apps.embeddings.services import embed_missing_skills, embed_skills
+from apps.skills.models import Skill
+
+
+class Command(BaseCommand):
+    help = 'Embed skills that have no SkillEmbedding yet (--all re-embeds every skill)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Re-embed every skill, e.g. after a model change')
+        parser.add_argument('--batch-size', type=int, default=256)
+
+    def handle(self, *args, **options):
+        if options['all']:
+            count = len(embed_skills(Skill.objects.only('id', 'name').iterator(), batch_size=options['batch_size']))
+        else:
+            count = embed_missing_skills(batch_size=options['batch_size'])
+        total = Skill.objects.count()
+        self.stdout.write(self.style.SUCCESS(f'Embedded {count} skills ({total} skills total)'))
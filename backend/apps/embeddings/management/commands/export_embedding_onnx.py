@@ -0,0 +1,94 @@
+"""Export the sentence-transformer to ONNX (optionally int8-quantized) for EMBEDDING_CONFIG['BACKEND'] = 'onnx'."""
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.embedding_service import onnx_model_dir
+from core.services.onnx_embedder import EXPORT_META_FILE, MODEL_FILE, QUANTIZED_MODEL_FILE, TOKENIZER_FILE
+
+
+class Command(BaseCommand):
+    help = 'Export EMBEDDING_CONFIG MODEL_NAME to an ONNX graph (+ int8 dynamic quantization with --quantize)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output-dir', default=None, help='Defaults to EMBEDDING_CONFIG ONNX_DIR')
+        parser.add_argument('--quantize', action='store_true', help='Also write model_int8.onnx (dynamic int8 weights)')
+        parser.add_argument('--per-channel', action='store_true', help='Per-channel weight quantization (slower, closer to fp32)')
+        parser.add_argument('--opset', type=int, default=14)
+
+    def handle(self, *args, **options):
+        try:
+            import torch
+            from sentence_transformers import SentenceTransformer
+            from sentence_transformers.models import Normalize, Pooling
+        except ImportError as e:
+            raise CommandError(f"Export needs torch and sentence-transformers: {e}")
+
+        name = settings.EMBEDDING_CONFIG.get('MODEL_NAME', 'all-MiniLM-L6-v2')
+        out_dir = Path(options['output_dir']) if options['output_dir'] else onnx_model_dir()
+        st = SentenceTransformer(name, device='cpu')
+        modules = list(st)
+        pooling = next((m for m in modules if isinstance(m, Pooling)), None)
+        if pooling is None or not pooling.pooling_mode_mean_tokens or len(modules) > 3:
+            raise CommandError(f"{name}: only Transformer -> mean Pooling [-> Normalize] models are supported")
+
+        transformer = modules[0]
+        hf_model = transformer.auto_model.eval()
+        hf_model.config.return_dict = False
+        tokenizer = transformer.tokenizer
+        if not getattr(tokenizer, 'is_fast', False):
+            raise CommandError(f"{name}: a fast (tokenizers) tokenizer is required")
+        dummy = tokenizer(['export the embedding model'], return_tensors='pt')
+        input_names = [n for n in ('input_ids', 'attention_mask', 'token_type_ids') if n in dummy]
+        dynamic = {n: {0: 'batch', 1: 'sequence'} for n in input_names}
+        dynamic['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_dir = Path(tmp)
+            with torch.no_grad():
+                torch.onnx.export(
+                    hf_model,
+                    tuple(dummy[n] for n in input_names),
+                    str(tmp_dir / MODEL_FILE),
+                    input_names=input_names,
+                    output_names=['last_hidden_state'],
+                    dynamic_axes=dynamic,
+                    opset_version=options['opset'],
+                    do_constant_folding=True,
+                )
+            tokenizer.backend_tokenizer.save(str(tmp_dir / TOKENIZER_FILE))
+            if options['quantize']:
+                from onnxruntime.quantization import QuantType, quantize_dynamic
+                quantize_dynamic(
+                    str(tmp_dir / MODEL_FILE),
+                    str(tmp_dir / QUANTIZED_MODEL_FILE),
+                    weight_type=QuantType.QInt8,
+                    per_channel=options['per_channel'],
+                )
+            meta = {
+                'model_name': name,
+                'dimension': st.get_sentence_embedding_dimension(),
+                'max_seq_length': st.max_seq_length,
+                'normalize': any(isinstance(m, Normalize) for m in modules),
+                'pad_token_id': tokenizer.pad_token_id,
+                'pad_token': tokenizer.pad_token,
+                'inputs': input_names,
+                'quantized': bool(options['quantize']),
+            }
+            (tmp_dir / EXPORT_META_FILE).write_text(json.dumps(meta, indent=2))
+            out_dir.mkdir(parents=True, exist_ok=True)
+            if not options['quantize']:
+                # An int8 graph from an earlier export would no longer match model.onnx.
+                (out_dir / QUANTIZED_MODEL_FILE).unlink(missing_ok=True)
+            for path in tmp_dir.iterdir():
+                shutil.move(str(path), out_dir / path.name)
+
+        sizes = ', '.join(
+            f"{f} {(out_dir / f).stat().st_size / 1e6:.1f} MB"
+            for f in (MODEL_FILE, QUANTIZED_MODEL_FILE) if (out_dir / f).exists()
+        )
+        self.stdout.write(self.style.SUCCESS(f"Exported {name} to {out_dir} ({sizes})"))
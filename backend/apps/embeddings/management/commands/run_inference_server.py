@@ -0,0 +1,55 @@
+"""
+Run the shared inference server for this host's web workers.
+
+    INFERENCE_SOCKET=/tmp/inference.sock python manage.py run_inference_server
+
+Workers started with the same INFERENCE_SOCKET send ``encode`` and skill
+matching here instead of loading the models themselves.
+"""
+import signal
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.inference_client import disable_inference_client
+from core.services.inference_server import InferenceServer
+from core.services.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = 'Serve embedding and skill-matching inference to all web workers over a Unix socket'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--socket', default=None, help='Defaults to INFERENCE_SERVER_CONFIG SOCKET')
+        parser.add_argument('--no-warm-up', action='store_true', help='Load the models on the first request instead')
+
+    def handle(self, *args, **options):
+        path = options['socket'] or settings.INFERENCE_SERVER_CONFIG.get('SOCKET')
+        if not path:
+            raise CommandError('No socket path: pass --socket or set INFERENCE_SOCKET')
+        # This process is the server: never forward requests to ourselves.
+        disable_inference_client()
+        cfg = settings.EMBEDDING_CONFIG
+        try:
+            server = InferenceServer(
+                path,
+                max_batch_items=cfg.get('BATCH_MAX_ITEMS', 64),
+                max_wait_ms=cfg.get('BATCH_MAX_WAIT_MS', 5.0),
+            )
+        except (OSError, RuntimeError) as e:
+            raise CommandError(f"Cannot listen on {path}: {e}")
+
+        if not options['no_warm_up']:
+            for name, status in warm_up(['embedding_model', 'skill_extractor']).items():
+                style = self.style.SUCCESS if status['ready'] else self.style.WARNING
+                self.stdout.write(style(f"{name}: {status['state']} in {status['seconds']:.2f}s ({status['detail']})"))
+
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        self.stdout.write(self.style.SUCCESS(f"Inference server listening on {path}"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,92 @@
+# Generated by Django 5.0.14 on 2026-10-18 21:05
+
+import django.contrib.postgres.fields
+import numpy as np
+from django.db import migrations, models
+
+import apps.embeddings.fields
+
+BATCH_SIZE = 1000
+
+
+def _copy(apps, source, target, convert):
+    for name in ('SkillEmbedding', 'RoleEmbedding'):
+        model = apps.get_model('embeddings', name)
+        batch = []
+        for obj in model.objects.only('id', source).iterator(chunk_size=BATCH_SIZE):
+            value = getattr(obj, source)
+            setattr(obj, target, None if value is None else convert(value))
+            batch.append(obj)
+            if len(batch) >= BATCH_SIZE:
+                model.objects.bulk_update(batch, [target])
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, [target])
+
+
+def arrays_to_bytes(apps, schema_editor):
+    _copy(apps, 'vector', 'vector_data', lambda v: np.asarray(v, dtype=np.float32))
+
+
+def bytes_to_arrays(apps, schema_editor):
+    _copy(apps, 'vector_data', 'vector', lambda v: np.asarray(v, dtype=np.float64).tolist())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('embeddings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='roleembedding',
+            name='vector_data',
+            field=apps.embeddings.fields.VectorField(dimension=384, null=True),
+        ),
+        migrations.AddField(
+            model_name='skillembedding',
+            name='vector_data',
+            field=apps.embeddings.fields.VectorField(dimension=384, null=True),
+        ),
+        # Nullable while both columns exist, so the migration can be reversed.
+        migrations.AlterField(
+            model_name='roleembedding',
+            name='vector',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), null=True, size=384),
+        ),
+        migrations.AlterField(
+            model_name='skillembedding',
+            name='vector',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), null=True, size=384),
+        ),
+        migrations.RunPython(arrays_to_bytes, bytes_to_arrays),
+        migrations.RemoveField(
+            model_name='roleembedding',
+            name='vector',
+        ),
+        migrations.RemoveField(
+            model_name='skillembedding',
+            name='vector',
+        ),
+        migrations.RenameField(
+            model_name='roleembedding',
+            old_name='vector_data',
+            new_name='vector',
+        ),
+        migrations.RenameField(
+            model_name='skillembedding',
+            old_name='vector_data',
+            new_name='vector',
+        ),
+        migrations.AlterField(
+            model_name='roleembedding',
+            name='vector',
+            field=apps.embeddings.fields.VectorField(dimension=384),
+        ),
+        migrations.AlterField(
+            model_name='skillembedding',
+            name='vector',
+            field=apps.embeddings.fields.VectorField(dimension=384),
+        ),
+    ]
@@ -0,0 +1,235 @@
+"""
+Skill vectors and query-vector composition.
+
+Every ``Skill`` gets an L2-normalized MiniLM vector of its name, stored in
+``SkillEmbedding`` (``python manage.py embed_skills`` backfills; new skills are
+embedded on commit). User and resume query vectors are then pooled from the
+stored vectors (mean, or weighted by each skill's average role importance)
+instead of running the transformer on every request.
+"""
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Avg
+
+from apps.embeddings.fields import stack_vectors
+from apps.embeddings.models import RoleEmbedding, SkillEmbedding
+from apps.skills.models import Skill, UserSkill
+from core.services.embedding_service import encode
+
+logger = logging.getLogger(__name__)
+
+POOLING_MODES = ('mean', 'weighted')
+
+
+class SkillVectorStore:
+    """In-process ``skill_id -> vector`` map in front of the SkillEmbedding table."""
+
+    def __init__(self) -> None:
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, skill_ids: Iterable) -> Dict[str, np.ndarray]:
+        """Vectors for ``skill_ids``; skills without a stored vector are embedded now."""
+        wanted = list(dict.fromkeys(str(sid) for sid in skill_ids))
+        with self._lock:
+            found = {sid: self._vectors[sid] for sid in wanted if sid in self._vectors}
+        missing = [sid for sid in wanted if sid not in found]
+        if missing:
+            ids, matrix = load_vector_matrix(SkillEmbedding.objects.filter(skill_id__in=missing), 'skill_id')
+            loaded = {str(sid): vec for sid, vec in zip(ids, matrix)}
+            still_missing = [sid for sid in missing if sid not in loaded]
+            if still_missing:
+                loaded.update(embed_skills(Skill.objects.filter(id__in=still_missing)))
+            self._remember(loaded)
+            found.update(loaded)
+        return found
+
+    def forget(self, skill_ids: Iterable) -> None:
+        with self._lock:
+            for sid in skill_ids:
+                self._vectors.pop(str(sid), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vectors.clear()
+
+    def _remember(self, vectors: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            for vec in vectors.values():
+                vec.setflags(write=False)
+            self._vectors.update(vectors)
+
+
+_store: SkillVectorStore | None = None
+
+
+def get_skill_vector_store() -> SkillVectorStore:
+    global _store
+    if _store is None:
+        _store = SkillVectorStore()
+    return _store
+
+
+def embed_skills(skills: Iterable[Skill], batch_size: int = 256) -> Dict[str, np.ndarray]:
+    """Encode skill names and upsert their SkillEmbedding rows. Returns skill_id -> vector."""
+    skills = list(skills)
+    out: Dict[str, np.ndarray] = {}
+    for start in range(0, len(skills), batch_size):
+        batch = skills[start:start + batch_size]
+        vectors = encode([s.name for s in batch], normalize=True, return_numpy=True)
+        rows = []
+        for skill, vec in zip(batch, vectors):
+            if not np.any(vec):
+                # Model unavailable (zero-vector fallback): nothing worth storing.
+                continue
+            rows.append(SkillEmbedding(skill=skill, vector=vec))
+            out[str(skill.id)] = vec
+        if rows:
+            SkillEmbedding.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['skill'],
+                update_fields=['vector'],
+            )
+    if out:
+        get_skill_vector_store().forget(out)
+    return out
+
+
+def load_vector_matrix(queryset, key: str) -> Tuple[List, np.ndarray]:
+    """(keys, float32 matrix) for every embedding row in ``queryset``: one query, one buffer decode."""
+    rows = list(queryset.values_list(key, 'vector'))
+    dimension = queryset.model._meta.get_field('vector').dimension
+    return [k for k, _ in rows], stack_vectors([v for _, v in rows], dimension)
+
+
+def skill_vector_matrix() -> Tuple[List, np.ndarray]:
+    return load_vector_matrix(SkillEmbedding.objects.all(), 'skill_id')
+
+
+def role_vector_matrix() -> Tuple[List, np.ndarray]:
+    return load_vector_matrix(RoleEmbedding.objects.all(), 'role_id')
+
+
+def upsert_role_vectors(roles: Sequence, vectors: Sequence[np.ndarray], batch_size: int = 500) -> None:
+    """Bulk insert-or-update RoleEmbedding rows (one statement per batch)."""
+    rows = [RoleEmbedding(role=role, vector=vec) for role, vec in zip(roles, vectors)]
+    RoleEmbedding.objects.bulk_create(
+        rows,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['role'],
+        update_fields=['vector'],
+    )
+
+
+def embed_missing_skills(batch_size: int = 256) -> int:
+    skills = Skill.objects.filter(embedding__isnull=True).only('id', 'name')
+    return len(embed_skills(skills.iterator(chunk_size=batch_size), batch_size=batch_size))
+
+
+def skill_importance(skill_ids: Iterable) -> Dict[str, float]:
+    """Average RoleSkill.importance_weight per skill (skills in no role are absent)."""
+    rows = (
+        Skill.objects.filter(id__in=list(skill_ids), role_skills__isnull=False)
+        .annotate(importance=Avg('role_skills__importance_weight'))
+        .values_list('id', 'importance')
+    )
+    return {str(sid): float(imp) for sid, imp in rows}
+
+
+def pool_vectors(vectors: Sequence[np.ndarray], weights: Optional[Sequence[float]] = None) -> Optional[np.ndarray]:
+    """(Weighted) mean of ``vectors``, L2-normalized. None when there is nothing to pool."""
+    if not len(vectors):
+        return None
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if weights is None:
+        pooled = matrix.mean(axis=0)
+    else:
+        w = np.asarray(weights, dtype=np.float32)
+        if not w.sum() > 0:
+            return None
+        pooled = (matrix * w[:, None]).sum(axis=0) / w.sum()
+    norm = np.linalg.norm(pooled)
+    return pooled / norm if norm > 0 else None
+
+
+def _pooling_mode(pooling: Optional[str]) -> str:
+    pooling = pooling or settings.EMBEDDING_CONFIG.get('QUERY_POOLING', 'mean')
+    if pooling not in POOLING_MODES:
+        raise ValueError(f"Unknown pooling {pooling!r} (expected one of {POOLING_MODES})")
+    return pooling
+
+
+def _stored_vectors(skill_ids: Iterable, pooling: str):
+    """(vectors, weights) for the skills that have a vector; weights are None for mean pooling."""
+    ids = list(dict.fromkeys(str(sid) for sid in skill_ids))
+    stored = get_skill_vector_store().get_many(ids)
+    ids = [sid for sid in ids if sid in stored]
+    weights = None
+    if pooling == 'weighted':
+        importance = skill_importance(ids)
+        # Skills no role lists still count, at the neutral weight.
+        weights = [importance.get(sid, 1.0) for sid in ids]
+    return [stored[sid] for sid in ids], weights
+
+
+def compose_skill_vector(skill_ids: Iterable, pooling: Optional[str] = None) -> Optional[np.ndarray]:
+    """Query vector for a set of skills, pooled from stored vectors (no model call when all are stored)."""
+    vectors, weights = _stored_vectors(skill_ids, _pooling_mode(pooling))
+    return pool_vectors(vectors, weights)
+
+
+def compose_skill_vectors(
+    skill_id_sets: Sequence[Iterable], pooling: Optional[str] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    ``compose_skill_vector`` for many skill sets at once (one vector lookup and
+    one importance query for their union). Returns the (n, d) float32 matrix
+    and a boolean mask of the rows that had any stored vector (the others are zero).
+    """
+    pooling = _pooling_mode(pooling)
+    id_sets = [list(dict.fromkeys(str(sid) for sid in ids)) for ids in skill_id_sets]
+    union = list(dict.fromkeys(sid for ids in id_sets for sid in ids))
+    stored = get_skill_vector_store().get_many(union)
+    importance = skill_importance(stored) if pooling == 'weighted' else {}
+    matrix = np.zeros((len(id_sets), settings.EMBEDDING_CONFIG.get('DIMENSION', 384)), dtype=np.float32)
+    found = np.zeros(len(id_sets), dtype=bool)
+    for row, ids in enumerate(id_sets):
+        ids = [sid for sid in ids if sid in stored]
+        weights = [importance.get(sid, 1.0) for sid in ids] if pooling == 'weighted' else None
+        pooled = pool_vectors([stored[sid] for sid in ids], weights)
+        if pooled is not None:
+            matrix[row] = pooled
+            found[row] = True
+    return matrix, found
+
+
+def compose_user_vector(user, pooling: Optional[str] = None) -> Optional[np.ndarray]:
+    skill_ids = UserSkill.objects.filter(user=user).values_list('skill_id', flat=True)
+    return compose_skill_vector(skill_ids, pooling=pooling)
+
+
+def compose_resume_vector(skill_names: List[str], pooling: Optional[str] = None) -> Optional[np.ndarray]:
+    """
+    Query vector for extracted resume skills. Known skills use stored vectors;
+    names with no Skill row are encoded (through the embedding cache).
+    """
+    if not skill_names:
+        return None
+    pooling = _pooling_mode(pooling)
+    by_name = dict(
+        Skill.objects.filter(normalized_name__in=[n.lower() for n in skill_names]).values_list('normalized_name', 'id')
+    )
+    vectors, weights = _stored_vectors((by_name[n.lower()] for n in skill_names if n.lower() in by_name), pooling)
+    unknown = list(dict.fromkeys(n for n in skill_names if n.lower() not in by_name))
+    if unknown:
+        extra = [v for v in encode(unknown, normalize=True, return_numpy=True) if np.any(v)]
+        vectors = vectors + extra
+        if weights is not None:
+            weights = weights + [1.0] * len(extra)
+    return pool_vectors(vectors, weights)
@@ -0,0 +1,124 @@
+"""Keep SkillEmbedding / RoleEmbedding and the role index in step with the Skill and Role tables."""
+import logging
+import threading
+from functools import partial
+from typing import Iterable, Optional, Set
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.roles.models import Role, RoleSkill
+from apps.roles.signals import role_skills_linked
+from apps.skills.models import Skill
+from apps.skills.signals import skills_created
+
+logger = logging.getLogger(__name__)
+
+
+def _embed(skill_ids):
+    if not settings.EMBEDDING_CONFIG.get('EMBED_NEW_SKILLS', True):
+        return
+    from apps.embeddings.services import embed_skills
+    try:
+        embed_skills(Skill.objects.filter(id__in=list(skill_ids)))
+    except Exception as e:
+        # Missing vectors are filled on first use; never fail the write that created the skill.
+        logger.warning("Embedding new skills failed: %s", e)
+
+
+@receiver(post_save, sender=Skill, dispatch_uid='embed_created_skill')
+def embed_created_skill(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: _embed([instance.id]))
+
+
+@receiver(skills_created, dispatch_uid='embed_bulk_created_skills')
+def embed_bulk_created_skills(sender, skill_ids, **kwargs):
+    # Already sent on commit.
+    _embed(skill_ids)
+
+
+# Per thread and DB alias: role ids changed in the open transaction. Every
+# change registers an on_commit hook; the first to run after the commit hands
+# the whole set to the sync thread, the rest find it empty. (Outside a
+# transaction on_commit runs the hook at once. Ids left by a rollback ride
+# along with the next commit: syncing an unchanged role is a no-op.)
+_pending = threading.local()
+
+# Role ids waiting for the sync thread, which re-embeds them off the request
+# path and exits once the set is drained.
+_sync_lock = threading.Lock()
+_sync_queue: Set[str] = set()
+_sync_thread: Optional[threading.Thread] = None
+
+
+def _queue_role_sync(role_ids: Iterable, using: Optional[str] = None) -> None:
+    if not settings.VECTOR_INDEX_CONFIG.get('AUTO_UPDATE', True):
+        return
+    alias = transaction.get_connection(using).alias
+    pending = getattr(_pending, 'ids', None)
+    if pending is None:
+        pending = _pending.ids = {}
+    pending.setdefault(alias, set()).update(str(r) for r in role_ids)
+    transaction.on_commit(partial(_flush_pending, alias), using=alias)
+
+
+def _flush_pending(alias: str) -> None:
+    role_ids = _pending.ids.pop(alias, None)
+    if not role_ids:
+        return
+    if not settings.VECTOR_INDEX_CONFIG.get('SYNC_IN_BACKGROUND', True):
+        _sync_roles(role_ids)
+        return
+    global _sync_thread
+    with _sync_lock:
+        _sync_queue.update(role_ids)
+        if _sync_thread is None:
+            # Not a daemon: management commands (seed_roles) wait for it before exiting.
+            _sync_thread = threading.Thread(target=_drain_sync_queue, name='role-index-sync')
+            _sync_thread.start()
+
+
+def _drain_sync_queue() -> None:
+    global _sync_thread
+    from django.db import connection
+
+    try:
+        while True:
+            with _sync_lock:
+                if not _sync_queue:
+                    _sync_thread = None
+                    return
+                role_ids = set(_sync_queue)
+                _sync_queue.clear()
+            _sync_roles(role_ids)
+    finally:
+        connection.close()
+
+
+def _sync_roles(role_ids: Set[str]) -> None:
+    from apps.roles.services.faiss_role_index import sync_roles
+    try:
+        sync_roles(role_ids)
+    except Exception as e:
+        # check_role_index --fix repairs what was missed; never fail the write itself.
+        logger.warning("Updating the role index failed: %s", e)
+
+
+@receiver(post_save, sender=Role, dispatch_uid='sync_saved_role')
+@receiver(post_delete, sender=Role, dispatch_uid='sync_deleted_role')
+def sync_role(sender, instance, using=None, **kwargs):
+    _queue_role_sync([instance.id], using)
+
+
+@receiver(post_save, sender=RoleSkill, dispatch_uid='sync_saved_role_skill')
+@receiver(post_delete, sender=RoleSkill, dispatch_uid='sync_deleted_role_skill')
+def sync_role_skill(sender, instance, using=None, **kwargs):
+    _queue_role_sync([instance.role_id], using)
+
+
+@receiver(role_skills_linked, dispatch_uid='sync_linked_role_skills')
+def sync_linked_role_skills(sender, role_ids, **kwargs):
+    _queue_role_sync(role_ids)
@@ -1,5 +1,6 @@
-"""APScheduler: run job sync on startup and every 24 hours."""
+"""APScheduler: job sync every 24 hours, role index maintenance every VECTOR_INDEX_CONFIG interval."""
 import logging
+from django.conf import settings
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
@@ -15,12 +16,25 @@ def run_job_sync():
         logger.exception("Job sync failed: %s", e)
 
 
+def run_role_index_maintenance():
+    try:
+        from apps.roles.services.faiss_role_index import maintain_role_index
+        report = maintain_role_index()
+        logger.info("Role index maintenance: %d missing, %d stale, %d tombstones",
+                    len(report['missing']), report['stale'], report['tombstones'])
+    except Exception as e:
+        logger.exception("Role index maintenance failed: %s", e)
+
+
 def start_scheduler():
     global _scheduler
     if _scheduler is not None:
         return
     _scheduler = BackgroundScheduler()
     _scheduler.add_job(run_job_sync, IntervalTrigger(hours=24), id='job_sync')
+    hours = settings.VECTOR_INDEX_CONFIG.get('MAINTENANCE_INTERVAL_HOURS', 24)
+    if hours:
+        _scheduler.add_job(run_role_index_maintenance, IntervalTrigger(hours=hours), id='role_index_maintenance')
     _scheduler.start()
     #run_job_sync()
     logger.info("Job scheduler started")
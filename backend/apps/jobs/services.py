@@ -1,20 +1,14 @@
 """Job ingestion service: fetch from Adzuna, store in DB, expand skills."""
 import logging
+from django.conf import settings
 from django.db import transaction
 from core.services.adzuna_service import fetch_jobs
-from apps.skills.services import extract_skills, normalize_skill
-from apps.jobs.models import Job, JobSkill
-from apps.skills.models import Skill
+from apps.skills.services import extract_skills_batch, get_skill_registry
+from apps.jobs.models import Job
 
 logger = logging.getLogger(__name__)
 
 
-def _get_or_create_skill(name: str) -> Skill:
-    nm = normalize_skill(name)
-    skill, _ = Skill.objects.get_or_create(normalized_name=nm.lower(), defaults={'name': nm})
-    return skill
-
-
 def sync_jobs(country: str = 'us', max_pages: int = 5):
     """Ingest jobs from Adzuna and store in DB."""
     seen = set()
@@ -23,30 +17,35 @@ def sync_jobs(country: str = 'us', max_pages: int = 5):
         results = fetch_jobs(country=country, page=page)
         if not results:
             break
+        fresh = {}
         for r in results:
             ext_id = r.get('id')
             if not ext_id or str(ext_id) in seen:
                 continue
             seen.add(str(ext_id))
-            with transaction.atomic():
-                job, created_flag = Job.objects.get_or_create(
-                    external_id=str(ext_id),
-                    defaults={
-                        'title': r.get('title', '')[:512],
-                        'company': r.get('company', {}).get('display_name', '')[:256],
-                        'location': r.get('location', {}).get('display_name', '')[:256],
-                        'description': r.get('description', '')[:10000],
-                        'url': r.get('redirect_url', ''),
-                        'salary_min': r.get('salary_min'),
-                        'salary_max': r.get('salary_max'),
-                    }
-                )
-                if created_flag:
-                    created += 1
-                    text = f"{job.title} {job.description}"
-                    skills = extract_skills(text, use_llm=False)
-                    for s in skills[:20]:
-                        skill = _get_or_create_skill(s)
-                        JobSkill.objects.get_or_create(job=job, skill=skill)
+            fresh[str(ext_id)] = {
+                'title': r.get('title', '')[:512],
+                'company': r.get('company', {}).get('display_name', '')[:256],
+                'location': r.get('location', {}).get('display_name', '')[:256],
+                'description': r.get('description', '')[:10000],
+                'url': r.get('redirect_url', ''),
+                'salary_min': r.get('salary_min'),
+                'salary_max': r.get('salary_max'),
+            }
+        for ext_id in Job.objects.filter(external_id__in=list(fresh)).values_list('external_id', flat=True):
+            fresh.pop(ext_id, None)
+        # Extraction (spaCy, and Groq calls with EXTRACT_WITH_LLM) runs before the
+        # transaction: no DB transaction is held open across it. One nlp.pipe
+        # pass per page instead of one full parse per job.
+        texts = [f"{fields['title']} {fields['description']}" for fields in fresh.values()]
+        skills_per_job = extract_skills_batch(texts, use_llm=settings.ADZUNA_CONFIG.get('EXTRACT_WITH_LLM', True))
+        with transaction.atomic():
+            linked = []
+            for (ext_id, fields), skills in zip(fresh.items(), skills_per_job):
+                job, created_flag = Job.objects.get_or_create(external_id=ext_id, defaults=fields)
+                if created_flag:  # else a concurrent sync stored it first
+                    linked.append((job, skills[:20]))
+            created += len(linked)
+            get_skill_registry().link_job_skills(linked)
     logger.info("Job sync: %d new jobs", created)
     return created
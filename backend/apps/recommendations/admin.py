@@ -1,8 +1,13 @@
 from django.contrib import admin
-from .models import Course
+from .models import Course, RoleRecommendation
 
 
 @admin.register(Course)
 class CourseAdmin(admin.ModelAdmin):
     list_display = ('title', 'provider', 'created_at')
     search_fields = ('title', 'provider', 'skills_taught')
+
+
+@admin.register(RoleRecommendation)
+class RoleRecommendationAdmin(admin.ModelAdmin):
+    list_display = ('user', 'computed_at')
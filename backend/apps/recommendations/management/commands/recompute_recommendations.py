@@ -0,0 +1,19 @@
+"""Recompute stored role recommendations for every user (e.g. after an index rebuild)."""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.recommendations.services import recompute_recommendations
+
+
+class Command(BaseCommand):
+    help = 'Recompute top roles for every user with skills, batching FAISS searches across users'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=256, help='Users per FAISS search / DB write')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = recompute_recommendations(batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Recomputed role recommendations for {count} users in {elapsed:.1f}s'))
@@ -1,5 +1,6 @@
-"""Course model for learning recommendations."""
+"""Course model for learning recommendations; precomputed role recommendations."""
 import uuid
+from django.conf import settings
 from django.db import models
 
 
@@ -10,3 +11,12 @@ class Course(models.Model):
     url = models.URLField(max_length=1024)
     skills_taught = models.JSONField(default=list)  # List of skill names/IDs
     created_at = models.DateTimeField(auto_now_add=True)
+
+
+class RoleRecommendation(models.Model):
+    """A user's ranked top roles, served while their skills and the role index are unchanged."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='role_recommendation')
+    key = models.CharField(max_length=64)  # recommendation_key(): skill ids + ranking_context()
+    roles = models.JSONField(default=list)
+    computed_at = models.DateTimeField(auto_now=True)
@@ -0,0 +1,142 @@
+"""
+Role recommendations: user skills -> pooled vector -> FAISS top 30 -> re-rank -> top 5.
+
+``recommend_roles`` serves a user's stored RoleRecommendation while its key
+still matches and recomputes it otherwise. The key covers everything the
+result depends on: the skill ids, the role index snapshot version, the
+re-rank TF-IDF model (refit when RoleSkill rows change), the query pooling
+mode and the embedding model; ``recompute_recommendations`` refreshes every user with one
+batched FAISS search per chunk of users.
+"""
+import hashlib
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Sequence, Tuple
+
+from django.conf import settings
+from django.db.models import Prefetch
+
+from apps.embeddings.services import compose_skill_vectors
+from apps.recommendations.models import RoleRecommendation
+from apps.roles.models import Role, RoleSkill
+from apps.roles.services import get_faiss_index, re_rank
+from apps.roles.services.ranking import get_role_tfidf
+from apps.skills.models import UserSkill
+from core.services.embedding_service import embedding_model_id
+
+logger = logging.getLogger(__name__)
+
+CANDIDATES = 30
+TOP_K = 5
+
+UserSkills = List[Tuple[str, str]]  # (skill_id, skill name)
+
+
+def ranking_context(index) -> str:
+    """Everything besides the user's skills that a stored ranking depends on."""
+    tfidf_rows, tfidf_newest = get_role_tfidf().stamp or (None, None)
+    return "|".join(str(part) for part in (
+        index.version,
+        tfidf_rows,
+        tfidf_newest.isoformat() if tfidf_newest else None,
+        settings.EMBEDDING_CONFIG.get('QUERY_POOLING', 'mean'),
+        embedding_model_id(),
+    ))
+
+
+def recommendation_key(skill_ids, context: str) -> str:
+    raw = ",".join(sorted(str(sid) for sid in skill_ids)) + f"@{context}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _user_skills(user) -> UserSkills:
+    return [(str(sid), name) for sid, name in UserSkill.objects.filter(user=user).values_list('skill_id', 'skill__name')]
+
+
+def _role_skills(roles) -> Dict[str, List[Dict[str, Any]]]:
+    return {
+        str(r.id): [
+            {'skill_id': str(rs.skill_id), 'skill_name': rs.skill.name, 'importance_weight': rs.importance_weight}
+            for rs in r.skills.all()
+        ]
+        for r in roles
+    }
+
+
+def rank_roles_batch(users_skills: Sequence[UserSkills]) -> List[List[Dict[str, Any]]]:
+    """Top roles for many users: one FAISS search for all of them, one role query for all candidates."""
+    matrix, found = compose_skill_vectors([[sid for sid, _ in skills] for skills in users_skills])
+    candidates: List[List[Tuple[str, float]]] = [[] for _ in users_skills]
+    if found.any():
+        hits = iter(get_faiss_index().search_batch(matrix[found], k=CANDIDATES))
+        candidates = [next(hits) if has_vector else [] for has_vector in found]
+
+    prefetch = Prefetch('skills', queryset=RoleSkill.objects.select_related('skill'))
+    wanted = {rid for hits in candidates for rid, _ in hits}
+    roles = {str(r.id): r for r in Role.objects.filter(id__in=wanted).prefetch_related(prefetch)}
+    fallback: List[Role] = []
+    if not all(candidates):
+        # No vector or no index: the first roles, re-ranked by skill overlap alone.
+        fallback = list(Role.objects.prefetch_related(prefetch)[:TOP_K])
+        roles.update({str(r.id): r for r in fallback})
+    role_skills_map = _role_skills(roles.values())
+
+    results = []
+    for skills, hits in zip(users_skills, candidates):
+        role_ids = [rid for rid, _ in hits] if hits else [str(r.id) for r in fallback]
+        role_list = [
+            {'id': rid, 'title': roles[rid].title, 'description': roles[rid].description}
+            for rid in role_ids if rid in roles
+        ]
+        user_skill_ids = {sid for sid, _ in skills}
+        user_skill_names = [name for _, name in skills]
+        results.append(re_rank(role_list, user_skill_ids, user_skill_names, role_skills_map, top_k=TOP_K))
+    return results
+
+
+def recommend_roles(user) -> List[Dict[str, Any]]:
+    """The user's top roles: the stored result while still valid, else computed now and stored."""
+    skills = _user_skills(user)
+    if not skills:
+        return []
+    index = get_faiss_index()
+    # Pick up a newer snapshot first, or the result is stored under the old version's key.
+    index.reload_if_changed()
+    key = recommendation_key((sid for sid, _ in skills), ranking_context(index))
+    stored = RoleRecommendation.objects.filter(user=user, key=key).values_list('roles', flat=True).first()
+    if stored is not None:
+        return stored
+    ranked = rank_roles_batch([skills])[0]
+    RoleRecommendation.objects.update_or_create(user=user, defaults={'key': key, 'roles': ranked})
+    return ranked
+
+
+def recompute_recommendations(batch_size: int = 256) -> int:
+    """Recompute and store top roles for every user with skills. Returns the number of users."""
+    index = get_faiss_index()
+    user_ids = list(UserSkill.objects.order_by('user_id').values_list('user_id', flat=True).distinct())
+    for start in range(0, len(user_ids), batch_size):
+        chunk = user_ids[start:start + batch_size]
+        skills_by_user: Dict[Any, UserSkills] = defaultdict(list)
+        for user_id, sid, name in UserSkill.objects.filter(user_id__in=chunk).values_list('user_id', 'skill_id', 'skill__name'):
+            skills_by_user[user_id].append((str(sid), name))
+        users_skills = [skills_by_user[user_id] for user_id in chunk]
+        # Read before searching: if the index reloads meanwhile, the rows just look stale.
+        index.reload_if_changed()
+        context = ranking_context(index)
+        ranked = rank_roles_batch(users_skills)
+        RoleRecommendation.objects.bulk_create(
+            [
+                RoleRecommendation(
+                    user_id=user_id,
+                    key=recommendation_key((sid for sid, _ in skills), context),
+                    roles=roles,
+                )
+                for user_id, skills, roles in zip(chunk, users_skills, ranked)
+            ],
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=['key', 'roles', 'computed_at'],
+        )
+        logger.info("Recomputed role recommendations for %d/%d users.", start + len(chunk), len(user_ids))
+    return len(user_ids)
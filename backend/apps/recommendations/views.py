@@ -5,52 +5,20 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.db.models import Prefetch
 
-from apps.skills.models import Skill, UserSkill
+from apps.skills.models import UserSkill
 from apps.roles.models import Role, RoleSkill
-from apps.embeddings.models import RoleEmbedding, SkillEmbedding
-from core.services.embedding_service import encode_single, encode
 from core.services.learning_recommendation_service import get_courses_for_skills
-from apps.roles.services import get_faiss_index, re_rank, compute_skill_gap
+from apps.roles.services import compute_skill_gap
+from .services import recommend_roles
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def top_roles(request):
-    """User Vector → FAISS Top 30 → Re-rank → Top 5 Roles."""
-    user_skills = list(UserSkill.objects.filter(user=request.user).select_related('skill').values('skill_id', 'skill__name'))
-    if not user_skills:
+    """User Vector → FAISS Top 30 → Re-rank → Top 5 Roles (stored until skills or the index change)."""
+    if not UserSkill.objects.filter(user=request.user).exists():
         return Response({'roles': [], 'message': 'Add skills first'})
-
-    user_skill_ids = {str(s['skill_id']) for s in user_skills}
-    user_skill_names = [s['skill__name'] for s in user_skills]
-    user_text = ' '.join(user_skill_names)
-    user_vec = encode_single(user_text)
-
-    faiss_index = get_faiss_index()
-    candidates = faiss_index.search(user_vec, k=30)
-    if not candidates:
-        roles = Role.objects.prefetch_related(
-            Prefetch('skills', queryset=RoleSkill.objects.select_related('skill'))
-        )[:5]
-        role_list = [{'id': str(r.id), 'title': r.title, 'description': r.description} for r in roles]
-    else:
-        role_ids = [rid for rid, _ in candidates]
-        roles = Role.objects.filter(id__in=role_ids).prefetch_related(
-            Prefetch('skills', queryset=RoleSkill.objects.select_related('skill'))
-        )
-        role_map = {str(r.id): r for r in roles}
-        role_list = [{'id': str(rid), 'title': role_map[rid].title, 'description': role_map[rid].description} for rid in role_ids if rid in role_map]
-
-    role_skills_map = {}
-    for r in roles:
-        rs_list = [
-            {'skill_id': str(rs.skill_id), 'skill_name': rs.skill.name, 'importance_weight': rs.importance_weight}
-            for rs in r.skills.all()
-        ]
-        role_skills_map[str(r.id)] = rs_list
-
-    ranked = re_rank(role_list, user_skill_ids, user_skill_names, role_skills_map, top_k=5)
-    return Response({'roles': ranked})
+    return Response({'roles': recommend_roles(request.user)})
 
 
 @api_view(['GET'])
@@ -1,14 +1,8 @@
 """Seed sample roles and skills for development."""
 from django.core.management.base import BaseCommand
-from apps.roles.models import Role, RoleSkill
-from apps.skills.models import Skill
-from apps.skills.services import normalize_skill
-
-
-def get_or_create_skill(name: str):
-    nm = normalize_skill(name)
-    skill, _ = Skill.objects.get_or_create(normalized_name=nm.lower(), defaults={'name': nm})
-    return skill
+from django.db import transaction
+from apps.roles.models import Role
+from apps.skills.services import get_skill_registry
 
 
 class Command(BaseCommand):
@@ -22,12 +16,12 @@ class Command(BaseCommand):
             ('Frontend Developer', 'Client-side development', ['React', 'TypeScript', 'HTML', 'CSS', 'Tailwind', 'JavaScript']),
             ('Backend Developer', 'Server-side development', ['Python', 'Django', 'PostgreSQL', 'REST API', 'Docker', 'Redis']),
         ]
-        for title, desc, skill_names in roles_data:
-            role, _ = Role.objects.get_or_create(
-                title=title,
-                defaults={'description': desc}
-            )
-            for sn in skill_names:
-                skill = get_or_create_skill(sn)
-                RoleSkill.objects.get_or_create(role=role, skill=skill, defaults={'importance_weight': 1.0})
+        # One transaction: the role index is updated once, on commit, for all roles.
+        with transaction.atomic():
+            for title, desc, skill_names in roles_data:
+                role, _ = Role.objects.get_or_create(
+                    title=title,
+                    defaults={'description': desc}
+                )
+                get_skill_registry().link_role_skills(role, skill_names, importance_weight=1.0)
         self.stdout.write(self.style.SUCCESS('Seeded roles'))
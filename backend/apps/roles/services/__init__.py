@@ -1,11 +1,12 @@
 """Roles app business logic."""
 from .skill_gap import compute_skill_gap
 from .ranking import re_rank
-from .faiss_role_index import FAISSRoleIndex, get_faiss_index
+from .faiss_role_index import FAISSRoleIndex, get_faiss_index, sync_roles
 
 __all__ = [
     "compute_skill_gap",
     "re_rank",
     "FAISSRoleIndex",
     "get_faiss_index",
+    "sync_roles",
 ]
@@ -1,62 +1,248 @@
-"""FAISS index for role vector search (DB-based roles). Used by analytics and recommendations."""
+"""
+FAISS index for role vector search (DB-based roles). Used by analytics and recommendations.
+
+Each role is stored under a stable int64 label derived from its UUID
+(``role_index_id``), so single roles can be added, replaced or removed in place
+(``sync_roles``, run from signals when Role / RoleSkill rows change) instead of
+rebuilding. Removed vectors are tombstoned until ``compact`` rebuilds from the
+stored RoleEmbedding vectors; ``check_consistency`` compares the index with the DB.
+
+Saves publish a new snapshot version (``SnapshotStore``); every worker's
+singleton notices it on a later search and swaps it in (mmapped, see
+VECTOR_INDEX_CONFIG['MMAP']) while in-flight searches finish on the old one.
+"""
 import logging
+import threading
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-import faiss
 import numpy as np
 from django.conf import settings
+from django.db.models import Prefetch
+
+from core.services.index_snapshots import SnapshotStore
+from core.services.vector_store import VectorStore
 
 logger = logging.getLogger(__name__)
 
+SNAPSHOT_DIR = Path(settings.BASE_DIR) / 'data' / 'faiss_role_index'
+INDEX_FILE = 'index.bin'
+# Role ids of the snapshot's labels, one per line; reloads read it instead of the DB.
+ROLE_IDS_FILE = 'role_ids.txt'
+# Single-file index of earlier releases; loaded (and upgraded) until the first snapshot exists.
 INDEX_PATH = Path(settings.BASE_DIR) / 'data' / 'faiss_role_index.bin'
+# Row -> role id list of the pre-ID-map index format; read once to upgrade it.
 MAPPING_PATH = Path(settings.BASE_DIR) / 'data' / 'faiss_role_mapping.txt'
 
 
+def role_index_id(role_id) -> int:
+    """Stable FAISS label for a role: the top 63 bits of its UUID."""
+    return uuid.UUID(str(role_id)).int >> 65
+
+
+def role_text(role) -> str:
+    """Text embedded for a role (``role.skills`` should be prefetched with their skills)."""
+    skill_names = [rs.skill.name for rs in role.skills.all()]
+    return f"{role.title} {' '.join(skill_names)}"
+
+
 class FAISSRoleIndex:
     def __init__(self):
-        self.index = None
-        self.id_list: List[str] = []
+        self.store = VectorStore.from_config('roles')
+        self.role_ids: Dict[int, str] = {}
         self.dimension = settings.EMBEDDING_CONFIG.get('DIMENSION', 384)
+        self.snapshots = SnapshotStore(SNAPSHOT_DIR)
+        self.version: Optional[str] = None
+        # Writers (see writing()) clone, modify and swap the store; searches never block.
+        self._reload_lock = threading.Lock()
+
+    @property
+    def index(self):
+        return self.store.index
 
     def build(self, vectors: List[List[float]], role_ids: List[str]):
-        if not vectors or not role_ids:
+        if not len(vectors) or not role_ids:
             return
-        X = np.array(vectors, dtype=np.float32)
-        faiss.normalize_L2(X)
-        self.index = faiss.IndexFlatIP(X.shape[1])
-        self.index.add(X)
-        self.id_list = list(role_ids)
-        INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
-        faiss.write_index(self.index, str(INDEX_PATH))
-        with open(MAPPING_PATH, 'w') as f:
-            f.write('\n'.join(self.id_list))
+        store = VectorStore.from_config('roles')
+        store.build(vectors, ids=[role_index_id(r) for r in role_ids])
+        with self.snapshots.lock():
+            self.store = store
+            self.role_ids = {role_index_id(r): str(r) for r in role_ids}
+            self._save()
+
+    def save(self) -> None:
+        with self.snapshots.lock():
+            self._save()
+
+    def _save(self) -> None:
+        with self.snapshots.publish() as path:
+            self.store.save(path / INDEX_FILE)
+            with open(path / ROLE_IDS_FILE, 'w') as f:
+                f.writelines(f"{rid}\n" for rid in self.role_ids.values())
+        self.version = self.snapshots.published
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        """
+        Hold the writer lock (threads and processes) for a read-modify-save
+        sequence, starting from the newest published snapshot so concurrent
+        writers in other workers are not overwritten.
+        """
+        with self.snapshots.lock():
+            self._load_latest()
+            yield
+
+    def _load_latest(self) -> None:
+        latest = self.snapshots.current()
+        if latest and latest != self.version:
+            self._load_version(latest)
 
     def load(self) -> bool:
-        if not INDEX_PATH.exists():
-            return False
         try:
-            self.index = faiss.read_index(str(INDEX_PATH))
-            if MAPPING_PATH.exists():
-                with open(MAPPING_PATH) as f:
-                    self.id_list = [ln.strip() for ln in f if ln.strip()]
+            version = self.snapshots.current()
+            if version:
+                self._load_version(version)
+                return True
+            if not INDEX_PATH.exists():
+                return False
+            store = VectorStore.from_config('roles')
+            store.load(INDEX_PATH, mmap=self._mmap)
+            if not store.id_mapped:
+                return self._upgrade_legacy(store)
+            self._refresh_role_ids()
+            self.store = store
             return True
         except Exception as e:
             logger.warning("FAISS load failed: %s", e)
         return False
 
+    @property
+    def _mmap(self) -> bool:
+        return settings.VECTOR_INDEX_CONFIG.get('MMAP', True)
+
+    def _load_version(self, version: str) -> None:
+        path = self.snapshots.path(version)
+        store = VectorStore.from_config('roles')
+        store.load(path / INDEX_FILE, mmap=self._mmap)
+        if (path / ROLE_IDS_FILE).exists():
+            with open(path / ROLE_IDS_FILE) as f:
+                self.role_ids = {role_index_id(rid): rid for rid in (ln.strip() for ln in f) if rid}
+        else:
+            # Snapshot published before role ids were saved with it.
+            self._refresh_role_ids()
+        # Set before the store: a search still on the old store only loses roles this version removed.
+        self.store = store
+        self.version = version
+        logger.info("Loaded role index snapshot %s (%d vectors).", version, store.ntotal)
+
+    def reload_if_changed(self) -> bool:
+        """Swap in a newer published snapshot; searches meanwhile keep using the current one."""
+        version = self.snapshots.poll(self.version)
+        if not version or not self._reload_lock.acquire(blocking=False):
+            return False
+        try:
+            self._load_version(version)
+            return True
+        except Exception as e:
+            logger.warning("Role index reload of snapshot %s failed: %s", version, e)
+            return False
+        finally:
+            self._reload_lock.release()
+
+    def _refresh_role_ids(self) -> None:
+        from apps.roles.models import Role
+        self.role_ids = {role_index_id(pk): str(pk) for pk in Role.objects.values_list('id', flat=True)}
+
+    def _upgrade_legacy(self, store: VectorStore) -> bool:
+        """Re-key an index written before ID mapping (flat, + mapping file) and save it in the new format."""
+        if not MAPPING_PATH.exists():
+            return False
+        with open(MAPPING_PATH) as f:
+            id_list = [ln.strip() for ln in f if ln.strip()]
+        vectors = store.index.reconstruct_n(0, min(store.ntotal, len(id_list)))
+        logger.info("Upgrading the role index to ID-mapped format (%d roles).", len(vectors))
+        self.build(vectors, id_list[:len(vectors)])
+        return True
+
     def search(self, query_vector: List[float], k: int = 30) -> List[Tuple[str, float]]:
         """Return top k (role_id, score) by cosine similarity (IP on L2-normalized vectors)."""
+        return self.search_batch([query_vector], k)[0]
+
+    def search_batch(self, query_vectors, k: int = 30) -> List[List[Tuple[str, float]]]:
+        """``search`` for every row of an (n, d) matrix, in one FAISS call."""
+        if self.index is None and not self.load():
+            return [[] for _ in range(len(query_vectors))]
+        self.reload_if_changed()
+        store, role_ids = self.store, self.role_ids
+        return [
+            [(role_ids[label], score) for label, score in hits if label in role_ids]
+            for hits in store.search(query_vectors, k)
+        ]
+
+    def upsert(self, role_ids: List[str], vectors: np.ndarray) -> None:
+        """Add or replace the vectors of ``role_ids`` (the index must already exist)."""
+        with self.writing():
+            store = self.store.copy()
+            store.add(vectors, [role_index_id(r) for r in role_ids])
+            self.role_ids = {**self.role_ids, **{role_index_id(r): str(r) for r in role_ids}}
+            self.store = store
+
+    def remove(self, role_ids: Iterable[str]) -> int:
+        with self.writing():
+            store = self.store.copy()
+            labels = {role_index_id(r) for r in role_ids}
+            removed = store.remove(list(labels))
+            self.role_ids = {label: rid for label, rid in self.role_ids.items() if label not in labels}
+            self.store = store
+        return removed
+
+    def compact(self) -> int:
+        """Rebuild from the stored RoleEmbedding vectors, dropping tombstones. Returns the number dropped."""
+        from apps.embeddings.services import role_vector_matrix
+
+        with self.writing():
+            dropped = self.store.tombstones
+            role_ids, matrix = role_vector_matrix()
+            if not role_ids:
+                return 0
+            self.build(matrix, [str(r) for r in role_ids])
+        logger.info("Compacted the role index: %d roles, %d tombstones dropped.", len(role_ids), dropped)
+        return dropped
+
+    def needs_compaction(self) -> bool:
+        ratio = settings.VECTOR_INDEX_CONFIG.get('COMPACT_TOMBSTONE_RATIO', 0.2)
+        return self.store.ntotal > 0 and self.store.tombstones / self.store.ntotal > ratio
+
+    def check_consistency(self) -> Dict[str, object]:
+        """Index vs DB: roles missing from the index, indexed labels with no role, tombstones."""
+        from apps.roles.models import Role
+
         if self.index is None and not self.load():
-            return []
-        X = np.array([query_vector], dtype=np.float32)
-        faiss.normalize_L2(X)
-        scores, indices = self.index.search(X, min(k, len(self.id_list)))
-        results = []
-        for idx, sc in zip(indices[0], scores[0]):
-            if 0 <= idx < len(self.id_list):
-                results.append((self.id_list[idx], float(sc)))
-        return results
+            return {'indexed': 0, 'missing': [], 'stale': 0, 'tombstones': 0}
+        self._load_latest()
+        self._refresh_role_ids()
+        live = set(int(label) for label in self.store.live_ids())
+        db_roles = {role_index_id(pk): str(pk) for pk in Role.objects.values_list('id', flat=True)}
+        return {
+            'indexed': len(live),
+            'missing': sorted(db_roles[label] for label in set(db_roles) - live),
+            'stale': len(live - set(db_roles)),
+            'tombstones': self.store.tombstones,
+        }
+
+    def remove_stale(self) -> int:
+        """Tombstone indexed labels that no longer belong to any Role."""
+        from apps.roles.models import Role
+
+        db_labels = {role_index_id(pk) for pk in Role.objects.values_list('id', flat=True)}
+        with self.writing():
+            store = self.store.copy()
+            removed = store.remove([label for label in store.live_ids() if int(label) not in db_labels])
+            self.role_ids = {label: rid for label, rid in self.role_ids.items() if label in db_labels}
+            self.store = store
+        return removed
 
 
 _faiss_index = None
@@ -68,3 +254,70 @@ def get_faiss_index() -> FAISSRoleIndex:
         _faiss_index = FAISSRoleIndex()
         _faiss_index.load()
     return _faiss_index
+
+
+def sync_roles(role_ids: Iterable) -> None:
+    """
+    Re-embed ``role_ids`` and update RoleEmbedding and the index in place; ids
+    whose Role no longer exists are removed. Saves the index, compacting it
+    once tombstones pass VECTOR_INDEX_CONFIG['COMPACT_TOMBSTONE_RATIO'], or
+    builds it from the stored role vectors when there is none yet.
+    """
+    from apps.embeddings.services import upsert_role_vectors
+    from apps.roles.models import Role, RoleSkill
+    from core.services.embedding_service import encode
+
+    ids = list(dict.fromkeys(str(r) for r in role_ids))
+    roles = list(
+        Role.objects.filter(id__in=ids).prefetch_related(
+            Prefetch('skills', queryset=RoleSkill.objects.select_related('skill'))
+        )
+    )
+    gone = set(ids) - {str(r.id) for r in roles}
+    vectors = None
+    if roles:
+        vectors = encode([role_text(r) for r in roles], return_numpy=True)
+        if not np.any(vectors, axis=1).all():
+            # Model unavailable (zero-vector fallback): leave the stored vectors alone.
+            logger.warning("Skipping role index update: embedding model unavailable.")
+            return
+        upsert_role_vectors(roles, vectors)
+
+    index = get_faiss_index()
+    if index.index is None and not index.load():
+        # No index yet: build it from every stored role vector, these included.
+        from apps.embeddings.services import role_vector_matrix
+
+        with index.writing():
+            if index.index is None:
+                stored_ids, matrix = role_vector_matrix()
+                if stored_ids:
+                    index.build(matrix, [str(r) for r in stored_ids])
+                return
+    with index.writing():
+        if roles:
+            index.upsert([str(r.id) for r in roles], vectors)
+        if gone:
+            index.remove(gone)
+        if index.needs_compaction():
+            index.compact()
+        else:
+            index.save()
+
+
+def maintain_role_index() -> Dict[str, object]:
+    """Consistency check plus repair: index missing roles, drop stale labels, compact if due."""
+    index = get_faiss_index()
+    report = index.check_consistency()
+    if index.index is None:
+        return report
+    if report['missing']:
+        sync_roles(report['missing'])
+    with index.writing():
+        if report['stale']:
+            index.remove_stale()
+        if index.needs_compaction():
+            report['compacted'] = index.compact()
+        elif report['stale']:
+            index.save()
+    return report
@@ -1,13 +1,20 @@
 """
 Re-ranking engine with weighted formula:
 FINAL_SCORE = 0.5 * Skill Coverage + 0.3 * Skill Importance Weight + 0.2 * TF-IDF
+
+TF-IDF comes from one model fitted over all roles' skills (``get_role_tfidf``),
+so the IDF reflects how rare a skill is across the catalogue.
 """
-from collections import Counter
-from typing import List, Dict, Any
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import List, Dict, Any, Optional, Tuple
 
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
 
 
 def compute_skill_coverage(user_skill_ids: set, role_skill_ids: set) -> float:
@@ -29,19 +36,131 @@ def compute_importance_weight(
     return sum(matched) / len(matched)
 
 
+def _skill_text(skill_names: List[str]) -> str:
+    # Sorted so the same skill set always gives the same text (TF-IDF ignores order).
+    return ' '.join(sorted(name for name in skill_names if name))
+
+
+class RoleTfidfModel:
+    """
+    TF-IDF fitted once over every role's skill names (one document per role),
+    with the role vectors kept as one L2-normalised CSR matrix, so scoring all
+    candidates is a single sparse product with the user's vector.
+    """
+
+    def __init__(self, role_texts: Dict[str, str], stamp: Optional[Tuple] = None) -> None:
+        # sklearn is imported on first use; it dominates Django startup otherwise.
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        self.stamp = stamp
+        self._texts = role_texts
+        self._rows = {rid: i for i, rid in enumerate(role_texts)}
+        self.vectorizer = TfidfVectorizer()
+        try:
+            self.matrix = self.vectorizer.fit_transform(list(role_texts.values()))
+        except ValueError:
+            # No roles, or no usable tokens in their skills.
+            self.vectorizer = None
+            self.matrix = None
+
+    @classmethod
+    def fit(cls) -> "RoleTfidfModel":
+        from apps.roles.models import RoleSkill
+
+        # Read first: rows changed during the fit make the stamp stale, not the model.
+        stamp = catalogue_stamp()
+        names: Dict[str, List[str]] = defaultdict(list)
+        for role_id, name in RoleSkill.objects.values_list('role_id', 'skill__name').iterator():
+            names[str(role_id)].append(name)
+        model = cls({rid: _skill_text(skills) for rid, skills in names.items()}, stamp)
+        logger.info("Fitted role TF-IDF over %d roles (%d terms).", len(names), model.vocabulary_size)
+        return model
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self.vectorizer.vocabulary_) if self.vectorizer is not None else 0
+
+    def role_matrix(self, role_ids: List[Optional[str]], texts: List[str]):
+        """CSR rows for the roles; fitted rows where the skills are unchanged, else transformed now."""
+        rows = [self._rows.get(rid) if rid is not None and self._texts.get(rid) == text else None
+                for rid, text in zip(role_ids, texts)]
+        known = [i for i, row in enumerate(rows) if row is not None]
+        stale = [i for i, row in enumerate(rows) if row is None]
+        if not stale:
+            return self.matrix[rows]
+        fresh = self.vectorizer.transform([texts[i] for i in stale])
+        if not known:
+            return fresh
+        import scipy.sparse as sp  # installed with scikit-learn
+
+        stacked = sp.vstack([self.matrix[[rows[i] for i in known]], fresh], format='csr')
+        return stacked[np.argsort(known + stale)]
+
+    def scores(self, user_skill_names: List[str], role_ids: List[Optional[str]], role_skill_names: List[List[str]]) -> np.ndarray:
+        """Cosine similarity of the user's skills with each role's skills. 0-1."""
+        if self.vectorizer is None or not role_ids:
+            return np.zeros(len(role_ids))
+        user = self.vectorizer.transform([_skill_text(user_skill_names)])
+        roles = self.role_matrix(role_ids, [_skill_text(names) for names in role_skill_names])
+        return np.clip((roles @ user.T).toarray().ravel(), 0.0, 1.0)
+
+
+def catalogue_stamp() -> Tuple:
+    """Changes whenever RoleSkill rows are added or removed: (row count, newest created_at)."""
+    from django.db.models import Count, Max
+
+    from apps.roles.models import RoleSkill
+
+    stats = RoleSkill.objects.aggregate(rows=Count('id'), newest=Max('created_at'))
+    return stats['rows'], stats['newest']
+
+
+_tfidf_model: Optional[RoleTfidfModel] = None
+_tfidf_lock = threading.Lock()
+_tfidf_checked_at = 0.0
+_tfidf_refitting = threading.Lock()
+
+
+def _refit_if_changed() -> None:
+    global _tfidf_model
+    from django.db import connection
+
+    try:
+        if catalogue_stamp() != _tfidf_model.stamp:
+            _tfidf_model = RoleTfidfModel.fit()
+    except Exception as e:
+        logger.warning("Refitting the role TF-IDF model failed: %s", e)
+    finally:
+        connection.close()
+        _tfidf_refitting.release()
+
+
+def get_role_tfidf() -> RoleTfidfModel:
+    """
+    The fitted model. The first call fits it; after that the role catalogue
+    is checked every RANKING_CONFIG['TFIDF_REFRESH_SECONDS'] and refitted in
+    a background thread when it changed, while the current model keeps
+    serving (roles whose skills changed are vectorised on the fly meanwhile).
+    """
+    global _tfidf_model, _tfidf_checked_at
+    if _tfidf_model is None:
+        with _tfidf_lock:
+            if _tfidf_model is None:
+                _tfidf_model = RoleTfidfModel.fit()
+                _tfidf_checked_at = time.monotonic()
+        return _tfidf_model
+    interval = settings.RANKING_CONFIG.get('TFIDF_REFRESH_SECONDS', 300)
+    if 0 <= interval <= time.monotonic() - _tfidf_checked_at and _tfidf_refitting.acquire(blocking=False):
+        _tfidf_checked_at = time.monotonic()
+        threading.Thread(target=_refit_if_changed, name='role-tfidf-refit', daemon=True).start()
+    return _tfidf_model
+
+
 def compute_tfidf_score(user_skill_names: List[str], role_skill_names: List[str]) -> float:
     """TF-IDF cosine similarity between user skills and role skills. 0-1."""
     if not user_skill_names or not role_skill_names:
         return 0.0
-    user_text = ' '.join(user_skill_names)
-    role_text = ' '.join(role_skill_names)
-    vectorizer = TfidfVectorizer()
-    try:
-        matrix = vectorizer.fit_transform([user_text, role_text])
-        sim = cosine_similarity(matrix[0:1], matrix[1:2])[0][0]
-        return max(0.0, min(1.0, float(sim)))
-    except Exception:
-        return 0.0
+    return float(get_role_tfidf().scores(user_skill_names, [None], [role_skill_names])[0])
 
 
 def re_rank(
@@ -52,17 +171,22 @@ def re_rank(
     top_k: int = 5,
 ) -> List[Dict[str, Any]]:
     """Re-rank candidate roles and return top_k with scores."""
+    role_ids = [str(role.get('id', '')) for role in candidate_roles]
+    rs_lists = [role_skills_map.get(rid, []) for rid in role_ids]
+    tfidf_scores = np.zeros(len(role_ids))
+    if user_skill_names and role_ids:
+        tfidf_scores = get_role_tfidf().scores(
+            user_skill_names, role_ids, [[s.get('skill_name', '') for s in rs_list] for rs_list in rs_lists]
+        )
+
     scored = []
-    for role in candidate_roles:
-        rid = str(role.get('id', ''))
-        rs_list = role_skills_map.get(rid, [])
+    for role, rs_list, tfidf in zip(candidate_roles, rs_lists, tfidf_scores):
         role_skill_ids = {str(s['skill_id']) for s in rs_list}
-        role_skill_names = [s.get('skill_name', '') for s in rs_list]
         role_weights = {str(s['skill_id']): s.get('importance_weight', 1.0) for s in rs_list}
 
         cov = compute_skill_coverage(user_skill_ids, role_skill_ids)
         imp = compute_importance_weight(user_skill_ids, role_weights)
-        tfidf = compute_tfidf_score(user_skill_names, role_skill_names)
+        tfidf = float(tfidf)
 
         final = 0.5 * cov + 0.3 * imp + 0.2 * tfidf
         scored.append({
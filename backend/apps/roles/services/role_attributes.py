@@ -0,0 +1,50 @@
+"""
+Filterable attributes of the CSV role index (``RoleFAISSManager.search(..., filters=...)``).
+
+Each extractor returns the values of one attribute for a metadata row:
+``certification`` and ``skill`` split the CSV's comma-separated columns;
+``seniority`` is derived from the job title.
+"""
+import re
+from typing import Dict, List, Mapping
+
+from core.services.attribute_bitmaps import Extractor
+
+# First match wins, so "Senior Manager" is management and "Lead Developer" is lead.
+SENIORITY_LEVELS = [
+    ('management', re.compile(r"\b(manager|director|head|chief|vp|officer|cto|cio|ciso)\b")),
+    ('lead', re.compile(r"\b(lead|leader|principal|principle|staff|architect)\b")),
+    ('senior', re.compile(r"\b(senior|sr)\b")),
+    ('entry', re.compile(r"\b(junior|jr|entry|intern|trainee|graduate)\b")),
+]
+DEFAULT_SENIORITY = 'mid'
+
+
+def seniority_level(title: str) -> str:
+    title = re.sub(r"[^a-z]+", " ", (title or "").lower())
+    for level, pattern in SENIORITY_LEVELS:
+        if pattern.search(title):
+            return level
+    return DEFAULT_SENIORITY
+
+
+def _split(value) -> List[str]:
+    return [part.strip() for part in str(value or "").split(",") if part.strip()]
+
+
+ROLE_ATTRIBUTES: Dict[str, Extractor] = {
+    'certification': lambda meta: _split(meta.get('certifications')),
+    'skill': lambda meta: _split(meta.get('skills')),
+    'seniority': lambda meta: [seniority_level(meta.get('role', ''))],
+}
+
+
+def role_filters(params: Mapping) -> Dict[str, List[str]]:
+    """Filters from request params (QueryDict or dict): one entry per attribute given."""
+    filters = {}
+    for attribute in ROLE_ATTRIBUTES:
+        values = params.getlist(attribute) if hasattr(params, 'getlist') else params.get(attribute)
+        values = [values] if isinstance(values, str) else [v for v in (values or []) if v]
+        if values:
+            filters[attribute] = values
+    return filters
@@ -25,6 +25,22 @@ class RolePipelineException(Exception):
     pass
 
 
+def build_role_texts(df: pd.DataFrame) -> List[str]:
+    """Embedding input for each CSV role row (title, description, skills)."""
+    texts = []
+    for _, row in df.iterrows():
+        title = str(row["Job Title"]).strip()
+        desc = str(row["Job Description"]).strip()
+        skills = str(row["Skills"]).strip()
+        combined = (
+            f"Job Title: {title}. "
+            f"Job Description: {desc}. "
+            f"Required Skills: {skills}."
+        )
+        texts.append(combined)
+    return texts
+
+
 class RoleEmbeddingPipeline:
     """Build FAISS index for IT roles from CSV (Job Title, Job Description, Skills)."""
 
@@ -44,7 +60,7 @@ class RoleEmbeddingPipeline:
         df = df.dropna(subset=list(required_cols))
         logger.info("Loaded %s roles.", len(df))
 
-        texts = self._build_role_text(df)
+        texts = build_role_texts(df)
         metadata = self._build_metadata(df)
 
         logger.info("Generating embeddings (batch, normalized)...")
@@ -55,20 +71,6 @@ class RoleEmbeddingPipeline:
         manager.create_index(vectors, metadata)
         logger.info("FAISS build complete.")
 
-    def _build_role_text(self, df: pd.DataFrame) -> List[str]:
-        texts = []
-        for _, row in df.iterrows():
-            title = str(row["Job Title"]).strip()
-            desc = str(row["Job Description"]).strip()
-            skills = str(row["Skills"]).strip()
-            combined = (
-                f"Job Title: {title}. "
-                f"Job Description: {desc}. "
-                f"Required Skills: {skills}."
-            )
-            texts.append(combined)
-        return texts
-
     def _build_metadata(self, df: pd.DataFrame) -> List[Dict]:
         metadata = []
         has_certs = "Certifications" in df.columns
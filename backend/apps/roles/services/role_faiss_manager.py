@@ -1,22 +1,39 @@
 """
 FAISS manager for CSV-based role index (resume upload flow).
 Create index, save/load, similarity search returning (score, metadata).
+
+Index and metadata are published together as one snapshot version
+(``SnapshotStore``); running workers pick up a rebuilt index on a later search.
+Metadata is a columnar, mmapped table (``ColumnarMetadata``): loading reads
+only its header and search decodes just the returned rows. Searches can be
+filtered by role attributes (``role_attributes``) through row bitmaps
+precomputed at build time.
 """
 from __future__ import annotations
 
 import logging
 import pickle
+import threading
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 
-import faiss
 import numpy as np
+from django.conf import settings
+
+from core.services.attribute_bitmaps import AttributeBitmaps, Filters
+from core.services.index_snapshots import SnapshotStore
+from core.services.metadata_store import ColumnarMetadata, is_columnar, write_columnar
+from core.services.vector_store import VectorStore, VectorStoreError
+from .role_attributes import ROLE_ATTRIBUTES
 
 logger = logging.getLogger(__name__)
 
 FAISS_DIR = Path(__file__).resolve().parent.parent / "data" / "faiss"
 FAISS_INDEX_FILE = "faiss.index"
 FAISS_METADATA_FILE = "faiss.metadata"
+FAISS_ATTRIBUTES_NAME = "faiss.attributes"  # .json + .npy
+# Versioned snapshots; FAISS_DIR's own faiss.index / faiss.metadata are read until the first one exists.
+SNAPSHOT_DIR = FAISS_DIR / "snapshots"
 
 
 class VectorDBError(Exception):
@@ -30,8 +47,29 @@ class RoleFAISSManager:
     def __init__(self) -> None:
         self.index_path = Path(FAISS_DIR) / FAISS_INDEX_FILE
         self.metadata_path = Path(FAISS_DIR) / FAISS_METADATA_FILE
-        self.index: faiss.Index | None = None
-        self.metadata: List[Dict[str, Any]] | None = None
+        self.snapshots = SnapshotStore(SNAPSHOT_DIR)
+        self.version: Optional[str] = None
+        # (store, metadata, attributes) are replaced together so a search never mixes versions.
+        self._live: Tuple[VectorStore, Sequence[Dict[str, Any]] | None, AttributeBitmaps | None] = (
+            VectorStore.from_config('csv_roles'), None, None,
+        )
+        self._reload_lock = threading.Lock()
+
+    @property
+    def store(self) -> VectorStore:
+        return self._live[0]
+
+    @property
+    def metadata(self) -> Sequence[Dict[str, Any]] | None:
+        return self._live[1]
+
+    @property
+    def attributes(self) -> AttributeBitmaps | None:
+        return self._live[2]
+
+    @property
+    def index(self):
+        return self.store.index
 
     def create_index(
         self,
@@ -40,14 +78,13 @@ class RoleFAISSManager:
     ) -> None:
         if len(vectors) != len(metadata):
             raise VectorDBError("Vectors and metadata size mismatch.")
-        dimension = vectors.shape[1]
-        logger.info("Creating FAISS index (dim=%s)", dimension)
+        logger.info("Creating FAISS index (dim=%s, %s)", vectors.shape[1], self.store.factory)
         try:
-            index = faiss.IndexFlatIP(dimension)
-            index.add(vectors)
-            self.index = index
-            self.metadata = metadata
-            self._save()
+            store = VectorStore.from_config('csv_roles')
+            store.build(vectors)
+            with self.snapshots.lock():
+                self._live = (store, metadata, AttributeBitmaps.build(metadata, ROLE_ATTRIBUTES))
+                self._save()
             logger.info("FAISS index created and persisted.")
         except Exception as e:
             raise VectorDBError(f"Index creation failed: {e}") from e
@@ -55,45 +92,101 @@ class RoleFAISSManager:
     def _save(self) -> None:
         if self.index is None or self.metadata is None:
             raise VectorDBError("Nothing to save.")
-        self.index_path.parent.mkdir(parents=True, exist_ok=True)
-        faiss.write_index(self.index, str(self.index_path))
-        with open(self.metadata_path, "wb") as f:
-            pickle.dump(self.metadata, f)
+        with self.snapshots.publish() as path:
+            self.store.save(path / FAISS_INDEX_FILE)
+            write_columnar(path / FAISS_METADATA_FILE, self.metadata)
+            self.attributes.save(path, FAISS_ATTRIBUTES_NAME)
+        self.version = self.snapshots.published
+        # Serve from the published files rather than keeping the list of dicts alive.
+        path = self.snapshots.path(self.version)
+        self._live = (
+            self.store,
+            ColumnarMetadata(path / FAISS_METADATA_FILE),
+            AttributeBitmaps.load(path, FAISS_ATTRIBUTES_NAME),
+        )
+
+    def exists(self) -> bool:
+        return self.snapshots.current() is not None or self.index_path.exists()
 
     def load(self) -> None:
-        if not self.index_path.exists():
+        version = self.snapshots.current()
+        if version is None and not self.index_path.exists():
             raise VectorDBError("FAISS index not found. Run roles build pipeline first.")
         try:
             logger.info("Loading FAISS index...")
-            self.index = faiss.read_index(str(self.index_path))
-            with open(self.metadata_path, "rb") as f:
-                self.metadata = pickle.load(f)
+            if version is None:
+                self._load_files(self.index_path, self.metadata_path)
+            else:
+                path = self.snapshots.path(version)
+                self._load_files(path / FAISS_INDEX_FILE, path / FAISS_METADATA_FILE)
+            self.version = version
             logger.info("FAISS loaded successfully.")
         except Exception as e:
             raise VectorDBError(f"Failed to load FAISS: {e}") from e
 
+    def _load_files(self, index_path: Path, metadata_path: Path) -> None:
+        store = VectorStore.from_config('csv_roles')
+        store.load(index_path, mmap=settings.VECTOR_INDEX_CONFIG.get('MMAP', True))
+        if is_columnar(metadata_path):
+            metadata = ColumnarMetadata(metadata_path)
+        else:
+            # Written before the columnar format; trusted local file only.
+            logger.warning("%s is a pickle; rebuild (`manage.py build_role_faiss_csv`) to convert it.", metadata_path)
+            with open(metadata_path, "rb") as f:
+                metadata = pickle.load(f)
+        if AttributeBitmaps.exists(metadata_path.parent, FAISS_ATTRIBUTES_NAME):
+            attributes = AttributeBitmaps.load(metadata_path.parent, FAISS_ATTRIBUTES_NAME)
+        else:
+            # Built before filtering existed: derive the bitmaps from the metadata once.
+            attributes = AttributeBitmaps.build(metadata, ROLE_ATTRIBUTES)
+        self._live = (store, metadata, attributes)
+
+    def reload_if_changed(self) -> bool:
+        """Swap in a newer published snapshot; searches meanwhile keep using the current one."""
+        if self.snapshots.poll(self.version) is None or not self._reload_lock.acquire(blocking=False):
+            return False
+        try:
+            self.load()
+            return True
+        except VectorDBError as e:
+            logger.warning("Role index reload failed: %s", e)
+            return False
+        finally:
+            self._reload_lock.release()
+
     def search(
         self,
         query_vector: np.ndarray,
         top_k: int = 30,
+        filters: Filters | None = None,
     ) -> List[Tuple[float, Dict[str, Any]]]:
-        """Similarity search. Returns [(score, metadata)]."""
+        """
+        Similarity search. Returns [(score, metadata)]. ``filters`` such as
+        ``{'certification': 'Docker Certified Associate', 'seniority': ['senior', 'lead']}``
+        restrict it to matching roles (any listed value per attribute, every
+        attribute); values are matched case-insensitively.
+        """
+        return self.search_batch(query_vector, top_k, filters)[0]
+
+    def search_batch(
+        self,
+        query_vectors: np.ndarray,
+        top_k: int = 30,
+        filters: Filters | None = None,
+    ) -> List[List[Tuple[float, Dict[str, Any]]]]:
+        """``search`` for every row of an (n, d) matrix, in one FAISS call."""
         if self.index is None or self.metadata is None:
             self.load()
-        if self.index is None or self.metadata is None:
-            return []
-        if query_vector.ndim == 1:
-            query_vector = np.expand_dims(query_vector, axis=0)
+        self.reload_if_changed()
+        store, metadata, attributes = self._live
+        if store.index is None or metadata is None:
+            return [[] for _ in range(len(np.atleast_2d(query_vectors)))]
+        bitmap = attributes.select(filters) if filters else None
         try:
-            scores, indices = self.index.search(query_vector, top_k)
-            results = []
-            for score, idx in zip(scores[0], indices[0]):
-                if idx == -1:
-                    continue
-                results.append((float(score), self.metadata[idx]))
-            return results
-        except Exception as e:
-            raise VectorDBError(f"Search failed: {e}") from e
+            results = store.search(query_vectors, top_k, bitmap=bitmap)
+        except VectorStoreError as e:
+            raise VectorDBError(str(e)) from e
+        return [[(score, metadata[row]) for row, score in hits] for hits in results]
 
 
 # Singleton for resume upload / search
@@ -104,6 +197,6 @@ def get_role_faiss_manager() -> RoleFAISSManager:
     global _role_faiss_manager
     if _role_faiss_manager is None:
         _role_faiss_manager = RoleFAISSManager()
-        if _role_faiss_manager.index_path.exists():
+        if _role_faiss_manager.exists():
             _role_faiss_manager.load()
     return _role_faiss_manager
@@ -0,0 +1,7 @@
+"""Role app signals."""
+from django.dispatch import Signal
+
+# Sent with ``role_ids`` whose RoleSkill rows were created in bulk (bulk_create
+# sends no post_save), e.g. by SkillRegistry.link_role_skills. Like post_save it
+# is sent inside the writing transaction; receivers defer work with on_commit.
+role_skills_linked = Signal()
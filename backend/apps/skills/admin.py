@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Skill, UserSkill
+from .models import ExtractionCacheEntry, Skill, UserSkill
 
 
 @admin.register(Skill)
@@ -12,3 +12,9 @@ class SkillAdmin(admin.ModelAdmin):
 class UserSkillAdmin(admin.ModelAdmin):
     list_display = ('user', 'skill', 'source', 'created_at')
     list_filter = ('source',)
+
+
+@admin.register(ExtractionCacheEntry)
+class ExtractionCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ('key', 'created_at')
+    search_fields = ('key',)
@@ -0,0 +1,74 @@
+"""
+Skill normalization aliases: lower-cased raw form -> canonical display name.
+Compiled into the skill matcher artifact (see compile_skill_dictionary).
+"""
+SKILL_ALIASES = {
+    "react.js": "React",
+    "reactjs": "React",
+    "node.js": "Node.js",
+    "nodejs": "Node.js",
+    "vue.js": "Vue.js",
+    "vuejs": "Vue.js",
+    "typescript": "TypeScript",
+    "javascript": "JavaScript",
+    "python": "Python",
+    "java": "Java",
+    "go": "Go",
+    "rust": "Rust",
+    "c++": "C++",
+    "c#": "C#",
+    "php": "PHP",
+    "kotlin": "Kotlin",
+    "swift": "Swift",
+    "django": "Django",
+    "flask": "Flask",
+    "fastapi": "FastAPI",
+    "postgresql": "PostgreSQL",
+    "postgres": "PostgreSQL",
+    "mongodb": "MongoDB",
+    "mysql": "MySQL",
+    "redis": "Redis",
+    "docker": "Docker",
+    "kubernetes": "Kubernetes",
+    "aws": "AWS",
+    "azure": "Azure",
+    "gcp": "GCP",
+    "git": "Git",
+    "github": "GitHub",
+    "gitlab": "GitLab",
+    "rest api": "REST API",
+    "rest": "REST",
+    "graphql": "GraphQL",
+    "machine learning": "Machine Learning",
+    "deep learning": "Deep Learning",
+    "tensorflow": "TensorFlow",
+    "pytorch": "PyTorch",
+    "scikit-learn": "scikit-learn",
+    "nlp": "NLP",
+    "html": "HTML",
+    "css": "CSS",
+    "sass": "SASS",
+    "tailwind": "Tailwind",
+    "agile": "Agile",
+    "scrum": "Scrum",
+    "jira": "Jira",
+    "linux": "Linux",
+    "bash": "Bash",
+    "testing": "Testing",
+    "k8s": "Kubernetes",
+    "golang": "Go",
+    "js": "JavaScript",
+    "ts": "TypeScript",
+    "py": "Python",
+    "psql": "PostgreSQL",
+    "mongo": "MongoDB",
+    "tf": "TensorFlow",
+    "sklearn": "scikit-learn",
+    "amazon web services": "AWS",
+    "google cloud": "GCP",
+    "google cloud platform": "GCP",
+    "microsoft azure": "Azure",
+    "ci/cd": "CI/CD",
+    "ml": "Machine Learning",
+    "dl": "Deep Learning",
+}
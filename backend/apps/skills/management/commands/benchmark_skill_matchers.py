@@ -0,0 +1,87 @@
+"""Compare rule-based skill matching engines: agreement, throughput and RSS."""
+import csv
+import json
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.skills.services.resume_skill_tool import MATCH_ENGINES
+from core.utils.memory import rss_mb
+
+DEFAULT_CORPUS = Path(settings.BASE_DIR) / "apps" / "documents" / "data" / "IT_Job_Roles_Skills.csv"
+
+
+def _load_corpus(path: Path, limit: int):
+    if path.suffix == ".csv":
+        with open(path, encoding="latin1", newline="") as f:
+            docs = [" ".join(v for v in row.values() if v) for row in csv.DictReader(f)]
+    else:
+        # Plain text: documents separated by blank lines
+        docs = [d.strip() for d in path.read_text(encoding="utf-8").split("\n\n") if d.strip()]
+    return docs[:limit] if limit else docs
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the spaCy and Aho-Corasick skill matchers and check they agree on a corpus'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--corpus', default=str(DEFAULT_CORPUS), help='CSV (all columns joined) or blank-line separated text file')
+        parser.add_argument('--limit', type=int, default=0, help='Use only the first N documents')
+        parser.add_argument('--repeat', type=int, default=3, help='Timed passes over the corpus per engine')
+        # Lighter engine first so its RSS delta isn't hidden by spaCy's.
+        parser.add_argument('--engines', nargs='+', default=['aho_corasick', 'spacy'], choices=sorted(MATCH_ENGINES))
+        parser.add_argument('--min-agreement', type=float, default=None, help='Fail if the share of identical documents is below this (0-1)')
+        parser.add_argument('--output', default=None, help='Write the report as JSON to this path')
+
+    def handle(self, *args, **options):
+        corpus_path = Path(options['corpus'])
+        if not corpus_path.exists():
+            raise CommandError(f'Corpus not found: {corpus_path}')
+        docs = _load_corpus(corpus_path, options['limit'])
+        if not docs:
+            raise CommandError('Corpus is empty')
+        total_chars = sum(len(d) for d in docs)
+
+        report = {'corpus': str(corpus_path), 'documents': len(docs), 'engines': {}}
+        results = {}
+        for name in options['engines']:
+            extractor = MATCH_ENGINES[name]
+            rss_before = rss_mb()
+            t0 = time.perf_counter()
+            extractor.extract('warm up')
+            init_s = time.perf_counter() - t0
+            rss_after = rss_mb()
+
+            t0 = time.perf_counter()
+            for _ in range(max(1, options['repeat'])):
+                results[name] = [extractor.extract(d) for d in docs]
+            elapsed = (time.perf_counter() - t0) / max(1, options['repeat'])
+
+            report['engines'][name] = {
+                'init_seconds': round(init_s, 3),
+                'rss_delta_mb': round(rss_after - rss_before, 1),
+                'docs_per_second': round(len(docs) / elapsed, 1),
+                'chars_per_second': round(total_chars / elapsed),
+            }
+            self.stdout.write(f"{name:>13}: init {init_s:.2f}s, +{rss_after - rss_before:.0f} MB RSS, {len(docs) / elapsed:,.0f} docs/s")
+
+        if len(results) >= 2:
+            (a, ra), (b, rb) = list(results.items())[:2]
+            mismatched = [i for i, (x, y) in enumerate(zip(ra, rb)) if x != y]
+            agreement = 1 - len(mismatched) / len(docs)
+            report['agreement'] = {'engines': [a, b], 'identical_documents': round(agreement, 4), 'examples': []}
+            for i in mismatched[:5]:
+                only_a, only_b = sorted(set(ra[i]) - set(rb[i])), sorted(set(rb[i]) - set(ra[i]))
+                report['agreement']['examples'].append({'document': i, f'only_{a}': only_a, f'only_{b}': only_b})
+                self.stdout.write(f"  doc {i}: only {a}={only_a} only {b}={only_b}")
+            self.stdout.write(f"Agreement {a} vs {b}: {agreement:.2%} of {len(docs)} documents identical")
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(report, indent=2))
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+
+        min_agreement = options['min_agreement']
+        if min_agreement is not None and report.get('agreement', {}).get('identical_documents', 1.0) < min_agreement:
+            raise CommandError(f"Engines agree on fewer than {min_agreement:.0%} of documents")
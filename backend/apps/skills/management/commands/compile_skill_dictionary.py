@@ -0,0 +1,31 @@
+"""Compile skill.txt, MASTER_SKILLS and SKILL_ALIASES into the skill matcher artifact."""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.skills.services.skill_dictionary import (
+    ARTIFACT_PATH,
+    SkillDictionaryError,
+    read_skill_dictionary_artifact,
+    write_skill_dictionary_artifact,
+)
+
+
+class Command(BaseCommand):
+    help = 'Compile the skill dictionary into apps/skills/data/skill_matcher.json'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Only verify the artifact is present and up to date')
+
+    def handle(self, *args, **options):
+        if options['check']:
+            try:
+                payload = read_skill_dictionary_artifact(ARTIFACT_PATH)
+            except SkillDictionaryError as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(f"Skill matcher artifact {payload['version']} is up to date."))
+            return
+        payload = write_skill_dictionary_artifact(ARTIFACT_PATH)
+        spacy_note = '' if payload['spacy_patterns'] is not None else ' (spaCy not installed: no pre-tokenized patterns)'
+        self.stdout.write(self.style.SUCCESS(
+            f"Compiled {len(payload['phrases'])} phrases and {len(payload['aliases'])} aliases "
+            f"into {ARTIFACT_PATH.name}, version {payload['version']}{spacy_note}."
+        ))
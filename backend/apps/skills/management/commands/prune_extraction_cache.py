@@ -0,0 +1,21 @@
+"""Delete expired and overflow rows from the persistent skill extraction cache."""
+from django.core.management.base import BaseCommand
+
+from apps.skills.services.extraction_cache import get_extraction_cache
+
+
+class Command(BaseCommand):
+    help = 'Prune ExtractionCacheEntry rows past SKILL_EXTRACTION_CONFIG TTL / row cap'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ttl-days', type=float, default=None, help='Override CACHE_PERSISTENT_TTL_DAYS')
+        parser.add_argument('--max-rows', type=int, default=None, help='Override CACHE_PERSISTENT_MAX_ROWS')
+
+    def handle(self, *args, **options):
+        cache = get_extraction_cache()
+        if options['ttl_days'] is not None:
+            cache.ttl_days = options['ttl_days']
+        if options['max_rows'] is not None:
+            cache.max_rows = options['max_rows']
+        deleted = cache.prune()
+        self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} extraction cache rows'))
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 21:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0002_extraction_cache'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='extractioncacheentry',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
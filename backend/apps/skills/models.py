@@ -21,3 +21,11 @@ class UserSkill(models.Model):
     class Meta:
         unique_together = ('user', 'skill')
         indexes = [models.Index(fields=('user', 'skill'))]
+
+
+class ExtractionCacheEntry(models.Model):
+    """Persistent tier of the SkillTool.run result cache, shared by all workers."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    key = models.CharField(max_length=64, unique=True)  # sha256 of text + dictionary version + model
+    result = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)  # pruned by age (ExtractionCache.prune)
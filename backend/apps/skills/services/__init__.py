@@ -2,10 +2,15 @@
 
 Single source of truth for skill extraction lives in ``resume_skill_tool``.
 """
-from .resume_skill_tool import extract_skills, normalize_skill, SkillTool
+from .resume_skill_tool import extract_skills, extract_skills_batch, normalize_skill, normalize_skills, SkillTool
+from .skill_registry import SkillRegistry, get_skill_registry
 
 __all__ = [
     "extract_skills",
+    "extract_skills_batch",
     "normalize_skill",
+    "normalize_skills",
     "SkillTool",
+    "SkillRegistry",
+    "get_skill_registry",
 ]
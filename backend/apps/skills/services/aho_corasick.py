@@ -0,0 +1,141 @@
+"""
+Pure-Python Aho-Corasick skill matcher (spaCy-free rule-based engine).
+
+The automaton runs over tokens rather than characters, so "java" never matches
+inside "javascript" and "react" never matches inside "react.js". The tokenizer
+approximates spaCy's English tokenizer for the shapes that occur in the skill
+dictionary (".net", "node.js", "c++", "ci/cd", "scikit-learn"), so results line
+up with the PhraseMatcher path; ``benchmark_skill_matchers`` reports any drift.
+"""
+from __future__ import annotations
+
+import re
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
+
+from .skill_dictionary import get_skill_dictionary
+
+# A whitespace-delimited chunk splits into word tokens and single punctuation
+# tokens. Words may have a leading "." (".net"), inner "." unless it sits
+# between a lower- and an upper-case letter ("node.js" but "DeepLearning.AI"),
+# inner "/" before a digit ("2d/3d" but "ci/cd") and trailing "+" ("c++").
+_CHUNK_RE = re.compile(r"\S+|\s+")
+_TOKEN_RE = re.compile(r"(?:(?<!\w)\.)?\w+(?:(?:(?<![a-z])\.|\.(?![A-Z])|/(?=\d))\w+)*\+*|[^\w\s]")
+
+Token = Tuple[str, int, int]  # (lower-cased text, start char, end char)
+
+
+def tokenize(text: str) -> Iterator[Token]:
+    for chunk in _CHUNK_RE.finditer(text):
+        value = chunk.group(0)
+        if value.isspace():
+            # Like spaCy, anything but a single space becomes its own token
+            # and therefore breaks a phrase ("machine\nlearning" is no match).
+            if value != " ":
+                yield (value, chunk.start(), chunk.end())
+            continue
+        offset = chunk.start()
+        for m in _TOKEN_RE.finditer(value):
+            yield (m.group(0).lower(), offset + m.start(), offset + m.end())
+
+
+class AhoCorasickAutomaton:
+    """Aho-Corasick automaton whose alphabet is tokens."""
+
+    def __init__(self, phrases: Iterable[str] = ()) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Lengths (in tokens) of the phrases ending at each state.
+        self._out: List[Tuple[int, ...]] = [()]
+        self.size = 0
+        for phrase in phrases:
+            tokens = [t for t, _, _ in tokenize(phrase)]
+            if tokens:
+                self._add(tokens)
+        self._build_failure_links()
+
+    def to_tables(self) -> Dict[str, Any]:
+        """JSON-serializable state tables (stored in the skill matcher artifact)."""
+        return {"goto": self._goto, "fail": self._fail, "out": [list(o) for o in self._out], "size": self.size}
+
+    @classmethod
+    def from_tables(cls, tables: Dict[str, Any]) -> "AhoCorasickAutomaton":
+        automaton = cls()
+        automaton._goto = tables["goto"]
+        automaton._fail = tables["fail"]
+        automaton._out = [tuple(o) for o in tables["out"]]
+        automaton.size = tables["size"]
+        return automaton
+
+    def _add(self, tokens: List[str]) -> None:
+        state = 0
+        for token in tokens:
+            nxt = self._goto[state].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][token] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        if len(tokens) not in self._out[state]:
+            self._out[state] = self._out[state] + (len(tokens),)
+            self.size += 1
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                if self._out[self._fail[nxt]]:
+                    self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_spans(self, tokens: List[Token]) -> Iterator[Tuple[int, int]]:
+        """Yield (start_char, end_char) for every phrase occurrence."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, (token, _, end) in enumerate(tokens):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for length in out[state]:
+                yield tokens[i - length + 1][1], end
+
+
+class AhoCorasickSkillExtractor:
+    """Drop-in replacement for ``SkillExtractor`` that needs no spaCy model."""
+    _automaton: AhoCorasickAutomaton | None = None
+
+    @classmethod
+    def _initialize(cls) -> None:
+        if cls._automaton is not None:
+            return
+        try:
+            cls._automaton = AhoCorasickAutomaton.from_tables(get_skill_dictionary().automaton_tables)
+        except Exception as e:
+            raise Exception(f"Failed to initialize AhoCorasickSkillExtractor: {e}") from e
+
+    @classmethod
+    def extract(cls, text: str) -> List[str]:
+        if not text:
+            return []
+        cls._initialize()
+        tokens = list(tokenize(text))
+        skills: Set[str] = {text[start:end].lower() for start, end in cls._automaton.find_spans(tokens)}
+        return sorted(skills)
+
+    @classmethod
+    def extract_batch(
+        cls,
+        texts: List[str],
+        n_process: int = 1,
+        batch_size: int = 64,
+    ) -> List[List[str]]:
+        """Same contract as ``SkillExtractor.extract_batch``; matching is cheap enough to stay serial."""
+        return [cls.extract(text) for text in texts]
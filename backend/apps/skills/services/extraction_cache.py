@@ -0,0 +1,166 @@
+"""
+Content-addressed cache for SkillTool.run results.
+
+Two tiers:
+- a bounded in-process LRU (per worker, microseconds)
+- the ``ExtractionCacheEntry`` table (shared by all workers, one indexed lookup),
+  bounded by age and row count (``prune``)
+
+Keys hash the whitespace-normalized text together with the skill dictionary
+version and the LLM model name, so changing either invalidates old entries.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def make_cache_key(text: str, dictionary_version: str, model_name: str) -> str:
+    normalized = _WHITESPACE_RE.sub(" ", text or "").strip()
+    digest = hashlib.sha256()
+    for part in (dictionary_version, model_name, normalized):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Memory LRU in front of the DB table, with hit/miss counters."""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        persistent: bool = True,
+        ttl_days: Optional[float] = 30,
+        max_rows: Optional[int] = 100_000,
+        prune_every: int = 500,
+    ) -> None:
+        self.max_entries = max_entries
+        self.persistent = persistent
+        self.ttl_days = ttl_days
+        self.max_rows = max_rows
+        self.prune_every = prune_every
+        self._writes = 0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "persistent_hits": 0, "misses": 0}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return copy.deepcopy(entry)
+        entry = self._get_persistent(key)
+        with self._lock:
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["persistent_hits"] += 1
+        self._remember(key, entry)
+        return copy.deepcopy(entry)
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        self._remember(key, copy.deepcopy(result))
+        self._set_persistent(key, result)
+
+    def clear(self) -> None:
+        """Drop the in-process tier (the DB tier is left untouched)."""
+        with self._lock:
+            self._entries.clear()
+
+    def prune(self) -> int:
+        """Delete table rows past ``ttl_days``, then the oldest beyond ``max_rows``. Returns rows deleted."""
+        from apps.skills.models import ExtractionCacheEntry
+
+        deleted = 0
+        if self.ttl_days:
+            cutoff = timezone.now() - timedelta(days=self.ttl_days)
+            deleted += ExtractionCacheEntry.objects.filter(created_at__lt=cutoff).delete()[0]
+        if self.max_rows:
+            # created_at of the newest row past the cap; it and everything older go.
+            overflow = (
+                ExtractionCacheEntry.objects.order_by("-created_at")
+                .values_list("created_at", flat=True)[self.max_rows:self.max_rows + 1]
+            )
+            if overflow:
+                deleted += ExtractionCacheEntry.objects.filter(created_at__lte=overflow[0]).delete()[0]
+        if deleted:
+            logger.info("Pruned %d extraction cache rows.", deleted)
+        return deleted
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        stats["hits"] = stats["memory_hits"] + stats["persistent_hits"]
+        return stats
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _get_persistent(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.persistent:
+            return None
+        from apps.skills.models import ExtractionCacheEntry
+        try:
+            return ExtractionCacheEntry.objects.filter(key=key).values_list("result", flat=True).first()
+        except Exception as e:
+            # A cache outage must never break extraction itself.
+            logger.warning("Extraction cache read failed: %s", e)
+            return None
+
+    def _set_persistent(self, key: str, result: Dict[str, Any]) -> None:
+        if not self.persistent:
+            return
+        from apps.skills.models import ExtractionCacheEntry
+        try:
+            ExtractionCacheEntry.objects.update_or_create(key=key, defaults={"result": result})
+        except Exception as e:
+            logger.warning("Extraction cache write failed: %s", e)
+            return
+        with self._lock:
+            self._writes += 1
+            due = self.prune_every > 0 and self._writes % self.prune_every == 0
+        if due:
+            try:
+                self.prune()
+            except Exception as e:
+                logger.warning("Extraction cache prune failed: %s", e)
+
+
+_extraction_cache: ExtractionCache | None = None
+
+
+def get_extraction_cache() -> ExtractionCache:
+    global _extraction_cache
+    if _extraction_cache is None:
+        cfg = getattr(settings, "SKILL_EXTRACTION_CONFIG", {})
+        _extraction_cache = ExtractionCache(
+            max_entries=cfg.get("CACHE_MAX_ENTRIES", 256),
+            persistent=cfg.get("CACHE_PERSISTENT", True),
+            ttl_days=cfg.get("CACHE_PERSISTENT_TTL_DAYS", 30),
+            max_rows=cfg.get("CACHE_PERSISTENT_MAX_ROWS", 100_000),
+            prune_every=cfg.get("CACHE_PRUNE_EVERY_WRITES", 500),
+        )
+    return _extraction_cache
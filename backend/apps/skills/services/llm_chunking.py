@@ -0,0 +1,88 @@
+"""
+Split long resume text into LLM-sized chunks on section and paragraph boundaries.
+
+Token counts are estimated from character length (Groq reports the real
+``usage`` per call; the estimate only drives the split).
+"""
+from __future__ import annotations
+
+import re
+from typing import List
+
+_SECTION_HEADINGS = (
+    "summary", "profile", "objective", "skills", "technical skills", "core competencies",
+    "experience", "work experience", "professional experience", "employment history",
+    "projects", "education", "certifications", "publications", "awards", "languages",
+    "tools", "technologies", "interests", "achievements",
+)
+_HEADING_RE = re.compile(
+    r"^\s*(?:" + "|".join(re.escape(h) for h in _SECTION_HEADINGS) + r")\s*:?\s*$",
+    re.IGNORECASE,
+)
+
+
+def estimate_tokens(text: str, chars_per_token: float = 4.0) -> int:
+    return int(len(text) / chars_per_token) + 1 if text else 0
+
+
+def _is_heading(line: str) -> bool:
+    stripped = line.strip()
+    if not stripped:
+        return False
+    if _HEADING_RE.match(stripped):
+        return True
+    # Short all-caps lines ("WORK HISTORY") are headings in most PDF exports.
+    return stripped.isupper() and len(stripped.split()) <= 4
+
+
+def _split_blocks(text: str) -> List[str]:
+    """Paragraphs, with every section heading starting a new block."""
+    blocks: List[str] = []
+    current: List[str] = []
+    for line in text.splitlines():
+        if not line.strip() or _is_heading(line):
+            if current:
+                blocks.append("\n".join(current))
+                current = []
+            if not line.strip():
+                continue
+        current.append(line)
+    if current:
+        blocks.append("\n".join(current))
+    return blocks
+
+
+def _split_oversized(block: str, max_chars: int) -> List[str]:
+    """Last resort for a single block over budget: split on lines, then words."""
+    pieces: List[str] = []
+    current = ""
+    for unit in re.split(r"(?<=\n)|(?<= )", block):
+        if len(current) + len(unit) > max_chars and current:
+            pieces.append(current.strip())
+            current = ""
+        current += unit
+    if current.strip():
+        pieces.append(current.strip())
+    return pieces
+
+
+def split_resume_text(text: str, max_tokens: int, chars_per_token: float = 4.0) -> List[str]:
+    """Greedily pack blocks into chunks of at most ``max_tokens`` (estimated)."""
+    if not text or not text.strip():
+        return []
+    max_chars = max(1, int(max_tokens * chars_per_token))
+    chunks: List[str] = []
+    current = ""
+    for block in _split_blocks(text):
+        units = [block] if len(block) <= max_chars else _split_oversized(block, max_chars)
+        for unit in units:
+            candidate = f"{current}\n\n{unit}" if current else unit
+            if len(candidate) <= max_chars:
+                current = candidate
+                continue
+            if current:
+                chunks.append(current)
+            current = unit
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,203 @@
+"""
+Skill name normalization: alias table + canonical ``Skill`` vocabulary +
+character-trigram fuzzy index.
+
+Resolution order for a raw string:
+1. alias table (``SKILL_ALIASES`` via the skill matcher artifact)
+2. exact canonical ``Skill.normalized_name``
+3. compact form (version suffix, spaces and punctuation dropped:
+   "ReactJS 18" -> "reactjs", "Postgre SQL" -> "postgresql") against aliases
+   and canonical names
+4. trigram Dice similarity against canonical names (>= FUZZY_THRESHOLD)
+5. otherwise the stripped input, unchanged
+
+Short plain words (letters only, under ``min_compact_length``) stop after
+step 2: "Net" must not become ".NET" through its compact key.
+
+Results are memoized in an LRU; the canonical vocabulary is reloaded from the
+DB every REFRESH_SECONDS and extended in place as skills are created.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.conf import settings
+
+from .skill_dictionary import get_skill_dictionary
+
+logger = logging.getLogger(__name__)
+
+_VERSION_SUFFIX_RE = re.compile(r"\s+v?\d+(?:\.\d+)*(?:\.x)?\+?$")
+_NON_KEY_CHARS_RE = re.compile(r"[^a-z0-9+#]")
+_PLAIN_WORD_RE = re.compile(r"[a-z]+")
+
+
+def compact_key(raw: str) -> str:
+    lower = _VERSION_SUFFIX_RE.sub("", raw.strip().lower())
+    return _NON_KEY_CHARS_RE.sub("", lower)
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SkillNormalizer:
+    def __init__(
+        self,
+        aliases: Dict[str, str],
+        fuzzy_threshold: float = 0.85,
+        min_fuzzy_length: int = 4,
+        min_compact_length: int = 4,
+        cache_size: int = 4096,
+    ) -> None:
+        self.fuzzy_threshold = fuzzy_threshold
+        self.min_fuzzy_length = min_fuzzy_length
+        self.min_compact_length = min_compact_length
+        self._lock = threading.Lock()
+        self._aliases = dict(aliases)
+        self._compact_aliases = self._unique_by_compact_key(self._aliases.items())
+        self._canonical: Dict[str, str] = {}  # normalized_name -> display name
+        self._compact_canonical: Dict[str, Optional[str]] = {}
+        self._postings: Dict[str, Set[str]] = defaultdict(set)  # trigram -> compact keys
+        self._trigram_counts: Dict[str, int] = {}
+        self._resolve_cached = lru_cache(maxsize=cache_size)(self._resolve)
+
+    @staticmethod
+    def _unique_by_compact_key(pairs) -> Dict[str, Optional[str]]:
+        """Compact key -> target, or None when two different targets collide."""
+        out: Dict[str, Optional[str]] = {}
+        for raw, target in pairs:
+            key = compact_key(raw)
+            if key and key in out and out[key] != target:
+                out[key] = None
+            elif key:
+                out[key] = target
+        return out
+
+    # -- vocabulary ---------------------------------------------------------
+
+    def load_canonical(self, names: Dict[str, str]) -> None:
+        """Replace the canonical vocabulary (normalized_name -> name)."""
+        with self._lock:
+            self._canonical = {}
+            self._compact_canonical = {}
+            self._postings = defaultdict(set)
+            self._trigram_counts = {}
+            for normalized, name in names.items():
+                self._add_canonical_locked(normalized, name)
+        self._resolve_cached.cache_clear()
+
+    def add_canonical(self, name: str, normalized: Optional[str] = None) -> None:
+        """Make a newly created skill resolvable without a full reload."""
+        normalized = (normalized or name).strip().lower()
+        with self._lock:
+            if normalized in self._canonical:
+                return
+            self._add_canonical_locked(normalized, name)
+        self._resolve_cached.cache_clear()
+
+    def _add_canonical_locked(self, normalized: str, name: str) -> None:
+        self._canonical[normalized] = name
+        key = compact_key(normalized)
+        if not key:
+            return
+        if key in self._compact_canonical:
+            if self._compact_canonical[key] != name:
+                self._compact_canonical[key] = None
+            return
+        self._compact_canonical[key] = name
+        grams = _trigrams(key)
+        self._trigram_counts[key] = len(grams)
+        for gram in grams:
+            self._postings[gram].add(key)
+
+    # -- lookups ------------------------------------------------------------
+
+    def normalize(self, raw: str) -> str:
+        if not raw:
+            return ""
+        stripped = raw.strip()
+        return self._resolve_cached(stripped) if stripped else ""
+
+    def normalize_many(self, raws: Iterable[str]) -> List[str]:
+        """Batched lookup: each distinct input is resolved once."""
+        raws = list(raws)
+        resolved = {r: self.normalize(r) for r in set(raws)}
+        return [resolved[r] for r in raws]
+
+    def cache_info(self):
+        return self._resolve_cached.cache_info()
+
+    def _resolve(self, stripped: str) -> str:
+        lower = stripped.lower()
+        if lower in self._aliases:
+            return self._aliases[lower]
+        if lower in self._canonical:
+            return self._canonical[lower]
+        key = compact_key(stripped)
+        if not key or (len(key) < self.min_compact_length and _PLAIN_WORD_RE.fullmatch(lower)):
+            return stripped
+        if self._compact_aliases.get(key):
+            return self._compact_aliases[key]
+        if self._compact_canonical.get(key):
+            return self._compact_canonical[key]
+        if len(key) >= self.min_fuzzy_length:
+            match = self._fuzzy(key)
+            if match:
+                return match
+        return stripped
+
+    def _fuzzy(self, key: str) -> Optional[str]:
+        grams = _trigrams(key)
+        shared: Counter = Counter()
+        with self._lock:
+            for gram in grams:
+                shared.update(self._postings.get(gram, ()))
+            best_key, best_score = None, 0.0
+            for candidate, count in shared.items():
+                score = 2.0 * count / (len(grams) + self._trigram_counts[candidate])
+                if score > best_score:
+                    best_key, best_score = candidate, score
+            if best_key is None or best_score < self.fuzzy_threshold:
+                return None
+            return self._compact_canonical.get(best_key)
+
+
+_normalizer: SkillNormalizer | None = None
+_loaded_at = 0.0
+_normalizer_lock = threading.Lock()
+
+
+def _load_canonical_names() -> Dict[str, str]:
+    from apps.skills.models import Skill
+    return dict(Skill.objects.values_list("normalized_name", "name"))
+
+
+def get_skill_normalizer() -> SkillNormalizer:
+    global _normalizer, _loaded_at
+    cfg = settings.SKILL_EXTRACTION_CONFIG
+    refresh = cfg.get("NORMALIZER_REFRESH_SECONDS", 300)
+    if _normalizer is not None and time.monotonic() - _loaded_at < refresh:
+        return _normalizer
+    with _normalizer_lock:
+        if _normalizer is None:
+            _normalizer = SkillNormalizer(
+                get_skill_dictionary().aliases,
+                fuzzy_threshold=cfg.get("NORMALIZER_FUZZY_THRESHOLD", 0.85),
+                cache_size=cfg.get("NORMALIZER_CACHE_SIZE", 4096),
+            )
+        if time.monotonic() - _loaded_at >= refresh:
+            # Set first so a failing DB doesn't turn every call into a query.
+            _loaded_at = time.monotonic()
+            try:
+                _normalizer.load_canonical(_load_canonical_names())
+            except Exception as e:
+                logger.warning("Skill vocabulary load failed; using aliases only: %s", e)
+    return _normalizer
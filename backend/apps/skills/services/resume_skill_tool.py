@@ -9,87 +9,44 @@ project. It is used for:
 from __future__ import annotations
 
 import json
+import logging
 import re
-from pathlib import Path
-from typing import List, Set
-
-import spacy
-from spacy.matcher import PhraseMatcher
-from groq import Groq
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, Iterable, List, Set, Tuple
 
 from django.conf import settings
 
+from core.services.inference_client import InferenceUnavailable, get_inference_client
+
+from .aho_corasick import AhoCorasickSkillExtractor
+from .extraction_cache import get_extraction_cache, make_cache_key
+from .llm_chunking import estimate_tokens, split_resume_text
+from .normalization import get_skill_normalizer
+from .skill_dictionary import get_skill_dictionary, skill_dictionary_version
+
+logger = logging.getLogger(__name__)
+
 
 # ---------------------------------------------------------------------------
 # PUBLIC HELPERS (used by views, jobs, roles)
 # ---------------------------------------------------------------------------
-_SKILL_NORMALIZATION_MAP = {
-    "react.js": "React",
-    "reactjs": "React",
-    "node.js": "Node.js",
-    "nodejs": "Node.js",
-    "vue.js": "Vue.js",
-    "vuejs": "Vue.js",
-    "typescript": "TypeScript",
-    "javascript": "JavaScript",
-    "python": "Python",
-    "java": "Java",
-    "go": "Go",
-    "rust": "Rust",
-    "c++": "C++",
-    "c#": "C#",
-    "php": "PHP",
-    "kotlin": "Kotlin",
-    "swift": "Swift",
-    "django": "Django",
-    "flask": "Flask",
-    "fastapi": "FastAPI",
-    "postgresql": "PostgreSQL",
-    "postgres": "PostgreSQL",
-    "mongodb": "MongoDB",
-    "mysql": "MySQL",
-    "redis": "Redis",
-    "docker": "Docker",
-    "kubernetes": "Kubernetes",
-    "aws": "AWS",
-    "azure": "Azure",
-    "gcp": "GCP",
-    "git": "Git",
-    "github": "GitHub",
-    "gitlab": "GitLab",
-    "rest api": "REST API",
-    "rest": "REST",
-    "graphql": "GraphQL",
-    "machine learning": "Machine Learning",
-    "deep learning": "Deep Learning",
-    "tensorflow": "TensorFlow",
-    "pytorch": "PyTorch",
-    "scikit-learn": "scikit-learn",
-    "nlp": "NLP",
-    "html": "HTML",
-    "css": "CSS",
-    "sass": "SASS",
-    "tailwind": "Tailwind",
-    "agile": "Agile",
-    "scrum": "Scrum",
-    "jira": "Jira",
-    "linux": "Linux",
-    "bash": "Bash",
-    "testing": "Testing",
-}
-
-
 def normalize_skill(raw: str) -> str:
     """
     Normalize a raw skill string into a canonical form.
     """
     if not raw:
         return ""
-    lower = raw.strip().lower()
-    return _SKILL_NORMALIZATION_MAP.get(lower, raw.strip())
+    return get_skill_normalizer().normalize(raw)
 
 
-def extract_skills(text: str, use_llm: bool = False) -> List[str]:
+def normalize_skills(raws: Iterable[str]) -> List[str]:
+    """Batched ``normalize_skill``: each distinct input is resolved once."""
+    return get_skill_normalizer().normalize_many(raws)
+
+
+def extract_skills(text: str, use_llm: bool = True) -> List[str]:
     """
     Unified extraction API used across the app.
 
@@ -97,18 +54,53 @@ def extract_skills(text: str, use_llm: bool = False) -> List[str]:
       - user skills (skills views, jobs ingestion, role seeding)
       - uploaded document skills (resume upload)
 
-    It delegates to SkillTool.run(...) and returns the final normalized list.
-    The use_llm flag is kept for backwards compatibility; SkillTool already
-    combines rule-based and LLM signals.
+    With ``use_llm`` it delegates to SkillTool.run(...), which combines
+    rule-based and Groq signals; without it only the rule-based matcher runs.
+    Returns the final normalized list.
     """
     if not text or not text.strip():
         return []
+    if not use_llm:
+        return _normalize_skill_list(sorted(SkillTool.rule_extractor.extract(text)))
     data = SkillTool.run(text)
-    raw_skills = data.get("all_skills") or []
+    return _normalize_skill_list(data.get("all_skills") or [])
+
+
+def extract_skills_batch(
+    texts: Iterable[str],
+    use_llm: bool = True,
+    n_process: int = 1,
+    batch_size: int = 64,
+) -> List[List[str]]:
+    """
+    Batch variant of ``extract_skills`` for bulk ingestion (jobs sync, imports).
+
+    Rule-based matching streams all texts through ``nlp.pipe`` instead of
+    parsing them one at a time. When ``use_llm`` is set, Groq sees the texts
+    packed several per prompt (``LLMSkillExtractor.extract_many``).
+    Returns one normalized list per input text, in order.
+    """
+    texts = [t or "" for t in texts]
+    if not texts:
+        return []
+    rule_results = SkillTool.rule_extractor.extract_batch(texts, n_process=n_process, batch_size=batch_size)
+    llm_results = SkillTool.llm_extractor.extract_many(texts) if use_llm else [[] for _ in texts]
+    results: List[List[str]] = []
+    for text, rule_skills, llm_skills in zip(texts, rule_results, llm_results):
+        if not text.strip():
+            results.append([])
+            continue
+        raw_skills = set(rule_skills)
+        raw_skills.update(llm_skills)
+        results.append(_normalize_skill_list(sorted(raw_skills)))
+    return results
+
+
+def _normalize_skill_list(raw_skills: Iterable[str]) -> List[str]:
+    """Normalize and de-duplicate (case-insensitively) a list of raw skills."""
     seen = set()
     result: List[str] = []
-    for s in raw_skills:
-        ns = normalize_skill(s)
+    for ns in normalize_skills(raw_skills):
         if not ns:
             continue
         key = ns.lower()
@@ -122,7 +114,22 @@ def extract_skills(text: str, use_llm: bool = False) -> List[str]:
 # ---------------------------------------------------------------------------
 # CONFIG (LLM - GROQ)
 # ---------------------------------------------------------------------------
-client = Groq(api_key=settings.GROQ_API_KEY)
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_groq_client():
+    """Shared Groq client, created on first LLM call (keeps ``groq`` off the import path)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from groq import Groq
+                _client = Groq(api_key=settings.GROQ_API_KEY)
+    return _client
+
+
+LLM_MODEL = settings.GROQ_CONFIG.get("MODEL", "llama-3.3-70b-versatile")
 
 
 # ---------------------------------------------------------------------------
@@ -137,22 +144,24 @@ class SkillExtractor:
         if cls._nlp is not None:
             return
         try:
-            print("🔹 Loading spaCy model...")
-            cls._nlp = spacy.load("en_core_web_sm")
-            matcher = PhraseMatcher(cls._nlp.vocab, attr="LOWER")
-            # Skills list lives in skills app data
-            skills_path = Path(__file__).resolve().parent.parent / "data" / "skill.txt"
-            if not skills_path.exists():
-                raise Exception("skill.txt not found in apps/skills/data/")
-            skills = [
-                line.strip().lower()
-                for line in skills_path.read_text(encoding="utf-8").splitlines()
-                if line.strip()
-            ]
-            patterns = [cls._nlp.make_doc(skill) for skill in skills]
+            import spacy
+            from spacy.matcher import PhraseMatcher
+            from spacy.tokens import Doc
+
+            logger.info("Loading spaCy model...")
+            nlp = spacy.load("en_core_web_sm")
+            matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+            dictionary = get_skill_dictionary()
+            if dictionary.spacy_patterns is not None:
+                # Pre-tokenized in the artifact: no tokenizer pass per phrase.
+                patterns = [Doc(nlp.vocab, words=words) for words in dictionary.spacy_patterns]
+            else:
+                patterns = [nlp.make_doc(skill) for skill in dictionary.phrases]
             matcher.add("SKILLS", patterns)
             cls._matcher = matcher
-            print(f"✅ Skill matcher initialized with {len(skills)} skills.")
+            # Published last so concurrent callers never see a half-built matcher.
+            cls._nlp = nlp
+            logger.info("Skill matcher initialized with %d skills (dictionary %s).", len(patterns), dictionary.version)
         except Exception as e:
             raise Exception(f"Failed to initialize SkillExtractor: {e}") from e
 
@@ -161,10 +170,33 @@ class SkillExtractor:
         if not text:
             return []
         cls._initialize()
-        doc = cls._nlp(text)
-        matches = cls._matcher(doc)
+        return cls._match(cls._nlp(text))
+
+    @classmethod
+    def extract_batch(
+        cls,
+        texts: List[str],
+        n_process: int = 1,
+        batch_size: int = 64,
+    ) -> List[List[str]]:
+        """Match many texts in one ``nlp.pipe`` stream. Output order follows input."""
+        if not texts:
+            return []
+        cls._initialize()
+        # The matcher works on LOWER token attrs, so the tagger/parser/NER
+        # pipes add nothing here; only tokenization is needed.
+        docs = cls._nlp.pipe(
+            texts,
+            batch_size=batch_size,
+            n_process=n_process,
+            disable=cls._nlp.pipe_names,
+        )
+        return [cls._match(doc) if text else [] for text, doc in zip(texts, docs)]
+
+    @classmethod
+    def _match(cls, doc) -> List[str]:
         skills: Set[str] = set()
-        for _, start, end in matches:
+        for _, start, end in cls._matcher(doc):
             span = doc[start:end]
             skills.add(span.text.lower())
         return sorted(skills)
@@ -173,13 +205,7 @@ class SkillExtractor:
 # ---------------------------------------------------------------------------
 # LLM SKILL EXTRACTOR (GROQ)
 # ---------------------------------------------------------------------------
-class LLMSkillExtractor:
-    system_prompt = """
-You are an expert resume parsing system.
-
-Your task is to extract ALL professional technical skills from the provided resume text.
-
-INCLUDE:
+_EXTRACTION_GUIDELINES = """INCLUDE:
 - Programming languages
 - Frameworks and libraries
 - Databases
@@ -210,7 +236,16 @@ RULES:
 - Extract both explicitly mentioned and strongly implied technical skills.
 - If a skill appears multiple times, return it only once.
 
-FORMAT:
+"""
+
+
+class LLMSkillExtractor:
+    system_prompt = """
+You are an expert resume parsing system.
+
+Your task is to extract ALL professional technical skills from the provided resume text.
+
+{guidelines}FORMAT:
 {
   "skills": ["python", "django", "aws", "machine learning"]
 }
@@ -219,39 +254,280 @@ If no skills are found, return:
 {
   "skills": []
 }
-"""
+""".replace("{guidelines}", _EXTRACTION_GUIDELINES)
+
+    batch_system_prompt = """
+You are an expert job description parsing system.
+
+You will receive several documents. Each one starts with a line "### DOC <id>".
+Your task is to extract ALL professional technical skills from EACH document separately.
+
+{guidelines}FORMAT:
+{
+  "documents": {
+    "<id>": ["python", "django", "aws"],
+    "<id>": []
+  }
+}
+
+Return one entry for EVERY document id, using the ids exactly as given.
+""".replace("{guidelines}", _EXTRACTION_GUIDELINES)
 
     def extract(self, resume_text: str) -> List[str]:
-        if not resume_text:
-            return []
         try:
-            response = client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": f"Resume:\n{resume_text}"},
-                ],
-                temperature=0.0,
-            )
-            text = response.choices[0].message.content.strip()
-            text = re.sub(r"```json|```", "", text).strip()
-            match = re.search(r"\{.*\}", text, re.DOTALL)
-            json_text = match.group(0) if match else text
-            data = json.loads(json_text)
-            skills = data.get("skills", [])
-            if not isinstance(skills, list):
-                return []
-            return list(set(skill.lower() for skill in skills))
+            return self.extract_or_raise(resume_text)
         except Exception as e:
             print("❌ Groq Skill Extraction Error:", e)
             return []
 
+    def extract_or_raise(self, resume_text: str) -> List[str]:
+        """Like ``extract`` but lets Groq / parsing errors propagate."""
+        skills, _ = self.extract_with_stats(resume_text)
+        return skills
+
+    def extract_with_stats(self, resume_text: str) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """
+        Extract skills and return per-call stats (chars, estimated and reported
+        tokens, seconds). With LLM_CHUNKING, text over LLM_CHUNK_TOKEN_BUDGET is
+        split on section / paragraph boundaries and the chunks are sent to Groq
+        concurrently; a failed chunk is reported as ``{"chunk": i, "error": ...}``
+        in the stats and the other chunks' skills are kept (if every chunk
+        fails, the first error is raised).
+        """
+        if not resume_text:
+            return [], []
+        cfg = settings.SKILL_EXTRACTION_CONFIG
+        budget = cfg.get("LLM_CHUNK_TOKEN_BUDGET", 1500)
+        chars_per_token = cfg.get("LLM_CHARS_PER_TOKEN", 4.0)
+        if not cfg.get("LLM_CHUNKING", False) or estimate_tokens(resume_text, chars_per_token) <= budget:
+            skills, stats = self._complete(resume_text, "Resume:")
+            return skills, [stats]
+
+        chunks = split_resume_text(resume_text, budget, chars_per_token)
+        total = len(chunks)
+        futures = [
+            _get_chunk_executor().submit(self._complete, chunk, f"Resume (part {i} of {total}):")
+            for i, chunk in enumerate(chunks, start=1)
+        ]
+        merged: Set[str] = set()
+        chunk_stats: List[Dict[str, Any]] = []
+        errors: List[Exception] = []
+        for i, future in enumerate(futures, start=1):
+            try:
+                skills, stats = future.result()
+            except Exception as e:
+                errors.append(e)
+                chunk_stats.append({"chunk": i, "error": str(e)})
+                continue
+            merged.update(skills)
+            chunk_stats.append({"chunk": i, **stats})
+        if len(errors) == total:
+            raise errors[0]
+        logger.info(
+            "Groq chunked extraction: %d chunks (%d failed), %d prompt tokens, %.2fs slowest chunk",
+            total,
+            len(errors),
+            sum(s.get("prompt_tokens") or 0 for s in chunk_stats),
+            max(s.get("seconds", 0.0) for s in chunk_stats),
+        )
+        return sorted(merged), chunk_stats
+
+    def _complete(self, text: str, label: str) -> Tuple[List[str], Dict[str, Any]]:
+        started = time.monotonic()
+        response = get_groq_client().chat.completions.create(
+            model=LLM_MODEL,
+            messages=[
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": f"{label}\n{text}"},
+            ],
+            temperature=0.0,
+        )
+        usage = getattr(response, "usage", None)
+        stats = {
+            "chars": len(text),
+            "estimated_tokens": estimate_tokens(text, settings.SKILL_EXTRACTION_CONFIG.get("LLM_CHARS_PER_TOKEN", 4.0)),
+            "prompt_tokens": getattr(usage, "prompt_tokens", None),
+            "completion_tokens": getattr(usage, "completion_tokens", None),
+            "seconds": round(time.monotonic() - started, 3),
+        }
+        return self._parse_skills(response.choices[0].message.content), stats
+
+    @staticmethod
+    def _parse_skills(content: str) -> List[str]:
+        text = content.strip()
+        text = re.sub(r"```json|```", "", text).strip()
+        match = re.search(r"\{.*\}", text, re.DOTALL)
+        json_text = match.group(0) if match else text
+        data = json.loads(json_text)
+        skills = data.get("skills", [])
+        if not isinstance(skills, list):
+            return []
+        return list(set(skill.lower() for skill in skills))
+
+    def extract_many(self, texts: List[str]) -> List[List[str]]:
+        """
+        Extract skills for many short documents (job descriptions) with few
+        Groq calls: documents are packed, each under an id, into prompts of at
+        most LLM_BATCH_TOKEN_BUDGET (estimated) tokens and LLM_BATCH_MAX_DOCS
+        documents, and the keyed JSON answer is split back per document.
+        Documents missing from / malformed in the answer, or too large to
+        share a prompt, fall back to one ``extract`` call each.
+        """
+        cfg = settings.SKILL_EXTRACTION_CONFIG
+        budget = cfg.get("LLM_BATCH_TOKEN_BUDGET", 6000)
+        max_docs = cfg.get("LLM_BATCH_MAX_DOCS", 20)
+        chars_per_token = cfg.get("LLM_CHARS_PER_TOKEN", 4.0)
+
+        results: List[List[str] | None] = [[] if not (t and t.strip()) else None for t in texts]
+        batches: List[List[int]] = []
+        current: List[int] = []
+        used = 0
+        for i, text in enumerate(texts):
+            if results[i] is not None:
+                continue
+            cost = estimate_tokens(text, chars_per_token)
+            if cost > budget:
+                continue  # handled by the single-document fallback
+            if current and (used + cost > budget or len(current) >= max_docs):
+                batches.append(current)
+                current, used = [], 0
+            current.append(i)
+            used += cost
+        if current:
+            batches.append(current)
+
+        futures = [_get_chunk_executor().submit(self._complete_batch, [(str(i), texts[i]) for i in batch]) for batch in batches]
+        for batch, future in zip(batches, futures):
+            try:
+                parsed = future.result()
+            except Exception as e:
+                logger.warning("Groq batch extraction failed for %d documents: %s", len(batch), e)
+                continue
+            for i in batch:
+                if str(i) in parsed:
+                    results[i] = parsed[str(i)]
+
+        missing = [i for i, r in enumerate(results) if r is None]
+        if missing:
+            logger.info("Groq batch extraction: %d of %d documents need single calls", len(missing), len(texts))
+        for i in missing:
+            results[i] = self.extract(texts[i])
+        return results
+
+    def _complete_batch(self, docs: List[Tuple[str, str]]) -> Dict[str, List[str]]:
+        """One Groq call for several documents; returns only the ids that parsed cleanly."""
+        content = "\n\n".join(f"### DOC {doc_id}\n{text.strip()}" for doc_id, text in docs)
+        response = get_groq_client().chat.completions.create(
+            model=LLM_MODEL,
+            messages=[
+                {"role": "system", "content": self.batch_system_prompt},
+                {"role": "user", "content": content},
+            ],
+            temperature=0.0,
+        )
+        text = response.choices[0].message.content.strip()
+        text = re.sub(r"```json|```", "", text).strip()
+        match = re.search(r"\{.*\}", text, re.DOTALL)
+        data = json.loads(match.group(0) if match else text)
+        documents = data.get("documents", data) if isinstance(data, dict) else {}
+        parsed: Dict[str, List[str]] = {}
+        for doc_id, _ in docs:
+            skills = documents.get(doc_id) if isinstance(documents, dict) else None
+            if isinstance(skills, list) and all(isinstance(s, str) for s in skills):
+                parsed[doc_id] = sorted(set(s.lower() for s in skills))
+        return parsed
+
 
 # ---------------------------------------------------------------------------
 # COMBINED SKILL TOOL (resume upload flow)
 # ---------------------------------------------------------------------------
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Shared, bounded pool for Groq calls so concurrent uploads can't fan out unbounded."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                max_workers = settings.SKILL_EXTRACTION_CONFIG.get("LLM_MAX_WORKERS", 4)
+                _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="skill-llm")
+    return _executor
+
+
+MATCH_ENGINES = {
+    "spacy": SkillExtractor,
+    "aho_corasick": AhoCorasickSkillExtractor,
+}
+
+
+class InferenceServerExtractor:
+    """
+    Rule-based matching on the shared inference server (INFERENCE_SERVER_CONFIG),
+    so the spaCy matcher is loaded once per host rather than once per worker.
+    Falls back to the local engine while the server is unreachable.
+    """
+
+    def __init__(self, engine: str) -> None:
+        self.engine = engine
+        self.local = MATCH_ENGINES[engine]
+        self.__name__ = f"{self.local.__name__}@inference_server"
+
+    def extract(self, text: str) -> List[str]:
+        if not text:
+            return []
+        return self.extract_batch([text])[0]
+
+    def extract_batch(
+        self,
+        texts: List[str],
+        n_process: int = 1,
+        batch_size: int = 64,
+    ) -> List[List[str]]:
+        client = get_inference_client()
+        if client is not None and texts:
+            try:
+                return client.match_skills(texts, self.engine)
+            except InferenceUnavailable:
+                if not client.fallback_local:
+                    raise
+        return self.local.extract_batch(texts, n_process=n_process, batch_size=batch_size)
+
+
+def get_rule_extractor(engine: str | None = None):
+    """Rule-based engine selected by SKILL_EXTRACTION_CONFIG['MATCH_ENGINE']."""
+    name = engine or settings.SKILL_EXTRACTION_CONFIG.get("MATCH_ENGINE", "spacy")
+    if name not in MATCH_ENGINES:
+        raise ValueError(f"Unknown skill match engine: {name!r} (expected one of {sorted(MATCH_ENGINES)})")
+    if get_inference_client() is not None:
+        return InferenceServerExtractor(name)
+    return MATCH_ENGINES[name]
+
+
+_chunk_executor: ThreadPoolExecutor | None = None
+
+
+def _has_failed_call(llm_stats: List[Dict[str, Any]]) -> bool:
+    return any("error" in stats for stats in llm_stats)
+
+
+def _get_chunk_executor() -> ThreadPoolExecutor:
+    """
+    Separate bounded pool for per-chunk Groq calls. Chunked calls are issued
+    from inside the main LLM pool, so sharing it could deadlock under load.
+    """
+    global _chunk_executor
+    if _chunk_executor is None:
+        with _executor_lock:
+            if _chunk_executor is None:
+                max_workers = settings.SKILL_EXTRACTION_CONFIG.get("LLM_CHUNK_CONCURRENCY", 4)
+                _chunk_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="skill-llm-chunk")
+    return _chunk_executor
+
+
 class SkillTool:
-    rule_extractor = SkillExtractor()
+    rule_extractor = get_rule_extractor()
     llm_extractor = LLMSkillExtractor()
 
     @staticmethod
@@ -261,13 +537,68 @@ class SkillTool:
                 "rule_based_skills": [],
                 "llm_skills": [],
                 "all_skills": [],
+                "sources": [],
+                "dictionary_version": skill_dictionary_version(),
+                "llm_calls": [],
             }
-        #print("🚀 Running Skill Extraction Pipeline...")
+        cache = get_extraction_cache()
+        engine = settings.SKILL_EXTRACTION_CONFIG.get("MATCH_ENGINE", "spacy")
+        key = make_cache_key(text, f"{skill_dictionary_version()}/{engine}", LLM_MODEL)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        deadline = settings.SKILL_EXTRACTION_CONFIG.get("LLM_DEADLINE_SECONDS", 20.0)
+        started = time.monotonic()
+        # Groq is network-bound, so it overlaps with the spaCy parse below.
+        llm_future = _get_executor().submit(SkillTool.llm_extractor.extract_with_stats, text)
         rule_skills: Set[str] = set(SkillTool.rule_extractor.extract(text))
-        llm_skills: Set[str] = set(SkillTool.llm_extractor.extract(text))
-        final_skills = sorted(rule_skills.union(llm_skills))
+        sources = ["rule_based"]
+        llm_stats: List[Dict[str, Any]] = []
+        try:
+            remaining = max(0.0, deadline - (time.monotonic() - started))
+            skills, llm_stats = llm_future.result(timeout=remaining)
+            llm_skills: Set[str] = set(skills)
+            sources.append("llm")
+        except FutureTimeoutError:
+            logger.warning("Groq skill extraction exceeded %ss; returning rule-based skills only", deadline)
+            llm_skills = set()
+            # Let the in-flight call finish and warm the cache for the next retry.
+            llm_future.add_done_callback(
+                lambda f: SkillTool._cache_late_llm_result(f, key, rule_skills)
+            )
+        except Exception as e:
+            logger.warning("Groq skill extraction failed: %s", e)
+            llm_skills = set()
+        result = SkillTool._build_result(rule_skills, llm_skills, sources, llm_stats)
+        # Don't pin a degraded (rule-only or partly chunked) result; a retry should hit Groq again.
+        if "llm" in sources and not _has_failed_call(llm_stats):
+            cache.set(key, result)
+        return result
+
+    @staticmethod
+    def _build_result(rule_skills: Set[str], llm_skills: Set[str], sources: List[str], llm_stats=None):
         return {
             "rule_based_skills": sorted(rule_skills),
             "llm_skills": sorted(llm_skills),
-            "all_skills": final_skills,
+            "all_skills": sorted(rule_skills.union(llm_skills)),
+            "sources": sources,
+            "dictionary_version": skill_dictionary_version(),
+            # One entry per Groq call (several when the resume was chunked).
+            "llm_calls": llm_stats or [],
         }
+
+    @staticmethod
+    def _cache_late_llm_result(future, key: str, rule_skills: Set[str]) -> None:
+        # Runs on the Groq executor thread: close the DB connection the cache write opens.
+        from django.db import connection
+
+        if future.cancelled() or future.exception() is not None:
+            return
+        skills, llm_stats = future.result()
+        if _has_failed_call(llm_stats):
+            return
+        result = SkillTool._build_result(rule_skills, set(skills), ["rule_based", "llm"], llm_stats)
+        try:
+            get_extraction_cache().set(key, result)
+        finally:
+            connection.close()
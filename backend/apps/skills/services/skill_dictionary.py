@@ -0,0 +1,151 @@
+"""
+Skill dictionary shared by every rule-based matching engine and by
+``normalize_skill``.
+
+Sources: ``apps/skills/data/skill.txt``, ``MASTER_SKILLS`` and ``SKILL_ALIASES``.
+``python manage.py compile_skill_dictionary`` compiles them (plus the spaCy
+pattern tokens and the Aho-Corasick tables) into ``skill_matcher.json`` with a
+content-hash version. Workers load that artifact instead of rebuilding the
+matcher; an artifact whose source fingerprint no longer matches the source
+files is refused and the dictionary is compiled in memory instead.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from apps.skills.data.master_skills import MASTER_SKILLS
+from apps.skills.data.skill_aliases import SKILL_ALIASES
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+# Skills list lives in skills app data
+SKILLS_PATH = DATA_DIR / "skill.txt"
+ARTIFACT_PATH = DATA_DIR / "skill_matcher.json"
+ARTIFACT_FORMAT = 1
+_SOURCE_PATHS = (SKILLS_PATH, DATA_DIR / "master_skills.py", DATA_DIR / "skill_aliases.py")
+
+
+class SkillDictionaryError(Exception):
+    """Skill dictionary / artifact error."""
+    pass
+
+
+class SkillDictionary:
+    """Compiled phrases, aliases and matcher tables, identified by ``version``."""
+
+    def __init__(self, payload: Dict[str, Any]) -> None:
+        self.version: str = payload["version"]
+        self.phrases: List[str] = payload["phrases"]
+        self.aliases: Dict[str, str] = payload["aliases"]
+        # Token lists from spaCy's tokenizer; absent if spaCy wasn't importable at compile time.
+        self.spacy_patterns: Optional[List[List[str]]] = payload.get("spacy_patterns")
+        self.automaton_tables: Dict[str, Any] = payload["automaton"]
+
+
+def source_fingerprint() -> str:
+    """Hash of the raw source files; an artifact is stale when this changes."""
+    digest = hashlib.sha256()
+    for path in _SOURCE_PATHS:
+        digest.update(path.read_bytes() if path.exists() else b"")
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def _collect_phrases() -> List[str]:
+    if not SKILLS_PATH.exists():
+        raise SkillDictionaryError("skill.txt not found in apps/skills/data/")
+    lines = SKILLS_PATH.read_text(encoding="utf-8").splitlines()
+    seen = set()
+    phrases: List[str] = []
+    for raw in [*lines, *MASTER_SKILLS]:
+        phrase = raw.strip().lower()
+        if phrase and phrase not in seen:
+            seen.add(phrase)
+            phrases.append(phrase)
+    return phrases
+
+
+def _spacy_pattern_tokens(phrases: List[str]) -> Optional[List[List[str]]]:
+    try:
+        import spacy
+    except ImportError:
+        return None
+    # The blank English pipeline shares en_core_web_sm's tokenizer rules.
+    tokenizer = spacy.blank("en").tokenizer
+    return [[t.text for t in tokenizer(phrase)] for phrase in phrases]
+
+
+def compile_skill_dictionary() -> Dict[str, Any]:
+    """Build the artifact payload from the source files."""
+    from .aho_corasick import AhoCorasickAutomaton
+
+    phrases = _collect_phrases()
+    aliases = {k.strip().lower(): v for k, v in SKILL_ALIASES.items()}
+    content = json.dumps({"phrases": phrases, "aliases": aliases}, sort_keys=True)
+    return {
+        "format": ARTIFACT_FORMAT,
+        "version": hashlib.sha256(content.encode("utf-8")).hexdigest()[:16],
+        "source_fingerprint": source_fingerprint(),
+        "phrases": phrases,
+        "aliases": aliases,
+        "spacy_patterns": _spacy_pattern_tokens(phrases),
+        "automaton": AhoCorasickAutomaton(phrases).to_tables(),
+    }
+
+
+def write_skill_dictionary_artifact(path: Path = ARTIFACT_PATH) -> Dict[str, Any]:
+    payload = compile_skill_dictionary()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+    tmp_path.replace(path)
+    return payload
+
+
+def read_skill_dictionary_artifact(path: Path = ARTIFACT_PATH) -> Dict[str, Any]:
+    """Load and validate an artifact; raises SkillDictionaryError if missing, foreign or stale."""
+    if not path.exists():
+        raise SkillDictionaryError(f"Skill matcher artifact not found: {path}")
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError as e:
+        raise SkillDictionaryError(f"Unreadable skill matcher artifact {path}: {e}") from e
+    if payload.get("format") != ARTIFACT_FORMAT:
+        raise SkillDictionaryError(f"Unsupported skill matcher artifact format: {payload.get('format')!r}")
+    if payload.get("source_fingerprint") != source_fingerprint():
+        raise SkillDictionaryError("Skill matcher artifact is stale; run `manage.py compile_skill_dictionary`.")
+    return payload
+
+
+_dictionary: SkillDictionary | None = None
+_lock = threading.Lock()
+
+
+def get_skill_dictionary() -> SkillDictionary:
+    global _dictionary
+    if _dictionary is None:
+        with _lock:
+            if _dictionary is None:
+                try:
+                    payload = read_skill_dictionary_artifact()
+                except SkillDictionaryError as e:
+                    logger.warning("%s Compiling skill dictionary in memory.", e)
+                    payload = compile_skill_dictionary()
+                _dictionary = SkillDictionary(payload)
+                logger.info("Skill dictionary %s loaded (%d phrases).", _dictionary.version, len(_dictionary.phrases))
+    return _dictionary
+
+
+def load_skill_phrases() -> List[str]:
+    return get_skill_dictionary().phrases
+
+
+def skill_dictionary_version() -> str:
+    """Content-hash version of the dictionary; part of every extraction cache key."""
+    return get_skill_dictionary().version
@@ -0,0 +1,162 @@
+"""
+In-process skill registry: resolve skill names to ``Skill`` ids in bulk and
+create UserSkill / JobSkill / RoleSkill link rows in bulk.
+
+Replaces the per-skill ``Skill.objects.get_or_create`` helpers: a list of names
+costs at most one SELECT for unknown names, one INSERT for new skills and one
+INSERT for the link rows, instead of two round trips per skill.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import uuid
+from typing import Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete
+
+from ..signals import skills_created
+from .normalization import get_skill_normalizer
+
+logger = logging.getLogger(__name__)
+
+ResolvedSkill = Tuple[str, uuid.UUID]  # (canonical name, Skill.id)
+
+
+class SkillRegistry:
+    """Warm ``normalized_name -> (name, id)`` map in front of the Skill table."""
+
+    def __init__(self, max_entries: int = 50000) -> None:
+        self.max_entries = max_entries
+        self._ids: Dict[str, ResolvedSkill] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, raw_names: Iterable[str]) -> List[ResolvedSkill]:
+        """
+        Normalize ``raw_names`` and return (name, id) per distinct skill, in
+        input order, creating missing Skill rows.
+        """
+        return list(self._resolve_map(raw_names).values())
+
+    def _resolve_map(self, raw_names: Iterable[str]) -> Dict[str, ResolvedSkill]:
+        """normalized_name -> (name, id), ordered like the (de-duplicated) input."""
+        from apps.skills.models import Skill
+
+        wanted: Dict[str, str] = {}  # normalized_name -> canonical name, in order
+        for name in get_skill_normalizer().normalize_many(raw_names):
+            if name and name.lower() not in wanted:
+                wanted[name.lower()] = name
+
+        with self._lock:
+            found = {key: self._ids[key] for key in wanted if key in self._ids}
+        missing = [key for key in wanted if key not in found]
+        if missing:
+            for normalized, name, pk in Skill.objects.filter(normalized_name__in=missing).values_list('normalized_name', 'name', 'id'):
+                found[normalized] = (name, pk)
+            new_keys = [key for key in missing if key not in found]
+            if new_keys:
+                Skill.objects.bulk_create(
+                    [Skill(name=wanted[key], normalized_name=key) for key in new_keys],
+                    ignore_conflicts=True,
+                )
+                # ids are only trustworthy when read back (a concurrent writer may have won).
+                for normalized, name, pk in Skill.objects.filter(normalized_name__in=new_keys).values_list('normalized_name', 'name', 'id'):
+                    found[normalized] = (name, pk)
+                # A conflict on the unique name (same name stored under another
+                # normalized_name) inserts nothing: use the existing row.
+                by_name = {wanted[key]: key for key in new_keys if key not in found}
+                if by_name:
+                    for name, normalized, pk in Skill.objects.filter(name__in=list(by_name)).values_list('name', 'normalized_name', 'id'):
+                        logger.warning("Skill %r is stored as %r; resolving %r to it.", name, normalized, by_name[name])
+                        found[by_name[name]] = (name, pk)
+                created = [key for key in new_keys if key in found and wanted[key] not in by_name]
+                canonical = [(found[key][0], key) for key in created]
+                created_ids = [found[key][1] for key in created]
+                transaction.on_commit(lambda: self._learn_created(canonical, created_ids))
+            # Only after commit: ids from a rolled-back insert must not stay warm.
+            learned = {key: found[key] for key in missing if key in found}
+            transaction.on_commit(lambda: self._remember(learned))
+        return {key: found[key] for key in wanted if key in found}
+
+    @staticmethod
+    def _learn_created(canonical: List[Tuple[str, str]], created_ids: List[uuid.UUID]) -> None:
+        from apps.skills.models import Skill
+
+        normalizer = get_skill_normalizer()
+        for name, key in canonical:
+            normalizer.add_canonical(name, key)
+        skills_created.send(sender=Skill, skill_ids=created_ids)
+
+    def link_user_skills(self, user, raw_names: Iterable[str], source: str = 'document') -> List[ResolvedSkill]:
+        from apps.skills.models import UserSkill
+
+        resolved = self.resolve(raw_names)
+        UserSkill.objects.bulk_create(
+            [UserSkill(user=user, skill_id=pk, source=source) for _, pk in resolved],
+            ignore_conflicts=True,
+        )
+        return resolved
+
+    def link_job_skills(self, job_skill_names: Iterable[Tuple[object, Iterable[str]]]) -> int:
+        """``job_skill_names``: (job, skill names) pairs. All names resolve in one pass."""
+        from apps.jobs.models import JobSkill
+
+        pairs = [(job, list(names)) for job, names in job_skill_names]
+        resolved = self._resolve_map(n for _, names in pairs for n in names)
+        normalizer = get_skill_normalizer()
+        rows = []
+        for job, names in pairs:
+            seen = set()
+            for name in normalizer.normalize_many(names):
+                entry = resolved.get(name.lower())
+                if entry and entry[1] not in seen:
+                    seen.add(entry[1])
+                    rows.append(JobSkill(job=job, skill_id=entry[1]))
+        JobSkill.objects.bulk_create(rows, ignore_conflicts=True)
+        return len(rows)
+
+    def link_role_skills(self, role, raw_names: Iterable[str], importance_weight: float = 1.0) -> List[ResolvedSkill]:
+        from apps.roles.models import RoleSkill
+
+        from apps.roles.signals import role_skills_linked
+
+        resolved = self.resolve(raw_names)
+        RoleSkill.objects.bulk_create(
+            [RoleSkill(role=role, skill_id=pk, importance_weight=importance_weight) for _, pk in resolved],
+            ignore_conflicts=True,
+        )
+        role_skills_linked.send(sender=RoleSkill, role_ids=[role.id])
+        return resolved
+
+    def forget(self, normalized_name: str) -> None:
+        with self._lock:
+            self._ids.pop(normalized_name, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids.clear()
+
+    def _remember(self, entries: Dict[str, ResolvedSkill]) -> None:
+        with self._lock:
+            if len(self._ids) + len(entries) > self.max_entries:
+                self._ids.clear()
+            self._ids.update(entries)
+
+
+_registry: SkillRegistry | None = None
+
+
+def get_skill_registry() -> SkillRegistry:
+    global _registry
+    if _registry is None:
+        _registry = SkillRegistry(settings.SKILL_EXTRACTION_CONFIG.get('REGISTRY_MAX_ENTRIES', 50000))
+    return _registry
+
+
+def _forget_deleted_skill(sender, instance, **kwargs):
+    get_skill_registry().forget(instance.normalized_name)
+
+
+post_delete.connect(_forget_deleted_skill, sender='skills.Skill', dispatch_uid='skill_registry_forget')
@@ -0,0 +1,6 @@
+"""Skill app signals."""
+from django.dispatch import Signal
+
+# Sent after commit with ``skill_ids`` for Skill rows created in bulk (bulk_create
+# sends no post_save), e.g. by SkillRegistry.
+skills_created = Signal()
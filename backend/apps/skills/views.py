@@ -6,15 +6,9 @@ from rest_framework.response import Response
 from django.db import transaction
 
 from apps.documents.models import Document
-from .models import Skill, UserSkill
-from .serializers import SkillSerializer, UserSkillSerializer
-from .services import extract_skills, normalize_skill
-
-
-def get_or_create_skill(name: str):
-    nm = normalize_skill(name)
-    skill, _ = Skill.objects.get_or_create(normalized_name=nm.lower(), defaults={'name': nm})
-    return skill
+from .models import UserSkill
+from .serializers import UserSkillSerializer
+from .services import extract_skills, get_skill_registry
 
 
 @api_view(['POST'])
@@ -22,7 +16,7 @@ def get_or_create_skill(name: str):
 def extract_from_document(request):
     """Extract skills from a parsed document and persist UserSkills."""
     doc_id = request.data.get('document_id')
-    use_llm = request.data.get('use_llm', False)
+    use_llm = request.data.get('use_llm', True)
 
     if doc_id:
         doc = Document.objects.filter(user=request.user, id=doc_id).first()
@@ -34,15 +28,8 @@ def extract_from_document(request):
         return Response({'detail': 'No parsed document text available'}, status=status.HTTP_400_BAD_REQUEST)
 
     skills = extract_skills(doc.extracted_text, use_llm=use_llm)
-    created = []
     with transaction.atomic():
-        for s in skills:
-            skill = get_or_create_skill(s)
-            us, created_flag = UserSkill.objects.get_or_create(
-                user=request.user, skill=skill, defaults={'source': 'document'}
-            )
-            if created_flag:
-                created.append(us)
+        get_skill_registry().link_user_skills(request.user, skills, source='document')
     return Response({
         'extracted': skills,
         'user_skills': UserSkillSerializer(UserSkill.objects.filter(user=request.user), many=True).data,
@@ -58,10 +45,11 @@ def user_skills(request):
     skill_name = request.data.get('name')
     if not skill_name:
         return Response({'detail': 'name required'}, status=status.HTTP_400_BAD_REQUEST)
-    skill = get_or_create_skill(skill_name)
-    us, _ = UserSkill.objects.get_or_create(
-        user=request.user, skill=skill, defaults={'source': 'manual'}
-    )
+    resolved = get_skill_registry().link_user_skills(request.user, [skill_name], source='manual')
+    if not resolved:
+        return Response({'detail': 'name required'}, status=status.HTTP_400_BAD_REQUEST)
+    _, skill_id = resolved[0]
+    us = UserSkill.objects.select_related('skill').get(user=request.user, skill_id=skill_id)
     return Response(UserSkillSerializer(us).data, status=status.HTTP_201_CREATED)
 
 
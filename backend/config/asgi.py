@@ -5,3 +5,8 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 application = get_asgi_application()
+
+# Opt-in (WARMUP_CONFIG['ON_BOOT']): load models and indexes before taking traffic.
+from core.services.warmup import start_warm_up  # noqa: E402
+
+start_warm_up()
@@ -161,12 +161,96 @@ SUPABASE_KEY = env("SUPABASE_KEY")
 EMBEDDING_CONFIG = {
     'MODEL_NAME': 'all-MiniLM-L6-v2',
     'DIMENSION': 384,
+    # encode() cache: per-worker LRU + memory-mapped store shared by workers
+    'CACHE_MEMORY_ENTRIES': 10000,
+    'CACHE_PERSISTENT': env.bool('EMBEDDING_CACHE_PERSISTENT', default=True),
+    'CACHE_DIR': env('EMBEDDING_CACHE_DIR', default=str(BASE_DIR / 'data' / 'embedding_cache')),
+    'CACHE_MAX_DISK_ROWS': 1_000_000,
+    # Query vectors pooled from stored SkillEmbedding vectors: 'mean' or
+    # 'weighted' (by each skill's average RoleSkill importance)
+    'QUERY_POOLING': env('EMBEDDING_QUERY_POOLING', default='mean'),
+    # Embed skills when they are created (otherwise on first use / embed_skills)
+    'EMBED_NEW_SKILLS': True,
+    # SkillEmbedding / RoleEmbedding.vector byte format: 'float32' or 'float16'
+    # (half the size; rows in either format load, so it can change at any time)
+    'VECTOR_STORAGE_DTYPE': env('EMBEDDING_VECTOR_DTYPE', default='float32'),
+    # Micro-batching: concurrent small encode() calls share one forward pass,
+    # gathered for up to BATCH_MAX_WAIT_MS or BATCH_MAX_ITEMS texts
+    'BATCHING': env.bool('EMBEDDING_BATCHING', default=True),
+    'BATCH_MAX_ITEMS': 64,
+    'BATCH_MAX_WAIT_MS': 5.0,
+    # 'torch' (SentenceTransformer) or 'onnx' (ONNX Runtime graph written by
+    # `manage.py export_embedding_onnx`; compare with benchmark_embedding_backends)
+    'BACKEND': env('EMBEDDING_BACKEND', default='torch'),
+    'ONNX_DIR': env('EMBEDDING_ONNX_DIR', default=''),  # default: data/onnx/<MODEL_NAME>
+    'ONNX_QUANTIZED': env.bool('EMBEDDING_ONNX_QUANTIZED', default=False),  # int8 dynamic quantization
+    'ONNX_THREADS': env.int('EMBEDDING_ONNX_THREADS', default=0) or None,  # default: cores per web worker
+}
+
+# Role / job vector indexes (core.services.vector_store). FACTORY is a FAISS
+# index-factory string: 'Flat' (exact), 'HNSW32', 'IVF{nlist},PQ48',
+# 'IVF{nlist},SQ8', 'SQ8'; {nlist} is sized from the vector count. Rebuild the
+# indexes after changing it. SEARCH_PARAMS apply where the index type has them.
+VECTOR_INDEX_CONFIG = {
+    'FACTORY': env('VECTOR_INDEX_FACTORY', default='Flat'),
+    'SEARCH_PARAMS': {'nprobe': 16, 'efSearch': 64},
+    # Per-index overrides by name ('roles': DB roles, 'csv_roles': CSV roles),
+    # e.g. {'roles': {'FACTORY': 'HNSW32', 'SEARCH_PARAMS': {'efSearch': 128}}}
+    'INDEXES': {},
+    # Re-embed and update the 'roles' index in place when Role / RoleSkill rows
+    # change; rebuild it from stored vectors once removed (tombstoned) rows
+    # exceed this share. `manage.py check_role_index` checks it against the DB.
+    'AUTO_UPDATE': env.bool('ROLE_INDEX_AUTO_UPDATE', default=True),
+    # Run those updates in a background thread after the commit (False: inline).
+    'SYNC_IN_BACKGROUND': env.bool('ROLE_INDEX_SYNC_IN_BACKGROUND', default=True),
+    'COMPACT_TOMBSTONE_RATIO': 0.2,
+    'MAINTENANCE_INTERVAL_HOURS': 24,
+    # Saved indexes are published as versioned snapshots; workers check for a
+    # new version at most this often (seconds, negative: never) and swap it in.
+    'RELOAD_INTERVAL_SECONDS': 5.0,
+    'KEEP_SNAPSHOTS': 3,
+    # mmap snapshots read-only, so all workers on a host share one page-cache copy.
+    'MMAP': env.bool('VECTOR_INDEX_MMAP', default=True),
+    # Filtered searches (role attribute filters) matching at most this many rows
+    # are scored exactly; larger selections search the index with an ID selector.
+    'FILTER_EXACT_MAX_ROWS': 4096,
+}
+
+# Role re-ranking (apps.roles.services.ranking)
+RANKING_CONFIG = {
+    # The TF-IDF model over all roles' skills is refitted in the background when
+    # RoleSkill rows changed; workers check at most this often (negative: never).
+    'TFIDF_REFRESH_SECONDS': 300,
+}
+
+# Shared inference server (`manage.py run_inference_server`): one process per
+# host holds the embedding model and skill matcher and batches requests from
+# every web worker over a Unix socket. Empty SOCKET: inference runs in-process.
+INFERENCE_SERVER_CONFIG = {
+    'SOCKET': env('INFERENCE_SOCKET', default=''),
+    'TIMEOUT_SECONDS': 30.0,
+    # After a failed connect, stay on the fallback this long before retrying.
+    'RETRY_SECONDS': 5.0,
+    # While the server is down: load models in the worker (True) or raise
+    # InferenceUnavailable (False).
+    'FALLBACK_LOCAL': env.bool('INFERENCE_FALLBACK_LOCAL', default=True),
+}
+
+# Worker warm-up (core.services.warmup); readiness at /api/health/ready
+WARMUP_CONFIG = {
+    'ON_BOOT': env.bool('WARMUP_ON_BOOT', default=False),
+    # Background: the worker serves immediately and reports 503 until warm.
+    'BACKGROUND': env.bool('WARMUP_BACKGROUND', default=True),
+    # Empty means all of core.services.warmup.COMPONENTS.
+    'COMPONENTS': env.list('WARMUP_COMPONENTS', default=[]),
 }
 
 ADZUNA_CONFIG = {
     'APP_ID': env('ADZUNA_APP_ID'),
     'API_KEY': env('ADZUNA_API_KEY'),
     'BASE_URL': 'https://api.adzuna.com/v1/api/jobs',
+    # Add Groq (batched, several postings per prompt) to rule-based skill extraction
+    'EXTRACT_WITH_LLM': env.bool('ADZUNA_EXTRACT_WITH_LLM', default=True),
 }
 
 # GOOGLE_API_KEY = env("GOOGLE_API_KEY")
@@ -178,4 +262,41 @@ GROQ_API_KEY = env("GROQ_API_KEY")
 
 GROQ_CONFIG = {
     "API_KEY": GROQ_API_KEY,
-}
\ No newline at end of file
+    "MODEL": "llama-3.3-70b-versatile",
+}
+
+SKILL_EXTRACTION_CONFIG = {
+    # Rule-based matcher: 'spacy' (PhraseMatcher, needs en_core_web_sm) or
+    # 'aho_corasick' (pure Python, no model load)
+    'MATCH_ENGINE': env('SKILL_MATCH_ENGINE', default='spacy'),
+    # SkillTool.run result cache: in-process LRU + ExtractionCacheEntry table
+    'CACHE_MAX_ENTRIES': 256,
+    'CACHE_PERSISTENT': True,
+    # Table tier bounds: rows older than the TTL go first, then the oldest past
+    # the row cap. Pruned every CACHE_PRUNE_EVERY_WRITES writes per worker and
+    # by `manage.py prune_extraction_cache` (0 / None disables a bound).
+    'CACHE_PERSISTENT_TTL_DAYS': 30,
+    'CACHE_PERSISTENT_MAX_ROWS': 100_000,
+    'CACHE_PRUNE_EVERY_WRITES': 500,
+    # Groq runs concurrently with the spaCy matcher; past the deadline the
+    # rule-based result is returned alone.
+    'LLM_DEADLINE_SECONDS': 20.0,
+    'LLM_MAX_WORKERS': 4,
+    # Opt-in: resumes estimated above the budget are split on section/paragraph
+    # boundaries and the chunks sent to Groq concurrently (one prompt per chunk;
+    # skills from chunks that fail are missing and the result is not cached).
+    'LLM_CHUNKING': env.bool('SKILL_LLM_CHUNKING', default=False),
+    'LLM_CHUNK_TOKEN_BUDGET': 1500,
+    'LLM_CHUNK_CONCURRENCY': 4,
+    'LLM_CHARS_PER_TOKEN': 4.0,
+    # Bulk extraction (extract_skills_batch with use_llm) packs several
+    # documents into one Groq prompt under these limits.
+    'LLM_BATCH_TOKEN_BUDGET': 6000,
+    'LLM_BATCH_MAX_DOCS': 20,
+    # normalize_skill: aliases + canonical Skill names + trigram fuzzy match
+    'NORMALIZER_FUZZY_THRESHOLD': 0.85,
+    'NORMALIZER_CACHE_SIZE': 4096,
+    'NORMALIZER_REFRESH_SECONDS': 300,
+    # Warm normalized_name -> Skill id map used for bulk skill linking.
+    'REGISTRY_MAX_ENTRIES': 50000,
+}
@@ -2,8 +2,12 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from core.views import health_metrics, health_ready
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/health/ready', health_ready, name='health-ready'),
+    path('api/health/metrics', health_metrics, name='health-metrics'),
     path('api/auth/', include('apps.accounts.urls')),
     path('api/documents/', include('apps.documents.urls')),
     path('api/skills/', include('apps.skills.urls')),
@@ -5,3 +5,8 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 application = get_wsgi_application()
+
+# Opt-in (WARMUP_CONFIG['ON_BOOT']): load models and indexes before taking traffic.
+from core.services.warmup import start_warm_up  # noqa: E402
+
+start_warm_up()
@@ -0,0 +1,121 @@
+"""
+Per-attribute row bitmaps for filtered vector search.
+
+For every (attribute, value) pair the rows with that value are precomputed as
+a packed bitmap (bit i = row i, little-endian bit order, as FAISS's
+``IDSelectorBitmap`` reads it). A filter ``{attribute: value or [values]}``
+ORs the bitmaps of its values and ANDs across attributes; the result
+restricts the FAISS search itself (``VectorStore.search(..., bitmap=...)``),
+so the top k are taken among matching rows instead of post-filtering an
+unfiltered top k that may contain none of them.
+
+Saved next to the index as ``<name>.json`` (the values of each attribute) and
+``<name>.npy`` (one bitmap per value, mmapped on load).
+"""
+import json
+import re
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Sequence, Union
+
+import numpy as np
+
+Filters = Mapping[str, Union[str, Sequence[str]]]
+Extractor = Callable[[Mapping], Iterable[str]]
+
+_SPACES = re.compile(r"\s+")
+_DASHES = str.maketrans({"–": "-", "—": "-"})
+
+
+class FilterError(ValueError):
+    """Filter on an attribute that is not indexed."""
+    pass
+
+
+def normalize_value(value) -> str:
+    """Case-, dash- and whitespace-insensitive form; also repairs UTF-8 text decoded as latin-1."""
+    text = "" if value is None else str(value)
+    try:
+        text = text.encode("latin-1").decode("utf-8")
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        pass
+    return _SPACES.sub(" ", text.translate(_DASHES)).strip().lower()
+
+
+def popcount(bitmap: np.ndarray) -> int:
+    return int(np.unpackbits(bitmap).sum())
+
+
+class AttributeBitmaps:
+    """Value -> row bitmap for each attribute of an index's rows."""
+
+    def __init__(self, n_rows: int, values: Dict[str, List[str]], bitmaps: np.ndarray) -> None:
+        self.n_rows = n_rows
+        self._values = values
+        self._bitmaps = bitmaps
+        self._positions: Dict[str, Dict[str, int]] = {}
+        position = 0
+        for attribute, names in values.items():
+            self._positions[attribute] = {name: position + i for i, name in enumerate(names)}
+            position += len(names)
+
+    @classmethod
+    def build(cls, rows: Sequence[Mapping], extractors: Mapping[str, Extractor]) -> "AttributeBitmaps":
+        values: Dict[str, List[str]] = {}
+        packed = []
+        for attribute, extract in extractors.items():
+            members: Dict[str, List[int]] = {}
+            for i, row in enumerate(rows):
+                for value in extract(row):
+                    value = normalize_value(value)
+                    if value:
+                        members.setdefault(value, []).append(i)
+            values[attribute] = sorted(members)
+            for value in values[attribute]:
+                bits = np.zeros(len(rows), dtype=bool)
+                bits[members[value]] = True
+                packed.append(np.packbits(bits, bitorder="little"))
+        width = (len(rows) + 7) // 8
+        bitmaps = np.stack(packed) if packed else np.zeros((0, width), dtype=np.uint8)
+        return cls(len(rows), values, bitmaps)
+
+    @staticmethod
+    def exists(directory: Path, name: str) -> bool:
+        return (Path(directory) / f"{name}.json").exists()
+
+    def save(self, directory: Path, name: str) -> None:
+        directory = Path(directory)
+        np.save(directory / f"{name}.npy", self._bitmaps)
+        with open(directory / f"{name}.json", "w", encoding="utf-8") as f:
+            json.dump({"rows": self.n_rows, "values": self._values}, f)
+
+    @classmethod
+    def load(cls, directory: Path, name: str) -> "AttributeBitmaps":
+        directory = Path(directory)
+        with open(directory / f"{name}.json", encoding="utf-8") as f:
+            header = json.load(f)
+        bitmaps = np.load(directory / f"{name}.npy", mmap_mode="r")
+        return cls(header["rows"], header["values"], bitmaps)
+
+    @property
+    def attributes(self) -> List[str]:
+        return list(self._values)
+
+    def values(self, attribute: str) -> List[str]:
+        if attribute not in self._values:
+            raise FilterError(f"Unknown filter attribute {attribute!r} (expected one of {self.attributes})")
+        return list(self._values[attribute])
+
+    def select(self, filters: Filters) -> np.ndarray:
+        """Packed bitmap of the rows matching every attribute of ``filters`` (any of its values)."""
+        selected = np.full((self.n_rows + 7) // 8, 0xFF, dtype=np.uint8)
+        if self.n_rows % 8:
+            selected[-1] = (1 << (self.n_rows % 8)) - 1
+        for attribute, wanted in filters.items():
+            positions = self._positions.get(attribute)
+            if positions is None:
+                raise FilterError(f"Unknown filter attribute {attribute!r} (expected one of {self.attributes})")
+            wanted = [wanted] if isinstance(wanted, str) else list(wanted)
+            rows = [positions[v] for v in map(normalize_value, wanted) if v in positions]
+            matches = np.bitwise_or.reduce(self._bitmaps[rows], axis=0) if rows else 0
+            selected &= matches
+        return selected
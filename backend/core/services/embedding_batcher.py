@@ -0,0 +1,173 @@
+"""
+Dynamic micro-batching for sentence-transformer inference.
+
+Request threads that call ``encode`` with a few strings each enqueue them
+here; one worker thread gathers requests for up to ``max_wait_ms`` or
+``max_batch_items`` texts, runs a single pass per group (the normalize flag
+for embeddings, the engine for skill matching on the inference server) and
+hands every caller back its own rows.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional
+
+from django.conf import settings
+
+RunBatch = Callable[[List[str], Any], Any]  # (texts, group) -> one row per text
+
+
+class _Request:
+    __slots__ = ("texts", "group", "future", "enqueued_at")
+
+    def __init__(self, texts: List[str], group: Hashable) -> None:
+        self.texts = texts
+        self.group = group
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatcher:
+    def __init__(self, run_batch: RunBatch, max_batch_items: int = 64, max_wait_ms: float = 5.0) -> None:
+        self.run_batch = run_batch
+        self.max_batch_items = max_batch_items
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: Deque[_Request] = deque()
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._metrics = {
+            "requests": 0, "items": 0, "batches": 0, "forward_passes": 0,
+            "max_queue_depth": 0, "largest_batch_items": 0,
+            "total_wait_ms": 0.0, "max_wait_ms": 0.0, "total_forward_ms": 0.0,
+        }
+
+    def submit(self, texts: List[str], group: Hashable) -> Any:
+        """Blocking: rows for ``texts`` from a pass shared with other requests of ``group``."""
+        request = _Request(list(texts), group)
+        with self._cond:
+            self._ensure_worker()
+            self._queue.append(request)
+            self._metrics["requests"] += 1
+            self._metrics["max_queue_depth"] = max(self._metrics["max_queue_depth"], len(self._queue))
+            self._cond.notify()
+        return request.future.result()
+
+    def metrics(self) -> Dict[str, float]:
+        with self._cond:
+            m = dict(self._metrics)
+            m["queue_depth"] = len(self._queue)
+        batches = m["batches"] or 1
+        m["avg_batch_items"] = round(m["items"] / batches, 2)
+        m["avg_wait_ms"] = round(m["total_wait_ms"] / max(m["requests"], 1), 3)
+        m["avg_forward_ms"] = round(m["total_forward_ms"] / max(m["forward_passes"], 1), 3)
+        for key in ("total_wait_ms", "max_wait_ms", "total_forward_ms"):
+            m[key] = round(m[key], 3)
+        m["max_batch_items_setting"] = self.max_batch_items
+        m["max_wait_ms_setting"] = self.max_wait * 1000.0
+        return m
+
+    def _ensure_worker(self) -> None:
+        """Caller holds ``_cond``. Restarts the worker after a fork, where threads don't survive."""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+            self._worker.start()
+
+    def _collect(self) -> List[_Request]:
+        """Wait for a first request, then gather more until the item cap or the deadline."""
+        with self._cond:
+            while not self._queue:
+                self._cond.wait()
+            batch = [self._queue.popleft()]
+            items = len(batch[0].texts)
+            deadline = batch[0].enqueued_at + self.max_wait
+            while items < self.max_batch_items:
+                if not self._queue:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                    continue
+                if items + len(self._queue[0].texts) > self.max_batch_items:
+                    break
+                request = self._queue.popleft()
+                batch.append(request)
+                items += len(request.texts)
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            try:
+                self._run_batch(batch)
+            except Exception as e:
+                # The worker must outlive any failure: callers block on these futures.
+                _fail(batch, e)
+
+    def _run_batch(self, batch: List[_Request]) -> None:
+        started = time.perf_counter()
+        groups: Dict[Hashable, List[_Request]] = {}
+        for request in batch:
+            groups.setdefault(request.group, []).append(request)
+        for group, requests in groups.items():
+            self._run_group(requests, group)
+        with self._cond:
+            m = self._metrics
+            m["batches"] += 1
+            m["items"] += sum(len(r.texts) for r in batch)
+            m["largest_batch_items"] = max(m["largest_batch_items"], sum(len(r.texts) for r in batch))
+            for request in batch:
+                waited = (started - request.enqueued_at) * 1000.0
+                m["total_wait_ms"] += waited
+                m["max_wait_ms"] = max(m["max_wait_ms"], waited)
+
+    def _run_group(self, requests: List[_Request], group: Hashable) -> None:
+        texts = [t for r in requests for t in r.texts]
+        started = time.perf_counter()
+        try:
+            rows = self.run_batch(texts, group)
+            if len(rows) != len(texts):
+                raise RuntimeError(f"run_batch returned {len(rows)} rows for {len(texts)} texts")
+            offset = 0
+            for request in requests:
+                if not request.future.done():
+                    request.future.set_result(rows[offset:offset + len(request.texts)])
+                offset += len(request.texts)
+        except Exception as e:
+            _fail(requests, e)
+        finally:
+            with self._cond:
+                self._metrics["forward_passes"] += 1
+                self._metrics["total_forward_ms"] += (time.perf_counter() - started) * 1000.0
+
+
+def _fail(requests: List[_Request], error: Exception) -> None:
+    """Hand ``error`` to every request still waiting."""
+    for request in requests:
+        if not request.future.done():
+            request.future.set_exception(error)
+
+
+_batcher: Optional[MicroBatcher] = None
+_batcher_lock = threading.Lock()
+
+
+def get_embedding_batcher(run_batch: RunBatch) -> Optional[MicroBatcher]:
+    """Shared batcher, or None when EMBEDDING_CONFIG['BATCHING'] is off."""
+    global _batcher
+    cfg = settings.EMBEDDING_CONFIG
+    if not cfg.get('BATCHING', True):
+        return None
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = MicroBatcher(
+                    run_batch,
+                    max_batch_items=cfg.get('BATCH_MAX_ITEMS', 64),
+                    max_wait_ms=cfg.get('BATCH_MAX_WAIT_MS', 5.0),
+                )
+    return _batcher
+
+
+def batcher_metrics() -> Dict[str, float]:
+    return _batcher.metrics() if _batcher is not None else {}
@@ -0,0 +1,262 @@
+"""
+Two-tier cache for sentence-transformer vectors.
+
+- a bounded in-process LRU (per worker)
+- an append-only disk store shared by all workers on the host: a float32
+  matrix (``vectors.f32``, read through ``np.memmap``) plus a parallel file of
+  16-byte key digests (``keys.bin``) whose record ``i`` names matrix row ``i``
+
+Keys hash (model name, normalize flag, text). Writers append under an
+exclusive ``flock``, vectors first and keys second, so a key visible to a
+reader always has its row on disk. Readers pick up rows written by other
+workers by tailing ``keys.bin`` on a miss.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX: single-process use only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+KEY_BYTES = 16
+_SLUG_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def make_embedding_key(text: str, model_name: str, normalize: bool) -> bytes:
+    digest = hashlib.blake2b(digest_size=KEY_BYTES)
+    for part in (model_name, "1" if normalize else "0", text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.digest()
+
+
+class DiskEmbeddingStore:
+    """Append-only memory-mapped vector store for one model / dimension."""
+
+    def __init__(self, directory: Path, model_name: str, dimension: int, max_rows: int = 1_000_000) -> None:
+        self.directory = Path(directory) / _SLUG_RE.sub("_", model_name)
+        self.dimension = dimension
+        self.max_rows = max_rows
+        self.vectors_path = self.directory / "vectors.f32"
+        self.keys_path = self.directory / "keys.bin"
+        self._lock_path = self.directory / ".lock"
+        self._rows: Dict[bytes, int] = {}
+        self._keys_offset = 0
+        self._matrix: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        self._full_logged = False
+        self._prepare(model_name)
+
+    def _prepare(self, model_name: str) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        meta_path = self.directory / "meta.json"
+        meta = {"model": model_name, "dimension": self.dimension, "dtype": "float32"}
+        with self._file_lock():
+            if meta_path.exists():
+                existing = json.loads(meta_path.read_text())
+                if existing != meta:
+                    logger.warning("Embedding cache %s was built for %s; resetting it.", self.directory, existing)
+                    for path in (self.vectors_path, self.keys_path):
+                        path.unlink(missing_ok=True)
+            meta_path.write_text(json.dumps(meta))
+            self.vectors_path.touch()
+            self.keys_path.touch()
+
+    def _file_lock(self):
+        return _FileLock(self._lock_path)
+
+    def _refresh(self) -> None:
+        """Index keys appended (by any process) since the last refresh. Caller holds ``_lock``."""
+        size = self.keys_path.stat().st_size
+        if size <= self._keys_offset:
+            return
+        with open(self.keys_path, "rb") as f:
+            f.seek(self._keys_offset)
+            data = f.read(size - self._keys_offset)
+        whole = len(data) - len(data) % KEY_BYTES  # ignore a record still being written
+        first_row = self._keys_offset // KEY_BYTES
+        for i in range(0, whole, KEY_BYTES):
+            self._rows.setdefault(data[i:i + KEY_BYTES], first_row + i // KEY_BYTES)
+        self._keys_offset += whole
+
+    def _row_matrix(self, needed_rows: int) -> np.memmap:
+        if self._matrix is None or self._matrix.shape[0] < needed_rows:
+            rows = os.path.getsize(self.vectors_path) // (4 * self.dimension)
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dimension))
+        return self._matrix
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, np.ndarray]:
+        keys = list(keys)
+        with self._lock:
+            if any(k not in self._rows for k in keys):
+                self._refresh()
+            rows = {k: self._rows[k] for k in keys if k in self._rows}
+            if not rows:
+                return {}
+            matrix = self._row_matrix(max(rows.values()) + 1)
+            return {k: np.array(matrix[row]) for k, row in rows.items()}
+
+    def put_many(self, items: Dict[bytes, np.ndarray]) -> None:
+        if not items:
+            return
+        with self._lock, self._file_lock():
+            self._refresh()
+            new = [(k, v) for k, v in items.items() if k not in self._rows]
+            room = self.max_rows - len(self._rows)
+            if len(new) > room:
+                if not self._full_logged:
+                    logger.warning("Embedding cache %s is full (%d rows); not persisting more.", self.directory, self.max_rows)
+                    self._full_logged = True
+                new = new[:max(room, 0)]
+            if not new:
+                return
+            # keys.bin defines the row count; drop bytes a crashed writer left past it.
+            first_row = self._keys_offset // KEY_BYTES
+            for path, size in ((self.keys_path, self._keys_offset), (self.vectors_path, first_row * 4 * self.dimension)):
+                if os.path.getsize(path) > size:
+                    os.truncate(path, size)
+            block = np.ascontiguousarray(np.stack([v for _, v in new]), dtype=np.float32)
+            with open(self.vectors_path, "ab") as f:
+                f.write(block.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            with open(self.keys_path, "ab") as f:
+                f.write(b"".join(k for k, _ in new))
+            # Our own rows are indexed by the next refresh; record them now to skip a read.
+            for i, (k, _) in enumerate(new):
+                self._rows[k] = first_row + i
+            self._keys_offset += len(new) * KEY_BYTES
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._rows)
+
+
+class _FileLock:
+    """Exclusive ``flock`` on a lock file; a no-op where fcntl is unavailable."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+class EmbeddingCache:
+    """Memory LRU in front of the optional disk store, with hit/miss counters."""
+
+    def __init__(self, max_entries: int = 10000, disk: Optional[DiskEmbeddingStore] = None) -> None:
+        self.max_entries = max_entries
+        self.disk = disk
+        self._entries: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        found: Dict[bytes, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = vector
+            self._stats["memory_hits"] += len(found)
+        missing = [k for k in keys if k not in found]
+        if missing and self.disk is not None:
+            try:
+                from_disk = self.disk.get_many(missing)
+            except Exception as e:
+                # A cache outage must never break encoding itself.
+                logger.warning("Embedding cache read failed: %s", e)
+                from_disk = {}
+            self._remember(from_disk)
+            found.update(from_disk)
+            with self._lock:
+                self._stats["disk_hits"] += len(from_disk)
+        with self._lock:
+            self._stats["misses"] += len(keys) - len(found)
+        return found
+
+    def set_many(self, items: Dict[bytes, np.ndarray]) -> None:
+        self._remember(items)
+        if self.disk is not None:
+            try:
+                self.disk.put_many(items)
+            except Exception as e:
+                logger.warning("Embedding cache write failed: %s", e)
+
+    def clear(self) -> None:
+        """Drop the in-process tier (the disk store is left untouched)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        stats["hits"] = stats["memory_hits"] + stats["disk_hits"]
+        return stats
+
+    def _remember(self, items: Dict[bytes, np.ndarray]) -> None:
+        if self.max_entries <= 0 or not items:
+            return
+        with self._lock:
+            for key, vector in items.items():
+                vector.setflags(write=False)  # shared between callers
+                self._entries[key] = vector
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_embedding_cache: EmbeddingCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _embedding_cache
+    if _embedding_cache is None:
+        from core.services.embedding_service import embedding_model_id
+
+        with _cache_lock:
+            if _embedding_cache is None:
+                cfg = settings.EMBEDDING_CONFIG
+                disk = None
+                if cfg.get('CACHE_PERSISTENT', True):
+                    try:
+                        disk = DiskEmbeddingStore(
+                            cfg.get('CACHE_DIR', Path(settings.BASE_DIR) / 'data' / 'embedding_cache'),
+                            embedding_model_id(),
+                            cfg.get('DIMENSION', 384),
+                            max_rows=cfg.get('CACHE_MAX_DISK_ROWS', 1_000_000),
+                        )
+                    except OSError as e:
+                        logger.warning("Embedding disk cache unavailable, using memory only: %s", e)
+                _embedding_cache = EmbeddingCache(cfg.get('CACHE_MEMORY_ENTRIES', 10000), disk)
+    return _embedding_cache
@@ -1,23 +1,105 @@
 """Embedding service using Sentence Transformers. Caches model and vectors."""
+from __future__ import annotations
+
 import logging
-from typing import List, Union
+from pathlib import Path
+from typing import List, Optional, Union
 
 import numpy as np
 from django.conf import settings
 
+from core.services.embedding_batcher import get_embedding_batcher
+from core.services.embedding_cache import get_embedding_cache, make_embedding_key
+from core.services.inference_client import InferenceUnavailable, get_inference_client
+
 logger = logging.getLogger(__name__)
 
 _model = None
+_model_backend: Optional[str] = None
+_onnx_ok: Optional[bool] = None
+
+
+BACKENDS = ('torch', 'onnx')
+
+
+def embedding_backend() -> str:
+    backend = settings.EMBEDDING_CONFIG.get('BACKEND', 'torch')
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend {backend!r} (expected one of {BACKENDS})")
+    return backend
+
+
+def _variant_id(backend: str) -> str:
+    cfg = settings.EMBEDDING_CONFIG
+    name = cfg.get('MODEL_NAME', 'all-MiniLM-L6-v2')
+    if backend == 'onnx':
+        return f"{name}+onnx{'-int8' if cfg.get('ONNX_QUANTIZED') else ''}"
+    return name
+
+
+def _onnx_loadable() -> bool:
+    """Whether the ONNX backend would load (its packages and exported files exist), without loading it."""
+    global _onnx_ok
+    if _onnx_ok is None:
+        from importlib.util import find_spec
+
+        from core.services.onnx_embedder import EXPORT_META_FILE, MODEL_FILE, QUANTIZED_MODEL_FILE
+        model_file = QUANTIZED_MODEL_FILE if settings.EMBEDDING_CONFIG.get('ONNX_QUANTIZED') else MODEL_FILE
+        _onnx_ok = (
+            all(find_spec(pkg) is not None for pkg in ('onnxruntime', 'tokenizers'))
+            and (onnx_model_dir() / model_file).exists()
+            and (onnx_model_dir() / EXPORT_META_FILE).exists()
+        )
+    return _onnx_ok
+
+
+def effective_backend() -> str:
+    """The backend that loaded, or will load: the configured one, or torch when ONNX is unavailable."""
+    if _model is not None:
+        return _model_backend
+    backend = embedding_backend()
+    if backend == 'onnx' and not _onnx_loadable():
+        return 'torch'
+    return backend
+
+
+def embedding_model_id() -> str:
+    """Model name plus the variant of the backend actually used; keys the vector cache so backends never mix."""
+    return _variant_id(effective_backend())
+
+
+def onnx_model_dir() -> Path:
+    cfg = settings.EMBEDDING_CONFIG
+    name = cfg.get('MODEL_NAME', 'all-MiniLM-L6-v2')
+    return Path(cfg.get('ONNX_DIR') or Path(settings.BASE_DIR) / 'data' / 'onnx' / name.replace('/', '_'))
+
+
+def load_backend(backend: str, quantized: bool = False, threads: int | None = None):
+    """Instantiate a backend; both expose SentenceTransformer's ``encode``."""
+    if backend == 'onnx':
+        from core.services.onnx_embedder import OnnxSentenceEncoder
+        return OnnxSentenceEncoder(onnx_model_dir(), quantized=quantized, threads=threads)
+    from sentence_transformers import SentenceTransformer
+    # Force CPU to avoid meta device issues on some environments
+    return SentenceTransformer(settings.EMBEDDING_CONFIG.get('MODEL_NAME', 'all-MiniLM-L6-v2'), device="cpu")
 
 
 def _get_model():
-    global _model
+    global _model, _model_backend
     if _model is None:
-        from sentence_transformers import SentenceTransformer
-        name = settings.EMBEDDING_CONFIG.get('MODEL_NAME', 'all-MiniLM-L6-v2')
+        cfg = settings.EMBEDDING_CONFIG
+        if effective_backend() == 'onnx':
+            try:
+                _model = load_backend('onnx', quantized=cfg.get('ONNX_QUANTIZED', False), threads=cfg.get('ONNX_THREADS'))
+                _model_backend = 'onnx'
+                return _model
+            except (ImportError, FileNotFoundError) as e:
+                logger.error("ONNX embedding backend unavailable (%s); falling back to PyTorch.", e)
+        elif embedding_backend() == 'onnx':
+            logger.error("ONNX embedding backend unavailable (not exported or onnxruntime missing); falling back to PyTorch.")
         try:
-            # Force CPU to avoid meta device issues on some environments
-            _model = SentenceTransformer(name, device="cpu")
+            _model = load_backend('torch')
+            _model_backend = 'torch'
         except NotImplementedError:
             # Meta tensor / device errors: fail gracefully and log
             logger.exception("Failed to initialize SentenceTransformer model; falling back to zero embeddings.")
@@ -25,32 +107,84 @@ def _get_model():
     return _model
 
 
+def _forward(texts: List[str], normalize: bool) -> np.ndarray:
+    """One model forward pass; always returns a 2-D float32 array."""
+    vectors = _get_model().encode(
+        texts,
+        convert_to_numpy=True,
+        normalize_embeddings=normalize,
+    )
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = np.expand_dims(vectors, 0)
+    return vectors
+
+
+def infer_local(texts: List[str], normalize: bool) -> Optional[np.ndarray]:
+    """
+    Vectors from this process's model, or None if it failed to load.
+
+    Small requests share forward passes with concurrent callers; large ones run directly.
+    """
+    if _get_model() is None:
+        return None
+    batcher = get_embedding_batcher(_forward)
+    if batcher is None or len(texts) >= batcher.max_batch_items:
+        return _forward(texts, normalize)
+    return batcher.submit(texts, normalize)
+
+
+def _infer(texts: List[str], normalize: bool) -> Optional[np.ndarray]:
+    """On the inference server when one is configured, else (or if it is down and FALLBACK_LOCAL) here."""
+    client = get_inference_client()
+    if client is not None:
+        try:
+            return client.encode(texts, normalize)
+        except InferenceUnavailable:
+            if not client.fallback_local:
+                raise
+    return infer_local(texts, normalize)
+
+
 def encode(
     texts: List[str],
     normalize: bool = False,
     return_numpy: bool = False,
 ) -> Union[List[List[float]], np.ndarray]:
-    """Batch encode texts to vectors. Optionally L2-normalize for cosine similarity (e.g. FAISS IndexFlatIP)."""
+    """
+    Batch encode texts to vectors. Optionally L2-normalize for cosine similarity (e.g. FAISS IndexFlatIP).
+
+    Vectors come from the embedding cache where possible; the model only runs
+    on the distinct texts that miss, and results are spliced back in order.
+    """
     if not texts:
         if return_numpy:
             return np.array([], dtype=np.float32)
         return []
-    model = _get_model()
-    if model is None:
-        # Fallback: return zero vectors with configured dimension to keep pipeline running
-        dim = settings.EMBEDDING_CONFIG.get('DIMENSION', 384)
-        if return_numpy:
-            return np.zeros((len(texts), dim), dtype=np.float32)
-        return [[0.0] * dim for _ in texts]
+    model_name = embedding_model_id()
+    cache = get_embedding_cache()
+    keys = [make_embedding_key(t, model_name, normalize) for t in texts]
+    found = cache.get_many(list(dict.fromkeys(keys)))
+    missing = {k: t for k, t in zip(keys, texts) if k not in found}
 
-    vectors = model.encode(
-        texts,
-        convert_to_numpy=True,
-        normalize_embeddings=normalize,
-    )
-    vectors = np.asarray(vectors, dtype=np.float32)
-    if vectors.ndim == 1:
-        vectors = np.expand_dims(vectors, 0)
+    if missing:
+        computed = _infer(list(missing.values()), normalize)
+        if computed is None:
+            # Fallback: return zero vectors with configured dimension to keep pipeline running
+            dim = settings.EMBEDDING_CONFIG.get('DIMENSION', 384)
+            if return_numpy:
+                return np.zeros((len(texts), dim), dtype=np.float32)
+            return [[0.0] * dim for _ in texts]
+        new = dict(zip(missing, computed))
+        computed_by = embedding_model_id()
+        if computed_by != model_name:
+            # The configured backend failed to load after the lookup: cache under the one that ran.
+            cache.set_many({make_embedding_key(missing[k], computed_by, normalize): v for k, v in new.items()})
+        else:
+            cache.set_many(new)
+        found.update(new)
+
+    vectors = np.stack([found[k] for k in keys]).astype(np.float32, copy=False)
     if return_numpy:
         return vectors
     return vectors.tolist()
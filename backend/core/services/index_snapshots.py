@@ -0,0 +1,125 @@
+"""
+Versioned on-disk snapshots for the FAISS indexes, shared by every worker.
+
+Layout::
+
+    <root>/CURRENT           name of the live version
+    <root>/<version>/...     index (and metadata) files of one version
+
+A writer fills a staging directory, renames it to a new version and then
+atomically replaces CURRENT, so readers only ever see complete snapshots.
+Published files are never modified afterwards, which lets workers mmap them
+(one page-cache copy per host). Old versions are pruned; a worker still
+mapping a pruned file keeps it alive until it swaps. Workers ``poll`` CURRENT
+at most every RELOAD_INTERVAL_SECONDS; the search that notices a new version
+loads it while concurrent searches keep using the old one. Writers in
+different processes serialize on a lock file (``lock``), so in-place updates
+start from the newest version.
+"""
+import fcntl
+import logging
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = 'CURRENT'
+LOCK_FILE = '.lock'
+STAGING_PREFIX = '.staging-'
+
+
+class SnapshotStore:
+    """Versioned snapshot directory with an atomic CURRENT pointer."""
+
+    def __init__(self, root: Path) -> None:
+        cfg = settings.VECTOR_INDEX_CONFIG
+        self.root = Path(root)
+        self.keep = max(1, int(cfg.get('KEEP_SNAPSHOTS', 3)))
+        self.reload_interval = float(cfg.get('RELOAD_INTERVAL_SECONDS', 5.0))
+        self._last_poll = 0.0
+        self.published: Optional[str] = None  # version written by this process's last publish()
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        self._lock_fd: Optional[int] = None
+
+    def current(self) -> Optional[str]:
+        """Live version name, or None before the first publish."""
+        try:
+            version = (self.root / CURRENT_FILE).read_text().strip()
+        except FileNotFoundError:
+            return None
+        return version if version and (self.root / version).is_dir() else None
+
+    def path(self, version: str) -> Path:
+        return self.root / version
+
+    def poll(self, loaded: Optional[str]) -> Optional[str]:
+        """The live version if it differs from ``loaded``; checks the disk at most every reload interval."""
+        if self.reload_interval < 0:
+            return None
+        now = time.monotonic()
+        if now - self._last_poll < self.reload_interval:
+            return None
+        self._last_poll = now
+        version = self.current()
+        return version if version != loaded else None
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Exclusive writer lock across threads and processes (re-entrant within a thread)."""
+        with self._lock:
+            if self._lock_depth == 0:
+                self.root.mkdir(parents=True, exist_ok=True)
+                self._lock_fd = os.open(self.root / LOCK_FILE, os.O_RDWR | os.O_CREAT, 0o660)
+                fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+                    os.close(self._lock_fd)
+                    self._lock_fd = None
+
+    @contextmanager
+    def publish(self) -> Iterator[Path]:
+        """
+        Yield an empty staging directory; once the block returns, its files
+        become the live version. Nothing is published if the block raises.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        version = f"{time.time_ns():d}"
+        staging = self.root / f"{STAGING_PREFIX}{version}-{os.getpid()}"
+        staging.mkdir()
+        try:
+            yield staging
+            os.rename(staging, self.path(version))
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        pointer = self.root / f"{CURRENT_FILE}.tmp-{os.getpid()}"
+        pointer.write_text(version)
+        os.replace(pointer, self.root / CURRENT_FILE)
+        self.published = version
+        logger.info("%s: published snapshot %s", self.root.name, version)
+        self.prune()
+
+    def versions(self) -> List[str]:
+        if not self.root.is_dir():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir() and p.name.isdigit())
+
+    def prune(self) -> None:
+        """Delete all but the newest KEEP_SNAPSHOTS versions (never the live one)."""
+        live = self.current()
+        for version in self.versions()[:-self.keep]:
+            if version != live:
+                shutil.rmtree(self.path(version), ignore_errors=True)
@@ -0,0 +1,170 @@
+"""
+Client for the shared inference server (``manage.py run_inference_server``).
+
+When INFERENCE_SERVER_CONFIG['SOCKET'] is set, ``embedding_service.encode``
+and rule-based skill matching send their work over a Unix socket to one
+sidecar process that holds the models for every web worker on the host,
+instead of loading a copy per worker.
+
+Wire format, both directions: 4-byte big-endian header length, a JSON
+header, 4-byte body length, raw body (float32 rows for ``encode`` replies).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import struct
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_MESSAGE_BYTES = 256 * 1024 * 1024
+_LENGTH = struct.Struct(">I")
+
+
+class InferenceUnavailable(Exception):
+    """The inference server is not configured, unreachable, or failed the request."""
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("connection closed by peer")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv_length(sock: socket.socket) -> int:
+    (size,) = _LENGTH.unpack(_recv_exact(sock, _LENGTH.size))
+    if size > MAX_MESSAGE_BYTES:
+        raise ConnectionError(f"message of {size} bytes exceeds {MAX_MESSAGE_BYTES}")
+    return size
+
+
+def send_message(sock: socket.socket, header: Dict[str, Any], body: bytes = b"") -> None:
+    head = json.dumps(header).encode("utf-8")
+    sock.sendall(b"".join((_LENGTH.pack(len(head)), head, _LENGTH.pack(len(body)), body)))
+
+
+def recv_message(sock: socket.socket) -> Tuple[Dict[str, Any], bytes]:
+    header = json.loads(_recv_exact(sock, _recv_length(sock)))
+    body = _recv_exact(sock, _recv_length(sock))
+    return header, body
+
+
+class InferenceClient:
+    """One persistent connection per thread; the server handles each on its own thread."""
+
+    def __init__(
+        self,
+        socket_path: str,
+        timeout: float = 30.0,
+        retry_seconds: float = 5.0,
+        fallback_local: bool = True,
+    ) -> None:
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.retry_seconds = retry_seconds
+        self.fallback_local = fallback_local
+        self._local = threading.local()
+        self._down_until = 0.0
+
+    def encode(self, texts: List[str], normalize: bool) -> Optional[np.ndarray]:
+        """(len(texts), dim) float32 rows, or None when the server has no embedding model."""
+        reply, body = self._call({"op": "encode", "texts": list(texts), "normalize": normalize})
+        if reply.get("shape") is None:
+            return None
+        return np.frombuffer(body, dtype=np.float32).reshape(reply["shape"])
+
+    def match_skills(self, texts: List[str], engine: str) -> List[List[str]]:
+        reply, _ = self._call({"op": "match_skills", "texts": list(texts), "engine": engine})
+        return reply["skills"]
+
+    def ping(self) -> Dict[str, Any]:
+        return self._call({"op": "ping"})[0]
+
+    def metrics(self) -> Dict[str, Any]:
+        return self._call({"op": "metrics"})[0]
+
+    def _connection(self) -> Tuple[socket.socket, bool]:
+        """(socket, fresh). Connections are per thread and per process (not shared across a fork)."""
+        sock = getattr(self._local, "sock", None)
+        if sock is not None and self._local.pid == os.getpid():
+            return sock, False
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self._local.sock, self._local.pid = sock, os.getpid()
+        return sock, True
+
+    def _close(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        self._local.sock = None
+        if sock is not None and self._local.pid == os.getpid():
+            sock.close()
+
+    def _call(self, header: Dict[str, Any]) -> Tuple[Dict[str, Any], bytes]:
+        if time.monotonic() < self._down_until:
+            raise InferenceUnavailable(f"inference server {self.socket_path} marked down")
+        while True:
+            fresh = True
+            try:
+                sock, fresh = self._connection()
+                send_message(sock, header)
+                reply, body = recv_message(sock)
+                break
+            except (OSError, ValueError) as e:
+                self._close()
+                if not fresh:
+                    continue  # server restarted since this connection was opened: reconnect once
+                self._down_until = time.monotonic() + self.retry_seconds
+                logger.warning("Inference server %s unavailable (%s); retrying in %.0fs.", self.socket_path, e, self.retry_seconds)
+                raise InferenceUnavailable(str(e)) from e
+        if not reply.get("ok"):
+            raise InferenceUnavailable(reply.get("error") or "inference server error")
+        return reply, body
+
+
+_client: InferenceClient | None = None
+_client_lock = threading.Lock()
+_disabled = False
+
+
+def get_inference_client() -> Optional[InferenceClient]:
+    """Shared client, or None when no socket is configured (inference runs in-process)."""
+    global _client
+    if _disabled:
+        return None
+    cfg = settings.INFERENCE_SERVER_CONFIG
+    if not cfg.get('SOCKET'):
+        return None
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = InferenceClient(
+                    cfg['SOCKET'],
+                    timeout=cfg.get('TIMEOUT_SECONDS', 30.0),
+                    retry_seconds=cfg.get('RETRY_SECONDS', 5.0),
+                    fallback_local=cfg.get('FALLBACK_LOCAL', True),
+                )
+    return _client
+
+
+def disable_inference_client() -> None:
+    """Run inference in this process regardless of settings (the server itself calls this)."""
+    global _disabled
+    _disabled = True
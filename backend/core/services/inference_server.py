@@ -0,0 +1,137 @@
+"""
+Shared inference server behind ``manage.py run_inference_server``.
+
+Serves ``encode`` and rule-based skill matching to every web worker on the
+host over a Unix socket (protocol in ``inference_client``), so the models are
+loaded once per host instead of once per gunicorn worker. Each connection
+gets a handler thread; handlers pass their texts to micro-batchers, so small
+requests from different workers share one model pass. Skill matching runs
+on its batcher's single thread, which also keeps spaCy off concurrent threads.
+"""
+import logging
+import os
+import socket
+import socketserver
+import threading
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from core.services.embedding_batcher import MicroBatcher, batcher_metrics
+from core.services.inference_client import recv_message, send_message
+
+logger = logging.getLogger(__name__)
+
+Reply = Tuple[Dict[str, Any], bytes]
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Unlink a socket file left by a dead server; refuse to steal a live one."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"Another inference server is already listening on {path}")
+
+
+class _InferenceHandler(socketserver.BaseRequestHandler):
+    """One client connection: request/reply messages until the client disconnects."""
+
+    def handle(self) -> None:
+        with self.server.stats_lock:
+            self.server.stats["connections"] += 1
+        while True:
+            try:
+                header, _ = recv_message(self.request)
+            except (OSError, ValueError):
+                return
+            try:
+                reply, body = self.server.dispatch(header)
+            except Exception as e:
+                logger.exception("Inference request %r failed", header.get("op"))
+                reply, body = {"ok": False, "error": f"{type(e).__name__}: {e}"}, b""
+            try:
+                send_message(self.request, reply, body)
+            except OSError:
+                return
+
+
+class InferenceServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    # Every thread of every web worker may connect at once (default backlog: 5).
+    request_queue_size = 256
+
+    def __init__(self, socket_path: str, max_batch_items: int = 64, max_wait_ms: float = 5.0) -> None:
+        _remove_stale_socket(socket_path)
+        super().__init__(socket_path, _InferenceHandler)
+        os.chmod(socket_path, 0o660)  # web workers run as the same user/group
+        self.socket_path = socket_path
+        self.match_batcher = MicroBatcher(self._match_batch, max_batch_items=max_batch_items, max_wait_ms=max_wait_ms)
+        self.stats = {"connections": 0, "encode_requests": 0, "encode_texts": 0, "match_requests": 0, "match_texts": 0}
+        self.stats_lock = threading.Lock()
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+    def dispatch(self, header: Dict[str, Any]) -> Reply:
+        op = header.get("op")
+        if op == "encode":
+            return self._encode(header["texts"], bool(header.get("normalize")))
+        if op == "match_skills":
+            return self._match_skills(header["texts"], header["engine"])
+        if op == "ping":
+            from core.services.embedding_service import embedding_model_id
+            return {"ok": True, "pid": os.getpid(), "model": embedding_model_id()}, b""
+        if op == "metrics":
+            with self.stats_lock:
+                stats = dict(self.stats)
+            return {
+                "ok": True,
+                "server": stats,
+                "embedding_batcher": batcher_metrics(),
+                "match_batcher": self.match_batcher.metrics(),
+            }, b""
+        return {"ok": False, "error": f"unknown op {op!r}"}, b""
+
+    def _count(self, kind: str, texts: List[str]) -> None:
+        with self.stats_lock:
+            self.stats[f"{kind}_requests"] += 1
+            self.stats[f"{kind}_texts"] += len(texts)
+
+    def _encode(self, texts: List[str], normalize: bool) -> Reply:
+        from core.services.embedding_service import infer_local
+
+        self._count("encode", texts)
+        if not texts:
+            return {"ok": True, "shape": [0, settings.EMBEDDING_CONFIG.get('DIMENSION', 384)]}, b""
+        vectors = infer_local(texts, normalize)
+        if vectors is None:
+            # No model here either: the client returns its zero-vector fallback.
+            return {"ok": True, "shape": None}, b""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        return {"ok": True, "shape": list(vectors.shape)}, vectors.tobytes()
+
+    def _match_skills(self, texts: List[str], engine: str) -> Reply:
+        from apps.skills.services.resume_skill_tool import MATCH_ENGINES
+
+        if engine not in MATCH_ENGINES:
+            return {"ok": False, "error": f"unknown skill match engine {engine!r}"}, b""
+        self._count("match", texts)
+        skills = self.match_batcher.submit(texts, engine) if texts else []
+        return {"ok": True, "skills": skills}, b""
+
+    @staticmethod
+    def _match_batch(texts: List[str], engine: str) -> List[List[str]]:
+        from apps.skills.services.resume_skill_tool import MATCH_ENGINES
+        return MATCH_ENGINES[engine].extract_batch(texts)
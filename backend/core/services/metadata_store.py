@@ -0,0 +1,119 @@
+"""
+Columnar, memory-mapped row metadata for vector indexes (replaces pickled
+lists of dicts).
+
+One file per table::
+
+    MAGIC | header length (u64) | JSON header | per column: offsets, blob
+
+Each column is an int64 offsets array (``count + 1`` entries) into one UTF-8
+blob, so row ``i`` of a column is ``blob[offsets[i]:offsets[i + 1]]``. The
+file is mmapped read-only: opening it parses only the header, the pages are
+shared by every process that maps it, and a row is decoded into a dict only
+when it is accessed (i.e. for the hits a search returns). Values are stored
+as strings (None as ""). Unlike pickle, reading the file never runs code.
+"""
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+MAGIC = b"COLMETA1"
+_HEADER_LEN = struct.Struct("<Q")
+_ALIGN = 8
+
+
+class MetadataStoreError(Exception):
+    """Malformed or unreadable metadata file."""
+    pass
+
+
+def _pad(size: int) -> bytes:
+    return b"\0" * (-size % _ALIGN)
+
+
+def is_columnar(path: Path) -> bool:
+    """Whether ``path`` is a file written by ``write_columnar`` (vs. a legacy pickle)."""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def write_columnar(
+    path: Path,
+    rows: Sequence[Dict[str, Any]],
+    columns: Optional[List[str]] = None,
+) -> None:
+    """Write ``rows`` (all keys, or ``columns``) to ``path`` (tmp file, then rename)."""
+    if columns is None:
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+    sections: List[bytes] = []
+    layout = []
+    position = 0
+    for name in columns:
+        encoded = [("" if row.get(name) is None else str(row.get(name))).encode("utf-8") for row in rows]
+        offsets = np.zeros(len(rows) + 1, dtype="<i8")
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        blob = b"".join(encoded)
+        layout.append({"name": name, "offsets": position, "blob": position + offsets.nbytes, "size": len(blob)})
+        sections += [offsets.tobytes(), blob, _pad(len(blob))]
+        position += offsets.nbytes + len(blob) + len(_pad(len(blob)))
+    header = json.dumps({"count": len(rows), "columns": layout}).encode("utf-8")
+    prefix = MAGIC + _HEADER_LEN.pack(len(header)) + header
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    with open(tmp, "wb") as f:
+        f.write(prefix + _pad(len(prefix)))
+        for section in sections:
+            f.write(section)
+    os.replace(tmp, path)
+
+
+class ColumnarMetadata(Sequence):
+    """Read-only view of a ``write_columnar`` file; ``table[i]`` decodes row ``i`` to a dict."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if self._map[:len(MAGIC)] != MAGIC:
+                raise MetadataStoreError(f"{self.path} is not a columnar metadata file")
+            (header_len,) = _HEADER_LEN.unpack_from(self._map, len(MAGIC))
+            start = len(MAGIC) + _HEADER_LEN.size
+            header = json.loads(self._map[start:start + header_len])
+            data = start + header_len + len(_pad(start + header_len))
+            self._count = int(header["count"])
+            self.columns = [col["name"] for col in header["columns"]]
+            self._offsets = [
+                np.frombuffer(self._map, dtype="<i8", count=self._count + 1, offset=data + col["offsets"])
+                for col in header["columns"]
+            ]
+            self._blobs = [data + col["blob"] for col in header["columns"]]
+        except (ValueError, KeyError, TypeError, struct.error) as e:
+            raise MetadataStoreError(f"Corrupt metadata file {self.path}: {e}") from e
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[Dict[str, str], List[Dict[str, str]]]:
+        if isinstance(i, slice):
+            return self.rows(range(*i.indices(self._count)))
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return {name: self._value(c, i) for c, name in enumerate(self.columns)}
+
+    def rows(self, indices: Iterable[int]) -> List[Dict[str, str]]:
+        return [self[i] for i in indices]
+
+    def value(self, i: int, column: str) -> str:
+        return self._value(self.columns.index(column), i)
+
+    def _value(self, c: int, i: int) -> str:
+        offsets, blob = self._offsets[c], self._blobs[c]
+        return self._map[blob + int(offsets[i]):blob + int(offsets[i + 1])].decode("utf-8")
@@ -0,0 +1,108 @@
+"""
+ONNX Runtime backend for the sentence-transformer (EMBEDDING_CONFIG['BACKEND'] = 'onnx').
+
+``python manage.py export_embedding_onnx`` writes the transformer graph
+(``model.onnx``, optionally int8 dynamically quantized to ``model_int8.onnx``),
+the fast tokenizer and ``export.json`` into EMBEDDING_CONFIG['ONNX_DIR'].
+``OnnxSentenceEncoder`` reproduces the SentenceTransformer pipeline on top of
+it (tokenize, transformer, attention-masked mean pooling, optional L2
+normalize) with only ``onnxruntime``, ``tokenizers`` and numpy loaded: no torch.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import List, Optional, Union
+
+import numpy as np
+
+MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model_int8.onnx"
+EXPORT_META_FILE = "export.json"
+TOKENIZER_FILE = "tokenizer.json"
+
+
+def default_onnx_threads() -> int:
+    """Cores per web worker, so gunicorn's workers don't oversubscribe the CPU."""
+    workers = int(os.environ.get("WEB_CONCURRENCY", 4))
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+class OnnxSentenceEncoder:
+    """``encode()``-compatible stand-in for ``SentenceTransformer`` (mean-pooling models)."""
+
+    def __init__(
+        self,
+        model_dir: Union[str, Path],
+        quantized: bool = False,
+        threads: Optional[int] = None,
+    ) -> None:
+        try:
+            import onnxruntime as ort
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError("The ONNX embedding backend needs `onnxruntime` and `tokenizers`.") from e
+
+        model_dir = Path(model_dir)
+        path = model_dir / (QUANTIZED_MODEL_FILE if quantized else MODEL_FILE)
+        meta_path = model_dir / EXPORT_META_FILE
+        if not path.exists() or not meta_path.exists():
+            raise FileNotFoundError(
+                f"ONNX embedding model not found at {path}; run `manage.py export_embedding_onnx"
+                f"{' --quantize' if quantized else ''}`."
+            )
+        self.meta = json.loads(meta_path.read_text())
+        self.model_path = path
+        self.threads = threads or default_onnx_threads()
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.threads
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(str(path), options, providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+        self.max_seq_length = int(self.meta["max_seq_length"])
+        self.tokenizer = Tokenizer.from_file(str(model_dir / TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.enable_padding(pad_id=self.meta.get("pad_token_id", 0), pad_token=self.meta.get("pad_token", "[PAD]"))
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return int(self.meta["dimension"])
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+        **kwargs,
+    ) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+        # Length-sorted batches pad less, as SentenceTransformer does.
+        order = np.argsort([-len(t) for t in texts], kind="stable")
+        out = np.empty((len(texts), self.get_sentence_embedding_dimension()), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            idx = order[start:start + batch_size]
+            out[idx] = self._forward([texts[i] for i in idx])
+        if self.meta.get("normalize") or normalize_embeddings:
+            norms = np.linalg.norm(out, axis=1, keepdims=True)
+            out = out / np.clip(norms, 1e-12, None)
+        return out[0] if single else out
+
+    def _forward(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feed = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": mask,
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        hidden = self.session.run(None, {k: v for k, v in feed.items() if k in self._input_names})[0]
+        weights = mask[:, :, None].astype(np.float32)
+        return (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
@@ -0,0 +1,325 @@
+"""
+Vector index layer shared by the role indexes (``FAISSRoleIndex``,
+``RoleFAISSManager``) and any future job index.
+
+The index type is a FAISS index-factory string from VECTOR_INDEX_CONFIG:
+``Flat`` (exact), ``HNSW32``, ``IVF{nlist},PQ48``, ``IVF{nlist},SQ8``, ``SQ8``...
+``{nlist}`` is sized from the number of vectors at build time. Vectors are
+L2-normalized and compared by inner product, i.e. cosine similarity. Search
+parameters (``nprobe``, ``efSearch``, ``k_factor``...) are applied to the
+index types that have them and ignored by the rest.
+
+Stores built with ``ids`` are wrapped in ``IDMap2``: search returns those
+int64 labels, and ``add`` / ``remove`` update single vectors in place. Removal
+relabels the old rows to ``TOMBSTONE`` (-1) rather than deleting them, which
+works the same for every index type (HNSW cannot delete; IVF renumbers
+differently from IDMap). Tombstones are saved with the index and dropped by
+rebuilding (compaction).
+
+``search(..., bitmap=...)`` restricts a search to a precomputed set of rows
+(``attribute_bitmaps``) inside FAISS, via an ID selector.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from django.conf import settings
+
+from core.services.attribute_bitmaps import popcount
+
+if TYPE_CHECKING:
+    import faiss
+
+logger = logging.getLogger(__name__)
+
+Hit = Tuple[int, float]  # (label: id, or row in build order; cosine score)
+MIN_POINTS_PER_CENTROID = 39  # below this FAISS k-means warns and IVF recall suffers
+TOMBSTONE = -1
+
+
+class VectorStoreError(Exception):
+    """Index build / load / search error."""
+    pass
+
+
+def vector_index_config(name: Optional[str] = None) -> Dict[str, Any]:
+    """FACTORY and SEARCH_PARAMS for index ``name``: the defaults plus its INDEXES override."""
+    cfg = settings.VECTOR_INDEX_CONFIG
+    override = cfg.get('INDEXES', {}).get(name, {}) if name else {}
+    params = dict(cfg.get('SEARCH_PARAMS', {}))
+    params.update(override.get('SEARCH_PARAMS', {}))
+    return {'FACTORY': override.get('FACTORY', cfg.get('FACTORY', 'Flat')), 'SEARCH_PARAMS': params}
+
+
+def resolve_factory(factory: str, n_vectors: int) -> str:
+    """Fill ``{nlist}`` with ~4*sqrt(n) lists, capped so each list gets enough training points."""
+    if '{nlist}' not in factory:
+        return factory
+    nlist = max(1, min(int(4 * math.sqrt(n_vectors)), n_vectors // MIN_POINTS_PER_CENTROID))
+    return factory.format(nlist=nlist)
+
+
+def _as_matrix(vectors: Union[np.ndarray, Sequence]) -> np.ndarray:
+    """Float32 (n, d) copy, L2-normalized (the caller's array is left untouched)."""
+    import faiss
+
+    X = np.array(vectors, dtype=np.float32)
+    if X.ndim == 1:
+        X = np.expand_dims(X, 0)
+    X = np.ascontiguousarray(X)
+    faiss.normalize_L2(X)
+    return X
+
+
+def _as_ids(ids: Sequence[int]) -> np.ndarray:
+    return np.ascontiguousarray(np.asarray(list(ids), dtype=np.int64))
+
+
+class VectorStore:
+    """A FAISS index built from a factory string, with save / load and cosine search."""
+
+    def __init__(
+        self,
+        factory: str = 'Flat',
+        search_params: Optional[Dict[str, Any]] = None,
+        name: Optional[str] = None,
+    ) -> None:
+        self.factory = factory
+        self.search_params = dict(search_params or {})
+        self.name = name or factory
+        self.index: faiss.Index | None = None
+        self.tombstones = 0
+        self.mapped = False  # index data is a read-only file mapping (load(mmap=True))
+
+    @classmethod
+    def from_config(cls, name: str) -> "VectorStore":
+        cfg = vector_index_config(name)
+        return cls(cfg['FACTORY'], cfg['SEARCH_PARAMS'], name=name)
+
+    @property
+    def ntotal(self) -> int:
+        return 0 if self.index is None else int(self.index.ntotal)
+
+    @property
+    def id_mapped(self) -> bool:
+        return self.index is not None and hasattr(self.index, 'id_map')
+
+    def build(self, vectors: Union[np.ndarray, Sequence], ids: Optional[Sequence[int]] = None) -> None:
+        """(Re)build from scratch; with ``ids`` the index is ID-mapped and supports add / remove."""
+        import faiss
+
+        X = _as_matrix(vectors)
+        if not len(X):
+            raise VectorStoreError("No vectors to index.")
+        if ids is not None and len(ids) != len(X):
+            raise VectorStoreError("Vectors and ids size mismatch.")
+        prefix = 'IDMap2,' if ids is not None else ''
+        factory = resolve_factory(self.factory, len(X))
+        try:
+            index = faiss.index_factory(X.shape[1], prefix + factory, faiss.METRIC_INNER_PRODUCT)
+            if not index.is_trained:
+                index.train(X)
+        except RuntimeError as e:
+            # e.g. IVF with more lists than vectors, PQ with fewer than 256 vectors.
+            logger.warning("%s: cannot build %r from %d vectors (%s); using an exact Flat index.", self.name, factory, len(X), e)
+            factory = 'Flat'
+            index = faiss.index_factory(X.shape[1], prefix + factory, faiss.METRIC_INNER_PRODUCT)
+        if ids is not None:
+            index.add_with_ids(X, _as_ids(ids))
+        else:
+            index.add(X)
+        self.index = index
+        self.tombstones = 0
+        self.mapped = False
+        self._apply_search_params()
+        logger.info("%s: built %s%s index over %d vectors.", self.name, prefix, factory, len(X))
+
+    def add(self, vectors: Union[np.ndarray, Sequence], ids: Sequence[int]) -> None:
+        """Insert vectors under ``ids``; earlier vectors with the same ids become tombstones."""
+        if self.index is None:
+            self.build(vectors, ids)
+            return
+        X = _as_matrix(vectors)
+        if len(ids) != len(X):
+            raise VectorStoreError("Vectors and ids size mismatch.")
+        if self.mapped:
+            self.index = self._owned_index()
+            self.mapped = False
+            self._apply_search_params()
+        self.remove(ids)
+        self.index.add_with_ids(X, _as_ids(ids))
+
+    def remove(self, ids: Sequence[int]) -> int:
+        """Tombstone every row labelled with one of ``ids``. Returns the number of rows hidden."""
+        import faiss
+
+        if self.index is None:
+            return 0
+        labels = self.labels()
+        hit = np.isin(labels, _as_ids(ids))
+        removed = int(hit.sum())
+        if removed:
+            labels[hit] = TOMBSTONE
+            faiss.copy_array_to_vector(labels, self.index.id_map)
+            self.index.construct_rev_map()
+            self.tombstones += removed
+        return removed
+
+    def labels(self) -> np.ndarray:
+        """Label of every stored row (a copy); TOMBSTONE for removed rows."""
+        import faiss
+
+        if not self.id_mapped:
+            raise VectorStoreError(f"{self.name}: not an ID-mapped index (build it with ids).")
+        return faiss.vector_to_array(self.index.id_map)
+
+    def live_ids(self) -> np.ndarray:
+        labels = self.labels()
+        return labels[labels != TOMBSTONE]
+
+    def copy(self) -> "VectorStore":
+        """Independent clone, for copy-on-write updates while other threads search this one."""
+        import faiss
+
+        clone = VectorStore(self.factory, self.search_params, name=self.name)
+        if self.index is not None:
+            clone.index = self._owned_index() if self.mapped else faiss.clone_index(self.index)
+            clone.tombstones = self.tombstones
+            clone._apply_search_params()
+        return clone
+
+    def _owned_index(self) -> "faiss.Index":
+        """In-memory copy of the index; clone_index would keep viewing a read-only mapping."""
+        import faiss
+        return faiss.deserialize_index(faiss.serialize_index(self.index))
+
+    def search(
+        self,
+        queries: Union[np.ndarray, Sequence],
+        k: int,
+        bitmap: Optional[np.ndarray] = None,
+    ) -> List[List[Hit]]:
+        """
+        Top ``k`` (label, score) per query row, best first. ``bitmap`` (packed,
+        little-endian, one bit per row; see ``attribute_bitmaps``) restricts the
+        search to the rows whose bit is set.
+        """
+        Q = _as_matrix(queries)
+        if self.index is None or self.index.ntotal == 0 or k <= 0:
+            return [[] for _ in range(len(Q))]
+        # Over-fetch so tombstoned rows among the top k don't leave the result short.
+        fetch = min(k + self.tombstones, self.index.ntotal)
+        try:
+            if bitmap is None:
+                scores, rows = self.index.search(Q, fetch)
+            else:
+                scores, rows = self._filtered_search(Q, fetch, bitmap)
+        except RuntimeError as e:
+            raise VectorStoreError(f"Search failed: {e}") from e
+        return [
+            [(int(row), float(score)) for row, score in zip(row_ids, row_scores) if row >= 0][:k]
+            for row_ids, row_scores in zip(rows, scores)
+        ]
+
+    def _filtered_search(self, Q: np.ndarray, k: int, bitmap: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Search restricted to the rows set in ``bitmap``. Small selections (up
+        to FILTER_EXACT_MAX_ROWS) are scored exactly from their reconstructed
+        vectors. Otherwise an IDSelectorBitmap is evaluated inside FAISS, and
+        approximate indexes probe proportionally more (nprobe / efSearch scaled
+        by the inverse selectivity) so a selective filter still fills the top k.
+        """
+        import faiss
+
+        if self.id_mapped:
+            raise VectorStoreError(f"{self.name}: row bitmaps need an index built without ids.")
+        n = self.index.ntotal
+        bitmap = np.ascontiguousarray(bitmap, dtype=np.uint8)
+        if len(bitmap) != (n + 7) // 8:
+            raise VectorStoreError(f"Bitmap covers {len(bitmap) * 8} rows, index has {n}.")
+        selected = popcount(bitmap)
+        if selected == 0:
+            return np.zeros((len(Q), k), dtype=np.float32), np.full((len(Q), k), -1, dtype=np.int64)
+        exact_max = settings.VECTOR_INDEX_CONFIG.get('FILTER_EXACT_MAX_ROWS', 4096)
+        if selected <= exact_max:
+            rows = np.flatnonzero(np.unpackbits(bitmap, count=n, bitorder='little'))
+            try:
+                return self._exact_search(Q, k, rows)
+            except RuntimeError:
+                pass  # cannot reconstruct (e.g. IVF without a direct map): use the selector
+        boost = n / selected
+        # selector and bitmap must outlive the search: FAISS only keeps raw pointers.
+        selector = faiss.IDSelectorBitmap(n, faiss.swig_ptr(bitmap))
+        ivf = faiss.try_extract_index_ivf(self.index)
+        base = faiss.downcast_index(self.index)
+        if ivf is not None:
+            params = faiss.SearchParametersIVF()
+            params.nprobe = min(ivf.nlist, math.ceil(ivf.nprobe * boost))
+        elif isinstance(base, faiss.IndexHNSW):
+            params = faiss.SearchParametersHNSW()
+            # Capped: past this, the graph walk costs more than the exact path above.
+            params.efSearch = min(n, exact_max, math.ceil(max(base.hnsw.efSearch, k) * boost))
+        else:
+            params = faiss.SearchParameters()
+        params.sel = selector
+        return self.index.search(Q, k, params=params)
+
+    def _exact_search(self, Q: np.ndarray, k: int, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Inner-product top k over ``rows`` only, from their stored (decoded) vectors."""
+        vectors = self.index.reconstruct_batch(rows.astype(np.int64))
+        scores = Q @ vectors.T
+        top = np.argsort(-scores, axis=1)[:, :k]
+        D = np.zeros((len(Q), k), dtype=np.float32)
+        I = np.full((len(Q), k), -1, dtype=np.int64)
+        D[:, :top.shape[1]] = np.take_along_axis(scores, top, axis=1)
+        I[:, :top.shape[1]] = rows[top]
+        return D, I
+
+    def save(self, path: Path) -> None:
+        import faiss
+
+        if self.index is None:
+            raise VectorStoreError("Nothing to save.")
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write, then rename: a reader never sees a half-written file.
+        tmp = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+        faiss.write_index(self.index, str(tmp))
+        os.replace(tmp, path)
+
+    def load(self, path: Path, mmap: bool = False) -> None:
+        """
+        Read an index file. With ``mmap`` the vectors stay in the (read-only)
+        file mapping, shared by every process that maps it; the file must not
+        be rewritten in place while mapped.
+        """
+        import faiss
+
+        self.mapped = False
+        if mmap:
+            flags = getattr(faiss, 'IO_FLAG_MMAP_IFC', faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+            try:
+                self.index = faiss.read_index(str(path), flags)
+                self.mapped = True
+            except RuntimeError as e:
+                logger.warning("%s: cannot mmap %s (%s); reading it into memory.", self.name, path, e)
+                self.index = faiss.read_index(str(path))
+        else:
+            self.index = faiss.read_index(str(path))
+        self.tombstones = int((self.labels() == TOMBSTONE).sum()) if self.id_mapped else 0
+        self._apply_search_params()
+
+    def _apply_search_params(self) -> None:
+        import faiss
+
+        space = faiss.ParameterSpace()
+        for param, value in self.search_params.items():
+            try:
+                space.set_index_parameter(self.index, param, value)
+            except RuntimeError:
+                pass  # not a parameter of this index type (e.g. nprobe on HNSW)
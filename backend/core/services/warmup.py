@@ -0,0 +1,146 @@
+"""
+Worker warm-up: load and exercise the lazily initialised models and indexes
+(sentence-transformer, rule-based skill matcher, both FAISS role indexes,
+role TF-IDF model) before the worker takes traffic, and record per-component
+readiness for ``/api/health/ready``.
+
+Opt-in via WARMUP_CONFIG['ON_BOOT']; started from ``config.wsgi`` / ``config.asgi``.
+"""
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_DUMMY_TEXT = "Python developer with Django, SQL and machine learning experience"
+
+
+def _warm_embedding() -> str:
+    from core.services.embedding_service import _get_model, encode_single
+    from core.services.inference_client import get_inference_client
+    client = get_inference_client()
+    if client is not None:
+        # The model lives in the inference server; check it answers instead of loading a copy.
+        info = client.ping()
+        if client.encode([_DUMMY_TEXT], normalize=True) is None:
+            raise RuntimeError("Inference server has no embedding model (zero-vector fallback)")
+        return f"{info['model']} via inference server {client.socket_path}"
+    if _get_model() is None:
+        raise RuntimeError("SentenceTransformer model unavailable (zero-vector fallback)")
+    encode_single(_DUMMY_TEXT, normalize=True)
+    return settings.EMBEDDING_CONFIG.get('MODEL_NAME', 'all-MiniLM-L6-v2')
+
+
+def _warm_skill_extractor() -> str:
+    from apps.skills.services.resume_skill_tool import get_rule_extractor
+    extractor = get_rule_extractor()
+    extractor.extract(_DUMMY_TEXT)
+    return extractor.__name__
+
+
+def _dummy_query() -> np.ndarray:
+    vector = np.ones((1, settings.EMBEDDING_CONFIG.get('DIMENSION', 384)), dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def _warm_faiss_role_index() -> str:
+    from apps.roles.services.faiss_role_index import get_faiss_index
+    index = get_faiss_index()
+    if index.index is None:
+        return "index not built"
+    index.search(_dummy_query()[0].tolist(), k=1)
+    return f"{index.index.ntotal} vectors"
+
+
+def _warm_role_faiss_manager() -> str:
+    from apps.roles.services.role_faiss_manager import get_role_faiss_manager
+    manager = get_role_faiss_manager()
+    if manager.index is None:
+        return "index not built"
+    manager.search(_dummy_query(), top_k=1)
+    return f"{manager.index.ntotal} vectors"
+
+
+def _warm_role_tfidf() -> str:
+    from apps.roles.services.ranking import get_role_tfidf
+    return f"{get_role_tfidf().vocabulary_size} terms"
+
+
+COMPONENTS: Dict[str, Callable[[], str]] = {
+    'embedding_model': _warm_embedding,
+    'skill_extractor': _warm_skill_extractor,
+    'faiss_role_index': _warm_faiss_role_index,
+    'role_faiss_manager': _warm_role_faiss_manager,
+    'role_tfidf': _warm_role_tfidf,
+}
+
+_status: Dict[str, Dict[str, Any]] = {}
+_status_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+
+
+def _configured_components() -> List[str]:
+    names = settings.WARMUP_CONFIG.get('COMPONENTS') or list(COMPONENTS)
+    unknown = [n for n in names if n not in COMPONENTS]
+    if unknown:
+        raise ValueError(f"Unknown warm-up components: {unknown} (expected some of {sorted(COMPONENTS)})")
+    return list(names)
+
+
+def warm_up(components: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """Load and exercise each component once; failures are recorded, not raised."""
+    names = components or _configured_components()
+    with _status_lock:
+        for name in names:
+            _status[name] = {'ready': False, 'state': 'loading', 'seconds': None, 'detail': None}
+    for name in names:
+        start = time.perf_counter()
+        try:
+            detail = COMPONENTS[name]()
+            entry = {'ready': True, 'state': 'ready', 'detail': detail}
+        except Exception as e:
+            logger.exception("Warm-up of %s failed", name)
+            entry = {'ready': False, 'state': 'failed', 'detail': str(e)}
+        entry['seconds'] = round(time.perf_counter() - start, 3)
+        logger.info("Warm-up %s: %s in %.2fs", name, entry['state'], entry['seconds'])
+        with _status_lock:
+            _status[name] = entry
+    return readiness()['components']
+
+
+def start_warm_up() -> None:
+    """Boot hook: no-op unless WARMUP_CONFIG['ON_BOOT']; runs once per process."""
+    global _thread
+    cfg = settings.WARMUP_CONFIG
+    if not cfg.get('ON_BOOT') or _thread is not None:
+        return
+    names = _configured_components()
+    with _status_lock:
+        for name in names:
+            _status[name] = {'ready': False, 'state': 'pending', 'seconds': None, 'detail': None}
+    if cfg.get('BACKGROUND', True):
+        # The worker starts serving at once; /api/health/ready reports 503 until done.
+        _thread = threading.Thread(target=warm_up, args=(names,), name='warm-up', daemon=True)
+        _thread.start()
+    else:
+        _thread = threading.current_thread()
+        warm_up(names)
+
+
+def readiness() -> Dict[str, Any]:
+    """{'ready': bool, 'warmup_enabled': bool, 'components': {name: status}}."""
+    enabled = bool(settings.WARMUP_CONFIG.get('ON_BOOT'))
+    with _status_lock:
+        components = {name: dict(entry) for name, entry in _status.items()}
+    if not enabled and not components:
+        # Warm-up disabled: components load lazily on first use, as before.
+        return {'ready': True, 'warmup_enabled': False, 'components': {}}
+    return {
+        'ready': bool(components) and all(entry['ready'] for entry in components.values()),
+        'warmup_enabled': enabled,
+        'components': components,
+    }
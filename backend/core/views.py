@@ -0,0 +1,41 @@
+"""Health and metrics endpoints: readiness for load balancer probes, metrics for staff monitoring."""
+from rest_framework import status
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.response import Response
+
+from core.services.embedding_batcher import batcher_metrics
+from core.services.embedding_cache import get_embedding_cache
+from core.services.inference_client import InferenceUnavailable, get_inference_client
+from core.services.warmup import readiness
+
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def health_ready(request):
+    """200 once every warm-up component is loaded, 503 (with per-component status) until then."""
+    report = readiness()
+    code = status.HTTP_200_OK if report['ready'] else status.HTTP_503_SERVICE_UNAVAILABLE
+    return Response(report, status=code)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def health_metrics(request):
+    """
+    Embedding metrics: micro-batcher queue depth / batch size / wait time, cache
+    hit rates, plus the shared inference server's batchers when one is configured.
+    Staff only; unlike readiness, this is not for anonymous probes.
+    """
+    metrics = {
+        'embedding_batcher': batcher_metrics(),
+        'embedding_cache': get_embedding_cache().stats(),
+    }
+    client = get_inference_client()
+    if client is not None:
+        try:
+            metrics['inference_server'] = client.metrics()
+        except InferenceUnavailable as e:
+            metrics['inference_server'] = {'ok': False, 'error': str(e)}
+    return Response(metrics)